@@ -1,5 +1,5 @@
 import { CHROMOSOMES, IDB_CACHE } from "../constants";
-import { get } from "../util/fetch";
+import { get, getBinary } from "../util/fetch";
 import { idbGet, idbSet } from "../util/indexeddb";
 import { getSampleKey, zip } from "../util/utils";
 
@@ -129,12 +129,20 @@ export class API {
     return geneLists;
   }
 
-  getGeneListGenes(panelId: string, chromosome: string): Promise<string[]> {
-    const geneSymbols = get(
-      new URL(`gene_lists/track/${panelId}`, this.apiURI).href,
-      { chromosome, genome_build: this.genomeBuild },
-    ) as Promise<string[]>;
-    return geneSymbols;
+  getGeneListTranscripts(
+    panelId: string,
+    chromosome: string,
+    onlyCanonical: boolean,
+  ): Promise<ApiSimplifiedTranscript[]> {
+    const transcripts = get(
+      new URL(`gene_lists/track/${panelId}/transcripts`, this.apiURI).href,
+      {
+        chromosome,
+        genome_build: this.genomeBuild,
+        only_canonical: onlyCanonical,
+      },
+    ) as Promise<ApiSimplifiedTranscript[]>;
+    return transcripts;
   }
 
   getSampleAnnotationSources(
@@ -599,23 +607,64 @@ async function getCovData(
     end: range[1],
   };
 
-  const regionResult = (await get(new URL(endpoint, apiURI).href, query)) as {
-    position: number[];
-    value: number[];
-  };
-  const parsedResult: ApiCoverageDot[] = zip(
-    regionResult.position,
-    regionResult.value,
-  ).map(([pos, val]) => {
-    return {
-      pos: pos,
-      value: val,
-    };
-  });
+  const buffer = await getBinary(new URL(endpoint, apiURI).href, query);
+  if (buffer == null) {
+    return [];
+  }
+  const { position, value } = decodeBinaryCoverage(buffer);
 
+  const parsedResult: ApiCoverageDot[] = new Array(position.length);
+  for (let i = 0; i < position.length; i++) {
+    parsedResult[i] = { pos: position[i], value: value[i] };
+  }
   return parsedResult;
 }
 
+const BINARY_COVERAGE_MAGIC = "GCOV";
+const BINARY_COVERAGE_VERSION = 1;
+const BINARY_COVERAGE_HEADER_SIZE = 12;
+
+// Decode the columnar coverage format served by the API when requesting
+// "application/octet-stream". See gens.io.encode_binary_coverage.
+export function decodeBinaryCoverage(buffer: ArrayBuffer): {
+  region: string;
+  zoom: string | null;
+  position: Int32Array;
+  value: Float32Array;
+} {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(
+    ...new Uint8Array(buffer, 0, BINARY_COVERAGE_MAGIC.length),
+  );
+  if (magic !== BINARY_COVERAGE_MAGIC) {
+    throw new Error(`Unexpected coverage payload, magic: ${magic}`);
+  }
+  const version = view.getUint8(4);
+  if (version !== BINARY_COVERAGE_VERSION) {
+    throw new Error(
+      `Unsupported coverage payload version ${version}, expected ${BINARY_COVERAGE_VERSION}`,
+    );
+  }
+  const zoomCode = view.getUint8(5);
+  const regionLength = view.getUint16(6, true);
+  const nPoints = view.getUint32(8, true);
+
+  const region = new TextDecoder().decode(
+    new Uint8Array(buffer, BINARY_COVERAGE_HEADER_SIZE, regionLength),
+  );
+  const dataOffset =
+    BINARY_COVERAGE_HEADER_SIZE + regionLength + ((4 - (regionLength % 4)) % 4);
+
+  // Typed arrays use the platform byte order, which is little-endian
+  // on all platforms running the Gens frontend
+  return {
+    region,
+    zoom: zoomCode === 0 ? null : String.fromCharCode(zoomCode),
+    position: new Int32Array(buffer, dataOffset, nPoints),
+    value: new Float32Array(buffer, dataOffset + 4 * nPoints, nPoints),
+  };
+}
+
 async function getOverviewData(
   sampleId: string,
   caseId: string,
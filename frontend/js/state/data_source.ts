@@ -67,14 +67,13 @@ export function getRenderDataSource(
     listId: string,
     chrom: string,
   ): Promise<RenderBand[]> => {
-    const geneSymbols = new Set(await api.getGeneListGenes(listId, chrom));
     const onlyCanonical = true;
-    const transcriptsRaw = await api.getTranscripts(chrom, onlyCanonical);
-    const matchingTranscripts = transcriptsRaw.filter((tr) =>
-      geneSymbols.has(tr.name),
+    const transcriptsRaw = await api.getGeneListTranscripts(
+      listId,
+      chrom,
+      onlyCanonical,
     );
-
-    return parseTranscripts(matchingTranscripts);
+    return parseTranscripts(transcriptsRaw);
   };
 
   const getVariantBands = async (
@@ -40,6 +40,32 @@ async function request(
   return result;
 }
 
+// fetch a binary response as an ArrayBuffer
+async function requestBinary(
+  url: string,
+  params: string,
+  mediaType: string,
+): Promise<ArrayBuffer | null> {
+  if (params) {
+    url += "?" + objectToQueryString(params);
+  }
+  const response = await fetch(url, {
+    method: "GET",
+    headers: { Accept: mediaType },
+  });
+
+  if (response.status === 404) {
+    return null;
+  }
+
+  if (response.status !== 200) {
+    const text = await response.text();
+    throw new Error(`HTTP ${response.status}: ${text}`);
+  }
+
+  return response.arrayBuffer();
+}
+
 // converts an object into a query string
 // ex {region: 8:12-55} --> &region=8:12-55
 export function objectToQueryString(obj) {
@@ -52,6 +78,10 @@ export function get(url, params) {
   return request(url, params);
 }
 
+export function getBinary(url, params, mediaType = "application/octet-stream") {
+  return requestBinary(url, params, mediaType);
+}
+
 export function create(url, params) {
   return request(url, params, "POST");
 }
@@ -21,8 +21,13 @@ class InterpretationAdapter(ABC):
         sample_name: str,
         region: GenomicRegion,
         variant_category: VariantCategory,
+        rank_score_threshold: float | None = None,
+        sub_categories: list[str] | None = None,
     ) -> list[SimplifiedVariantRecord]:
-        """Return variants for a sample within a case, in the specified region (chromosome and position range)"""
+        """Return variants for a sample within a case, in the specified region (chromosome and position range)
+
+        Variants with a rank score below rank_score_threshold, or of other sub
+        categories than sub_categories, are excluded when given."""
 
     @abstractmethod
     def get_variant(self, variant_id: str) -> VariantRecord:
@@ -0,0 +1,140 @@
+"""Caching of variants from the interpretation software."""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from gens.adapters.base import InterpretationAdapter
+from gens.cache import TtlCache
+from gens.config import settings
+from gens.models.annotation import (
+    GeneListRecord,
+    SimplifiedVariantRecord,
+    VariantRecord,
+)
+from gens.models.genomic import GenomicRegion, VariantCategory
+
+LOG = logging.getLogger(__name__)
+
+VariantCacheKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class ChromosomeVariants:
+    """Variants of a sample on a chromosome.
+
+    The coordinates, rank scores and sub categories are kept in arrays that
+    region and filter queries are answered from.
+    """
+
+    positions: np.ndarray
+    ends: np.ndarray
+    # the end of a translocation can be on another chromosome
+    other_chrom_ends: np.ndarray
+    rank_scores: np.ndarray
+    sub_categories: np.ndarray
+    records: tuple[SimplifiedVariantRecord, ...]
+
+    @classmethod
+    def from_records(
+        cls, chromosome: str, records: list[SimplifiedVariantRecord]
+    ) -> "ChromosomeVariants":
+        return cls(
+            positions=np.array([rec.position for rec in records], dtype=np.int64),
+            ends=np.array([rec.end for rec in records], dtype=np.int64),
+            other_chrom_ends=np.array(
+                [rec.end_chrom not in (None, chromosome) for rec in records],
+                dtype=bool,
+            ),
+            rank_scores=np.array(
+                [
+                    np.nan if rec.rank_score is None else rec.rank_score
+                    for rec in records
+                ],
+                dtype=np.float64,
+            ),
+            sub_categories=np.array(
+                [rec.sub_category for rec in records], dtype=object
+            ),
+            records=tuple(records),
+        )
+
+    def query(
+        self,
+        start: int | None,
+        end: int | None,
+        rank_score_threshold: float | None = None,
+        sub_categories: list[str] | None = None,
+    ) -> list[SimplifiedVariantRecord]:
+        """Get the variants overlapping a region that pass the filters."""
+        keep = np.ones(len(self.records), dtype=bool)
+        if end is not None:
+            keep &= self.positions <= end
+        if start is not None:
+            keep &= (self.ends >= start) | self.other_chrom_ends
+        if rank_score_threshold is not None:
+            # variants without a rank score are kept
+            keep &= np.isnan(self.rank_scores) | (
+                self.rank_scores >= rank_score_threshold
+            )
+        if sub_categories is not None:
+            keep &= np.isin(self.sub_categories, sub_categories)
+        return [self.records[idx] for idx in np.flatnonzero(keep)]
+
+
+class CachedInterpretationAdapter(InterpretationAdapter):
+    """Cache the variants of another interpretation adapter.
+
+    The variants of a whole chromosome are fetched once per case, sample and
+    category, regions and filters within the chromosome are then answered from
+    memory until the cache entry expires.
+    """
+
+    def __init__(
+        self,
+        adapter: InterpretationAdapter,
+        cache: TtlCache[VariantCacheKey, ChromosomeVariants],
+    ):
+        self._adapter = adapter
+        self._cache = cache
+
+    def get_variants(
+        self,
+        case_id: str,
+        sample_name: str,
+        region: GenomicRegion,
+        variant_category: VariantCategory,
+        rank_score_threshold: float | None = None,
+        sub_categories: list[str] | None = None,
+    ) -> list[SimplifiedVariantRecord]:
+        key = (case_id, sample_name, str(variant_category), str(region.chromosome))
+
+        def _fetch_chromosome() -> ChromosomeVariants:
+            LOG.debug("Fetch variants of chromosome %s", region.chromosome)
+            records = self._adapter.get_variants(
+                case_id,
+                sample_name,
+                GenomicRegion(chromosome=region.chromosome, start=None, end=None),
+                variant_category,
+            )
+            return ChromosomeVariants.from_records(str(region.chromosome), records)
+
+        variants = self._cache.get_or_set(key, _fetch_chromosome)
+        return variants.query(
+            region.start, region.end, rank_score_threshold, sub_categories
+        )
+
+    def get_variant(self, variant_id: str) -> VariantRecord:
+        return self._adapter.get_variant(variant_id)
+
+    def get_gene_lists(self) -> list[GeneListRecord]:
+        return self._adapter.get_gene_lists()
+
+    def get_gene_list(self, gene_list_id: str) -> list[str]:
+        return self._adapter.get_gene_list(gene_list_id)
+
+
+variant_cache: TtlCache[VariantCacheKey, ChromosomeVariants] = TtlCache(
+    max_size=settings.variant_cache_size, ttl=settings.variant_cache_ttl
+)
@@ -26,6 +26,8 @@ class NullInterpretationAdapter(InterpretationAdapter):
         sample_name: str,
         region: GenomicRegion,
         variant_category: VariantCategory,
+        rank_score_threshold: float | None = None,
+        sub_categories: list[str] | None = None,
     ) -> list[SimplifiedVariantRecord]:
         return []
 
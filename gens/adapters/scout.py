@@ -1,12 +1,17 @@
 import logging
-from collections import defaultdict
 from typing import Any
 
 from pydantic import ValidationError
 from pymongo.database import Database
 
 from gens.adapters.base import InterpretationAdapter
-from gens.crud.scout import VariantNotFoundError, VariantValidationError
+from gens.cache import TtlCache
+from gens.config import settings
+from gens.crud.scout import (
+    VariantNotFoundError,
+    VariantValidationError,
+    get_variants,
+)
 from gens.models.annotation import (
     GeneListRecord,
     SimplifiedVariantRecord,
@@ -22,57 +27,24 @@ class ScoutMongoAdapter(InterpretationAdapter):
     def __init__(self, db: Database[Any]):
         self._db = db
 
-    # FIXME: Cleanup
     def get_variants(
         self,
         case_id: str,
         sample_name: str,
         region: GenomicRegion,
         variant_category: VariantCategory,
+        rank_score_threshold: float | None = None,
+        sub_categories: list[str] | None = None,
     ) -> list[SimplifiedVariantRecord]:
-        valid_genotype_calls = ["0/1", "1/1"]
-        query: dict[str, Any] = {
-            "case_id": case_id,
-            "category": variant_category,
-            "chromosome": region.chromosome,
-            "samples": {
-                "$elemMatch": {
-                    "genotype_call": {"$in": valid_genotype_calls},
-                    "$or": [{"sample_id": sample_name}, {"display_name": sample_name}],
-                }
-            },
-        }
-        if all(param is not None for param in [region.start, region.end]):
-            # FIXME: What is this?
-            # **query_genomic_regions(region.start, region.end, variant_category),  # type: ignore
-
-            query = {
-                **query,
-            }
-        projection: dict[str, bool] = {}
-        LOG.info("Query variant database: %s", query)
-
-        try:
-            result: list[SimplifiedVariantRecord] = []
-            for doc in self._db.get_collection("variant").find(query, projection):
-                genotype = None
-
-                for sample in doc.get("samples", []):
-                    if (
-                        sample.get("sample_id") == sample_name
-                        or sample.get("display_name") == sample_name
-                    ):
-                        genotype = sample.get("genotype_call")
-
-                doc_with_genotype = {**doc, "genotype": genotype}
-
-                result.append(SimplifiedVariantRecord.model_validate(doc_with_genotype))
-
-        except ValidationError as e:
-            LOG.error("Failed to validate variant data: %s", e)
-            # FIXME: More details?
-            raise VariantValidationError("Invalid variant data in Scout database ")
-        return result
+        return get_variants(
+            case_id,
+            sample_name,
+            region,
+            variant_category,
+            self._db,
+            rank_score_threshold=rank_score_threshold,
+            sub_categories=sub_categories,
+        )
 
     # FIXME: Consider cleanup
     def get_variant(self, document_id: str) -> VariantRecord:
@@ -94,57 +66,46 @@ class ScoutMongoAdapter(InterpretationAdapter):
         return variant
 
     def get_gene_lists(self) -> list[GeneListRecord]:
-
-        raw_query_results = list(
-            self._db.get_collection("gene_panel").find(
-                {}, {"_id": 1, "panel_name": 1, "display_name": 1, "version": 1}
-            )
-        )
-
-        all_gene_lists_parsed = [
+        # the latest version of each panel is picked by the database
+        pipeline: list[dict[str, Any]] = [
+            {"$sort": {"panel_name": 1, "version": -1}},
             {
-                "id": res["panel_name"],
-                "name": res["display_name"],
-                "version": res["version"],
-            }
-            for res in raw_query_results
+                "$group": {
+                    "_id": "$panel_name",
+                    "name": {"$first": "$display_name"},
+                    "version": {"$first": "$version"},
+                }
+            },
+            {"$sort": {"_id": 1}},
         ]
-
-        highest_version_per_panel: dict[str, float] = defaultdict(float)
-        for res_dict in all_gene_lists_parsed:
-            panel_id = res_dict["id"]
-            version = res_dict["version"]
-            if version > highest_version_per_panel[panel_id]:
-                highest_version_per_panel[panel_id] = res_dict["version"]
-
-        only_highest = [
-            {
-                "id": gene_list["id"],
-                "name": gene_list["name"],
-                "version": str(gene_list["version"]),
-            }
-            for gene_list in all_gene_lists_parsed
-            if gene_list["version"] == highest_version_per_panel[gene_list["id"]]
+        return [
+            GeneListRecord(id=res["_id"], name=res["name"], version=str(res["version"]))
+            for res in self._db.get_collection("gene_panel").aggregate(pipeline)
         ]
 
-        gene_lists = [GeneListRecord.model_validate(result) for result in only_highest]
-
-        return gene_lists
-
     def get_gene_list(self, gene_list_id: str) -> list[str]:
-        # Fetch the latest version of the panel by sorting on version descending
-        cursor = (
-            self._db.get_collection("gene_panel")
-            .find({"panel_name": gene_list_id})
-            .sort("version", -1)
-            .limit(1)
+        # only the version is read to find out if the cached genes are current
+        latest = self._db.get_collection("gene_panel").find_one(
+            {"panel_name": gene_list_id},
+            {"_id": False, "version": True},
+            sort=[("version", -1)],
         )
-        gene_list = next(cursor, None)
-        if not gene_list:
+        if latest is None:
             return []
-        genes = []
-        for gene in gene_list.get("genes", []):
-            symbol = gene.get("hgnc_symbol") or gene.get("symbol")
-            if symbol:
-                genes.append(symbol)
-        return genes
+        version = latest["version"]
+
+        def _fetch_genes() -> tuple[str, ...]:
+            gene_list = self._db.get_collection("gene_panel").find_one(
+                {"panel_name": gene_list_id, "version": version},
+                {"_id": False, "genes.hgnc_symbol": True, "genes.symbol": True},
+            )
+            genes = gene_list.get("genes", []) if gene_list is not None else []
+            symbols = (gene.get("hgnc_symbol") or gene.get("symbol") for gene in genes)
+            return tuple(symbol for symbol in symbols if symbol)
+
+        return list(gene_list_cache.get_or_set((gene_list_id, version), _fetch_genes))
+
+
+gene_list_cache: TtlCache[tuple[str, float], tuple[str, ...]] = TtlCache(
+    max_size=settings.gene_list_cache_size
+)
@@ -2,9 +2,11 @@
 Whole genome visualization of BAF and log2 ratio
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from logging.config import dictConfig
-from typing import Any
+from typing import Any, AsyncIterator
 from urllib.parse import quote
 
 from asgiref.wsgi import WsgiToAsgi
@@ -19,13 +21,17 @@ from flask import Flask, redirect, request, url_for
 from flask_compress import Compress  # type: ignore
 from flask_login import current_user  # type: ignore
 from itsdangerous import BadSignature
+from pymongo.errors import PyMongoError
 from werkzeug.wrappers.response import Response
 
 from gens.blueprints.gens.views import gens_bp
 from gens.blueprints.home.views import home_bp
 from gens.blueprints.login.views import login_bp
-from gens.db.db import init_database_connection
+from gens.crud.search_index import suggestion_index
+from gens.crud.transcript_index import transcript_index
+from gens.db.db import get_gens_db, init_database_connection, mongo_clients
 from gens.exceptions import SampleNotFoundError
+from gens.models.genomic import GenomeBuild
 
 from .auth import (
     login_manager,
@@ -58,6 +64,37 @@ LOG = logging.getLogger(__name__)
 compress = Compress()
 
 
+def preload_transcripts() -> None:
+    """Load the transcripts and search suggestions of all genome builds into memory."""
+    db = get_gens_db()
+    for genome_build in GenomeBuild:
+        try:
+            transcript_index.load(db, genome_build)
+        except PyMongoError as err:
+            LOG.warning("Could not preload transcripts of %s: %s", genome_build, err)
+        try:
+            suggestion_index.load(db, genome_build)
+        except PyMongoError as err:
+            LOG.warning(
+                "Could not preload search suggestions of %s: %s", genome_build, err
+            )
+
+
+def _log_preload_error(future: "asyncio.Future[None]") -> None:
+    if not future.cancelled() and future.exception() is not None:
+        LOG.error("Preloading transcripts failed", exc_info=future.exception())
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Load transcripts on startup and close the database connections on shutdown."""
+    # load in the background, requests arriving before load it on demand
+    preload = asyncio.get_running_loop().run_in_executor(None, preload_transcripts)
+    preload.add_done_callback(_log_preload_error)
+    yield
+    await mongo_clients.aclose()
+
+
 def create_app() -> FastAPI:
     """Create and setup Gens application."""
     # application = connexion.FlaskApp(__name__, specification_dir="openapi/")
@@ -68,6 +105,7 @@ def create_app() -> FastAPI:
         docs_url=None,
         redoc_url=None,
         openapi_url=None,
+        lifespan=lifespan,
     )
 
     # create and configure flask frontend
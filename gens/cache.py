@@ -0,0 +1,111 @@
+"""In-process caches shared between API requests."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+KT = TypeVar("KT", bound=Hashable)
+VT = TypeVar("VT")
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache utilization."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+    max_size: int = 0
+
+
+class TtlCache(Generic[KT, VT]):
+    """Thread-safe, size-bounded LRU cache where entries expire after a TTL.
+
+    A ttl of None keeps entries until they are evicted or invalidated.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float | None = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError("The cache must hold at least one entry")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[KT, tuple[float, VT]] = OrderedDict()
+        self._stats = CacheStats(max_size=max_size)
+
+    def get(self, key: KT) -> VT | None:
+        """Get a cached value, or None if it is missing or has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= self._timer():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return value
+                del self._entries[key]
+            self._stats.misses += 1
+            return None
+
+    def set(self, key: KT, value: VT) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        expires_at = float("inf") if self.ttl is None else self._timer() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def get_or_set(self, key: KT, factory: Callable[[], VT]) -> VT:
+        """Get a cached value or compute and store it with factory."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: KT) -> bool:
+        """Remove an entry and return True if it was cached."""
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+            self._stats.invalidations += removed
+            return removed
+
+    def invalidate_where(self, predicate: Callable[[KT], bool]) -> int:
+        """Remove all entries with keys matching predicate."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+                max_size=self.max_size,
+            )
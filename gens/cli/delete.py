@@ -12,6 +12,7 @@ from gens.crud.annotations import (
     delete_annotation_track,
     delete_annotations_for_track,
     get_annotation_track,
+    register_data_update,
 )
 from gens.crud.sample_annotations import (
     delete_sample_annotation_track,
@@ -254,4 +255,5 @@ def annotation(genome_build: GenomeBuild, name: str) -> None:
 
     delete_annotations_for_track(track.track_id, db)
     delete_annotation_track(track.track_id, db)
+    register_data_update(db, ANNOTATIONS_COLLECTION, name)
     click.secho("Finished removing annotation track ✔", fg="green")
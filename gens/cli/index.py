@@ -6,7 +6,7 @@ from os import getenv
 import click
 
 from gens.cli.util import db as cli_db
-from gens.db.index import INDEXES, create_indexes, update_indexes
+from gens.db.index import INDEXES, add_missing_bins, create_indexes, update_indexes
 
 log_level = getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(
@@ -27,6 +27,10 @@ def index(build: bool, update: bool) -> None:
     """Create indexes for the database."""
     db = cli_db.get_cli_db(list(INDEXES.keys()))
 
+    n_binned = add_missing_bins(db)
+    if n_binned > 0:
+        click.secho(f"Added genomic bins to {n_binned} records", fg="green")
+
     if update:
         n_updated = update_indexes(db)
         if n_updated == 0:
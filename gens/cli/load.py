@@ -18,13 +18,17 @@ from gens.cli.util.load_helpers import (
 )
 from gens.cli.util.util import ChoiceType, resolve_existing_path
 from gens.crud.annotations import (
+    ANNOTATION_BATCH_SIZE,
     register_data_update,
 )
-from gens.crud.transcripts import create_transcripts
+from gens.crud.transcript_index import create_transcript_payloads
+from gens.crud.transcripts import TRANSCRIPT_BATCH_SIZE, replace_transcripts
 from gens.db.collections import (
     CHROMSIZES_COLLECTION,
+    TRANSCRIPT_PAYLOADS_COLLECTION,
     TRANSCRIPTS_COLLECTION,
 )
+from gens.exceptions import DatabaseLockError
 from gens.load.chromosomes import build_chromosomes_obj, get_assembly_info
 from gens.load.transcripts import build_transcripts
 from gens.models.genomic import GenomeBuild
@@ -290,11 +294,32 @@ def sample_annotation(
     is_flag=True,
     help="Proceed with parsing AED files even if some entries fail.",
 )
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=ANNOTATION_BATCH_SIZE,
+    show_default=True,
+    help="Number of annotations inserted per database request.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of files of a directory loaded in parallel.",
+)
 def annotations(
-    file: Path, genome_build: GenomeBuild, is_tsv: bool, ignore_errors: bool
+    file: Path,
+    genome_build: GenomeBuild,
+    is_tsv: bool,
+    ignore_errors: bool,
+    batch_size: int = ANNOTATION_BATCH_SIZE,
+    workers: int = 1,
 ) -> None:
     """Load annotations from file into the database."""
-    load_annotations_data(LOG, file, genome_build, is_tsv, ignore_errors)
+    load_annotations_data(
+        LOG, file, genome_build, is_tsv, ignore_errors, workers, batch_size
+    )
     click.secho("Finished loading annotations ✔", fg="green")
 
 
@@ -318,16 +343,36 @@ def annotations(
     required=True,
     help="Genome build",
 )
-def transcripts(file: str, mane: str, genome_build: GenomeBuild) -> None:
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=TRANSCRIPT_BATCH_SIZE,
+    show_default=True,
+    help="Number of transcripts inserted at the time",
+)
+def transcripts(
+    file: str,
+    mane: str,
+    genome_build: GenomeBuild,
+    batch_size: int = TRANSCRIPT_BATCH_SIZE,
+) -> None:
     """Load transcripts into the database."""
-    db = cli_db.get_cli_db([TRANSCRIPTS_COLLECTION])
-    LOG.info("Building transcript object")
+    db = cli_db.get_cli_db([TRANSCRIPTS_COLLECTION, TRANSCRIPT_PAYLOADS_COLLECTION])
+    LOG.info("Loading transcripts")
     with open_text_or_gzip(file) as file_fh, open_text_or_gzip(mane) as mane_fh:
+        # transcripts are parsed while they are inserted
         transcripts_obj = build_transcripts(file_fh, mane_fh, genome_build)
-        LOG.info("Validating transcript format")
-
-    # FIXME build transcripts
-    create_transcripts(transcripts_obj, db)
+        try:
+            n_transcripts = replace_transcripts(
+                transcripts_obj, db, genome_build, batch_size
+            )
+        except DatabaseLockError as err:
+            raise click.ClickException(str(err)) from err
+    LOG.info("Loaded %d transcripts", n_transcripts)
+    LOG.info("Creating whole chromosome transcript payloads")
+    create_transcript_payloads(db, genome_build)
+    # running instances reload the transcripts together with the payloads
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
     click.secho("Finished loading transcripts ✔", fg="green")
 
 
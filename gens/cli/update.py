@@ -3,15 +3,18 @@
 import logging
 from os import getenv
 from pathlib import Path
+from typing import Any
 
 import click
 
 from gens.cli.util import db as cli_db
+from gens.cli.util.load_helpers import write_overview_caches
 from gens.cli.util.util import ChoiceType, normalize_sample_type
 from gens.crud.samples import get_sample, update_sample
 from gens.db.collections import (
     SAMPLES_COLLECTION,
 )
+from gens.io import read_overview_cache, write_overview_cache
 from gens.load.meta import parse_meta_file
 from gens.models.genomic import GenomeBuild
 from gens.models.sample import SampleInfo, SampleSex
@@ -138,4 +141,64 @@ def sample(
     )
 
     update_sample(db, sample_obj)
+    if coverage is not None or baf is not None:
+        write_overview_caches([sample_obj.baf_file, sample_obj.coverage_file])
     click.secho("Finished updating sample ✔", fg="green")
+
+
+@update.command()
+@click.option("-i", "--sample-id", help="Only update overviews of this sample")
+@click.option("-n", "--case-id", help="Only update overviews of samples in this case")
+@click.option(
+    "-b",
+    "--genome-build",
+    type=ChoiceType(GenomeBuild),
+    help="Only update overviews of samples with this genome build",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Rebuild overviews that are already up to date",
+)
+def overview(
+    sample_id: str | None,
+    case_id: str | None,
+    genome_build: GenomeBuild | None,
+    force: bool,
+) -> None:
+    """Precompute the overview plot data of existing samples."""
+
+    db = cli_db.get_cli_db([SAMPLES_COLLECTION])
+
+    query: dict[str, Any] = {}
+    if sample_id is not None:
+        query["sample_id"] = sample_id
+    if case_id is not None:
+        query["case_id"] = case_id
+    if genome_build is not None:
+        query["genome_build"] = int(genome_build)
+
+    n_written = n_current = n_failed = 0
+    sample_docs = db[SAMPLES_COLLECTION].find(
+        query, {"_id": 0, "baf_file": 1, "coverage_file": 1}
+    )
+    for sample_doc in sample_docs:
+        for file_path in (sample_doc["baf_file"], sample_doc["coverage_file"]):
+            sample_file = Path(file_path)
+            if not force and read_overview_cache(sample_file) is not None:
+                n_current += 1
+                continue
+            try:
+                write_overview_cache(sample_file)
+            except (OSError, ValueError) as err:
+                LOG.warning("Could not precompute overview of %s: %s", sample_file, err)
+                n_failed += 1
+                continue
+            n_written += 1
+
+    click.secho(
+        f"Wrote {n_written} overviews, {n_current} already up to date",
+        fg="green",
+    )
+    if n_failed > 0:
+        click.secho(f"Failed to write {n_failed} overviews", fg="red")
@@ -1,14 +1,14 @@
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from pymongo.database import Database
 
 from gens.crud.annotations import create_annotation_track, get_annotation_track
 from gens.load.annotations import (
     fmt_aed_to_annotation,
-    fmt_bed_to_annotation,
+    fmt_bed_to_document,
     parse_aed_file,
     parse_bed_file,
     parse_tsv_file,
@@ -47,11 +47,10 @@ def upsert_annotation_track(
 
 @dataclass
 class ParseRawResult:
-    records: list
+    records: Iterable[AnnotationRecord | dict[str, Any]]
     file_meta: list
 
 
-# FIXME: Reduce complexity to satisfy flake8 warnings
 def parse_raw_records(
     file_format: str,
     is_tsv: bool,
@@ -60,41 +59,58 @@ def parse_raw_records(
     track_result: InsertTrackResult,
     genome_build: GenomeBuild,
 ) -> ParseRawResult:
+    """Parse an annotation file.
+
+    BED and TSV records are parsed lazily while the records are iterated. BED
+    records are parsed directly to database documents.
+    """
 
     file_meta: list[dict[str, Any]] = []
-    records: list[AnnotationRecord] = []
+    records: Iterable[AnnotationRecord | dict[str, Any]]
 
     if is_tsv:
         file_format = "tsv"
 
     if file_format == "tsv":
-        for rec in parse_tsv_file(file):
-            validated_rec = AnnotationRecord.model_validate(
+        records = (
+            AnnotationRecord.model_validate(
                 {"track_id": track_result.track_id, "genome_build": genome_build, **rec}
             )
-            records.append(validated_rec)
+            for rec in parse_tsv_file(file)
+        )
 
     elif file_format == "bed":
-        for rec in parse_bed_file(file):
-            parsed_rec = fmt_bed_to_annotation(rec, track_result.track_id, genome_build)
-            records.append(parsed_rec)
+        records = (
+            fmt_bed_to_document(rec, track_result.track_id, genome_build)
+            for rec in parse_bed_file(file)
+        )
 
     elif file_format == "aed":
         file_meta, aed_records = parse_aed_file(file, ignore_errors)
-        records = []
-        for rec in aed_records:
-            try:
-                formatted_rec = fmt_aed_to_annotation(
-                    rec, track_result.track_id, genome_build
-                )
-            except ValueError:
-                LOG.warning("Failed to format rec to annotation: %s", rec)
-                if not ignore_errors:
-                    raise
-                continue
-
-            if formatted_rec is not None:
-                records.append(formatted_rec)
+        records = _format_aed_records(
+            aed_records, track_result, genome_build, ignore_errors
+        )
     else:
         raise ValueError(f'Unfamiliar file format detected: "{file_format}"')
     return ParseRawResult(records=records, file_meta=file_meta)
+
+
+def _format_aed_records(
+    aed_records: Iterable[dict[str, Any]],
+    track_result: InsertTrackResult,
+    genome_build: GenomeBuild,
+    ignore_errors: bool,
+) -> Iterator[AnnotationRecord]:
+    for rec in aed_records:
+        try:
+            formatted_rec = fmt_aed_to_annotation(
+                rec, track_result.track_id, genome_build
+            )
+        except ValueError:
+            LOG.warning("Failed to format rec to annotation: %s", rec)
+            if not ignore_errors:
+                raise
+            continue
+
+        if formatted_rec is not None:
+            yield formatted_rec
@@ -1,18 +1,24 @@
 """Helpers for CLI load commands."""
 
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
+from typing import Any, Iterable
 
 import click
+from pymongo.database import Database
 
 from gens.cli.util import db as cli_db
 from gens.cli.util.annotations import parse_raw_records, upsert_annotation_track
 from gens.cli.util.util import normalize_sample_type
 from gens.crud.annotations import (
-    create_annotations_for_track,
+    ANNOTATION_BATCH_SIZE,
     delete_annotation_track,
-    delete_annotations_for_track,
     register_data_update,
+    replace_annotations_for_track,
     update_annotation_track,
 )
 from gens.crud.sample_annotations import (
@@ -28,12 +34,28 @@ from gens.db.collections import (
     SAMPLE_ANNOTATIONS_COLLECTION,
     SAMPLES_COLLECTION,
 )
-from gens.load.annotations import fmt_bed_to_annotation, parse_bed_file
+from gens.exceptions import DatabaseLockError
+from gens.io import write_overview_cache
+from gens.load.annotations import fmt_bed_to_document, parse_bed_file
 from gens.load.meta import parse_meta_file
 from gens.models.genomic import GenomeBuild
 from gens.models.sample import SampleInfo, SampleSex
 from gens.models.sample_annotation import SampleAnnotationRecord, SampleAnnotationTrack
 
+LOG = logging.getLogger(__name__)
+
+
+def write_overview_caches(sample_files: Iterable[Path]) -> None:
+    """Precompute the overviews of coverage and BAF files.
+
+    Failures are logged and skipped, the overview is then built on first access.
+    """
+    for sample_file in sample_files:
+        try:
+            write_overview_cache(sample_file)
+        except (OSError, ValueError) as err:
+            LOG.warning("Could not precompute overview of %s: %s", sample_file, err)
+
 
 def load_sample_data(
     sample_id: str,
@@ -79,9 +101,13 @@ def load_sample_data(
         )
         if sample_exists:
             update_sample(db, sample_obj)
+            write_overview_caches([baf_file, coverage_file])
             return True
 
-    return create_sample(db, sample_obj)
+    is_created = create_sample(db, sample_obj)
+    if is_created:
+        write_overview_caches([baf_file, coverage_file])
+    return is_created
 
 
 def load_sample_annotation_data(
@@ -125,7 +151,7 @@ def load_sample_annotation_data(
     annotations = [
         SampleAnnotationRecord.model_validate(
             {
-                **fmt_bed_to_annotation(rec, track_id, genome_build).model_dump(),
+                **fmt_bed_to_document(rec, track_id, genome_build),
                 "sample_id": sample_id,
                 "case_id": case_id,
             }
@@ -145,34 +171,77 @@ def load_annotations_data(
     genome_build: GenomeBuild,
     is_tsv: bool,
     ignore_errors: bool,
+    workers: int = 1,
+    batch_size: int = ANNOTATION_BATCH_SIZE,
 ) -> None:
+    """Load an annotation file, or all annotation files in a directory.
+
+    Files in a directory are loaded by up to workers threads in parallel.
+    """
     db = cli_db.get_cli_db([ANNOTATIONS_COLLECTION])
 
     files = file.glob("*") if file.is_dir() else [file]
+    annot_files = [
+        annot_file
+        for annot_file in files
+        if annot_file.suffix in [".bed", ".aed", ".tsv"]
+    ]
 
-    for annot_file in files:
-        if annot_file.suffix not in [".bed", ".aed", ".tsv"]:
-            continue
-        logger.info("Processing %s", annot_file)
-
-        track_result = upsert_annotation_track(db, annot_file, genome_build)
-        file_format = annot_file.suffix[1:]
+    # files with the same name are loaded into the same track, one at the time
+    files_by_track: dict[str, list[Path]] = defaultdict(list)
+    for annot_file in sorted(annot_files):
+        files_by_track[annot_file.stem].append(annot_file)
 
-        try:
-            parse_recs_res = parse_raw_records(
-                file_format,
-                is_tsv,
+    def load_track_files(track_files: list[Path]) -> None:
+        for annot_file in track_files:
+            load_annotation_file(
+                logger,
+                db,
                 annot_file,
-                ignore_errors,
-                track_result,
                 genome_build,
+                is_tsv,
+                ignore_errors,
+                batch_size,
             )
-        except ValueError as err:
-            click.secho(
-                f"An error occured when creating loading annotation: {err}",
-                fg="red",
-            )
-            raise click.Abort() from err
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="annotation-load"
+    ) as executor:
+        futures = [
+            executor.submit(load_track_files, track_files)
+            for track_files in files_by_track.values()
+        ]
+        for future in futures:
+            future.result()
+
+
+def load_annotation_file(
+    logger: Logger,
+    db: Database[Any],
+    annot_file: Path,
+    genome_build: GenomeBuild,
+    is_tsv: bool,
+    ignore_errors: bool,
+    batch_size: int = ANNOTATION_BATCH_SIZE,
+) -> int:
+    """Load the annotations of a file as one track and return their number.
+
+    The records are validated and inserted in batches while the file is read.
+    """
+    logger.info("Processing %s", annot_file)
+
+    track_result = upsert_annotation_track(db, annot_file, genome_build)
+    file_format = annot_file.suffix[1:]
+
+    try:
+        parse_recs_res = parse_raw_records(
+            file_format,
+            is_tsv,
+            annot_file,
+            ignore_errors,
+            track_result,
+            genome_build,
+        )
 
         if len(parse_recs_res.file_meta) > 0:
             logger.debug("Updating existing annotation track with metadata from file.")
@@ -182,17 +251,34 @@ def load_annotations_data(
                 db=db,
             )
 
-        if len(parse_recs_res.records) == 0:
-            delete_annotation_track(track_result.track_id, db)
-            raise ValueError(
-                "Something went wrong parsing the annotations file, no valid annotations found."
-            )
+        # old annotations of the track are replaced once all new are loaded
+        logger.info("Load annotations in the database")
+        start_time = time.perf_counter()
+        n_inserted = replace_annotations_for_track(
+            track_result.track_id, parse_recs_res.records, db, batch_size
+        )
+    except ValueError as err:
+        click.secho(
+            f"An error occured when creating loading annotation: {err}",
+            fg="red",
+        )
+        raise click.Abort() from err
+    except DatabaseLockError as err:
+        raise click.ClickException(str(err)) from err
 
-        if track_result.track_in_db is not None:
-            logger.info("Removing old entries from the database")
-            if not delete_annotations_for_track(track_result.track_id, db):
-                logger.info("No annotations were removed from the database")
+    if n_inserted == 0:
+        delete_annotation_track(track_result.track_id, db)
+        raise ValueError(
+            "Something went wrong parsing the annotations file, no valid annotations found."
+        )
 
-        logger.info("Load annotations in the database")
-        create_annotations_for_track(parse_recs_res.records, db)
-        register_data_update(db, ANNOTATIONS_COLLECTION, annot_file.stem)
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        "Loaded %d annotations from %s in %.1f s, %.0f records/s",
+        n_inserted,
+        annot_file.name,
+        elapsed,
+        n_inserted / elapsed,
+    )
+    register_data_update(db, ANNOTATIONS_COLLECTION, annot_file.stem)
+    return n_inserted
@@ -73,6 +73,25 @@ class MongoDbConfig(BaseSettings):
 
     connection: MongoDsn = Field(..., description="Database connection string.")
     database: str | None = None
+    max_pool_size: int = Field(
+        default=100, gt=0, description="Max number of open connections in the pool."
+    )
+    min_pool_size: int = Field(
+        default=0, ge=0, description="Number of connections kept open when idle."
+    )
+    connect_timeout_ms: int = Field(
+        default=20_000, gt=0, description="Timeout for opening a new connection."
+    )
+    server_selection_timeout_ms: int = Field(
+        default=30_000,
+        gt=0,
+        description="Timeout for finding an available server for an operation.",
+    )
+    wait_queue_timeout_ms: int | None = Field(
+        default=None,
+        gt=0,
+        description="Timeout for waiting on a free connection when the pool is full.",
+    )
 
 
 class WarningIgnore(BaseModel):
@@ -164,6 +183,62 @@ class Settings(BaseSettings):
         description="Mapping between profile types and default profile definitions. Values are paths to JSON files relative to the config file.",
     )
 
+    tabix_pool_size: int = Field(
+        default=64,
+        gt=0,
+        description="Max number of open tabix file handles shared between API requests.",
+    )
+    tabix_read_workers: int = Field(
+        default=8,
+        gt=0,
+        description="Number of threads reading tabix files for batch requests.",
+    )
+
+    sample_cache_ttl: float = Field(
+        default=30,
+        ge=0,
+        description="Seconds a resolved sample file lookup is reused by the API.",
+    )
+    sample_cache_size: int = Field(
+        default=1024,
+        gt=0,
+        description="Max number of resolved sample file lookups kept in memory.",
+    )
+    variant_cache_ttl: float = Field(
+        default=300,
+        ge=0,
+        description=(
+            "Seconds the API reuses the variants of a chromosome fetched from the "
+            "interpretation software, 0 disables the cache."
+        ),
+    )
+    variant_cache_size: int = Field(
+        default=256,
+        gt=0,
+        description="Max number of chromosomes with variants kept in memory.",
+    )
+    gene_list_cache_size: int = Field(
+        default=128,
+        gt=0,
+        description="Max number of gene list versions kept in memory.",
+    )
+    transcript_index_refresh_interval: int = Field(
+        default=30,
+        ge=0,
+        description=(
+            "Seconds between checks if the transcripts were updated and the "
+            "in-memory transcript index needs to be reloaded."
+        ),
+    )
+    search_index_refresh_interval: int = Field(
+        default=30,
+        ge=0,
+        description=(
+            "Seconds between checks if transcripts or annotations were updated "
+            "and the in-memory search suggestion index needs to be reloaded."
+        ),
+    )
+
     warning_thresholds: list[WarningThreshold] = Field(
         default_factory=lambda: [],
         description="Rules for highlighting meta table warnings.",
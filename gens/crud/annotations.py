@@ -1,14 +1,19 @@
 """Related to manual annotation info."""
 
+import datetime
 import logging
+import time
 from collections import defaultdict
-from itertools import groupby
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import groupby, islice
+from typing import Any, Iterable, Iterator
 
 from pymongo import DESCENDING
 from pymongo.cursor import Cursor
 from pymongo.database import Database
+from pymongo.results import InsertManyResult
 
+from gens.crud.locks import database_lock
 from gens.db.collections import (
     ANNOTATION_TRACKS_COLLECTION,
     ANNOTATIONS_COLLECTION,
@@ -21,11 +26,15 @@ from gens.models.annotation import (
     SimplifiedTrackInfo,
 )
 from gens.models.base import PydanticObjectId
-from gens.models.genomic import GenomeBuild
+from gens.models.genomic import GenomeBuild, GenomicRegion
 from gens.utils import get_timestamp
 
+from .utils import MAX_BIN_POSITION, query_genomic_region, region_to_bin
+
 LOG = logging.getLogger(__name__)
 
+ANNOTATION_BATCH_SIZE = 5000
+
 
 def get_annotation_track(
     genome_build: GenomeBuild,
@@ -102,9 +111,24 @@ def get_annotation_tracks(
 
 
 def get_annotations_for_track(
-    track_id: PydanticObjectId, db: Database[Any]
+    track_id: PydanticObjectId,
+    db: Database[Any],
+    region: GenomicRegion | None = None,
 ) -> list[SimplifiedTrackInfo]:
-    """Get annotation track from database."""
+    """Get annotation track from database.
+
+    Optionally only get annotations on a chromosome or overlapping a region.
+    """
+    query: dict[str, Any] = {
+        "track_id": track_id,
+        **_query_generation(get_annotation_track_generation(track_id, db)),
+    }
+    if region is not None:
+        query["chrom"] = region.chromosome
+        if region.start is not None or region.end is not None:
+            query.update(
+                query_genomic_region(region.start or 1, region.end or MAX_BIN_POSITION)
+            )
     projection: dict[str, bool] = {
         "name": True,
         "start": True,
@@ -112,9 +136,7 @@ def get_annotations_for_track(
         "chrom": True,
         "color": True,
     }
-    cursor: Cursor = db.get_collection(ANNOTATIONS_COLLECTION).find(
-        {"track_id": track_id}, projection
-    )
+    cursor: Cursor = db.get_collection(ANNOTATIONS_COLLECTION).find(query, projection)
     return [
         SimplifiedTrackInfo.model_validate(
             {
@@ -145,19 +167,149 @@ def delete_annotations_for_track(track_id: PydanticObjectId, db: Database[Any])
 
 
 def create_annotations_for_track(
-    annotations: list[AnnotationRecord], db: Database[Any]
-) -> list[PydanticObjectId]:
-    """Insert annotations records in the database and return their object ids."""
-    data: list[dict[str, Any]] = [annot.model_dump() for annot in annotations]
-    LOG.info("inserting %d annotations", len(data))
-    resp = db.get_collection(ANNOTATIONS_COLLECTION).insert_many(data)
-    if len(resp.inserted_ids) > 0:
-        # get track ids from annotations and update modified timestamp for related track
-        for track_id in {annot.track_id for annot in annotations}:
+    annotations: Iterable[AnnotationRecord | dict[str, Any]],
+    db: Database[Any],
+    generation: int = 0,
+    batch_size: int = ANNOTATION_BATCH_SIZE,
+) -> int:
+    """Insert annotations records in the database and return the number inserted.
+
+    The annotations are consumed in batches, each batch is inserted unordered
+    in a background thread while the next batch is parsed and validated.
+    Annotations can also be given as already validated database documents,
+    as created by the BED parser.
+
+    The annotations are only returned for the track if the generation is the
+    current generation of the track.
+    """
+    collection = db.get_collection(ANNOTATIONS_COLLECTION)
+    annotations_iter = iter(annotations)
+    track_ids: set[PydanticObjectId] = set()
+    n_inserted = 0
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="annotation-insert"
+    ) as executor:
+        pending: Future[InsertManyResult] | None = None
+        while batch := [
+            _to_annotation_document(annot, generation)
+            for annot in islice(annotations_iter, batch_size)
+        ]:
+            track_ids.update(annot["track_id"] for annot in batch)
+            if pending is not None:
+                n_inserted += len(pending.result().inserted_ids)
+                _log_insert_rate(n_inserted, start_time)
+            pending = executor.submit(collection.insert_many, batch, ordered=False)
+        if pending is not None:
+            n_inserted += len(pending.result().inserted_ids)
+            _log_insert_rate(n_inserted, start_time)
+
+    if n_inserted > 0:
+        # update modified timestamp for related track
+        for track_id in track_ids:
             db.get_collection(ANNOTATION_TRACKS_COLLECTION).update_one(
                 {"track_id": track_id}, {"$set": {"modified_at": get_timestamp()}}
             )
-    return [PydanticObjectId(id) for id in resp.inserted_ids]
+    return n_inserted
+
+
+def _to_annotation_document(
+    annotation: AnnotationRecord | dict[str, Any], generation: int
+) -> dict[str, Any]:
+    doc = (
+        annotation.model_dump()
+        if isinstance(annotation, AnnotationRecord)
+        else dict(annotation)
+    )
+    doc["bin"] = region_to_bin(doc["start"], doc["end"])
+    doc["generation"] = generation
+    return doc
+
+
+def _log_insert_rate(n_inserted: int, start_time: float) -> None:
+    LOG.info(
+        "Inserted %d annotations, %.0f records/s",
+        n_inserted,
+        n_inserted / (time.perf_counter() - start_time),
+    )
+
+
+def get_annotation_track_generation(
+    track_id: PydanticObjectId, db: Database[Any]
+) -> int:
+    """Get the generation of the annotations currently shown for a track."""
+    track = db.get_collection(ANNOTATION_TRACKS_COLLECTION).find_one(
+        {"_id": track_id}, {"generation": True}
+    )
+    if track is None:
+        return 0
+    return track.get("generation", 0)
+
+
+def get_current_annotation_names(
+    db: Database[Any], genome_build: GenomeBuild
+) -> Iterator[dict[str, Any]]:
+    """Get the id and name of the annotations shown for the tracks of a build."""
+    tracks = db.get_collection(ANNOTATION_TRACKS_COLLECTION).find(
+        {"genome_build": genome_build}, {"generation": True}
+    )
+    for track in list(tracks):
+        yield from db.get_collection(ANNOTATIONS_COLLECTION).find(
+            {"track_id": track["_id"], **_query_generation(track.get("generation", 0))},
+            {"name": True},
+        )
+
+
+def _query_generation(generation: int) -> dict[str, Any]:
+    # annotations loaded before generations were used have none
+    if generation == 0:
+        return {"generation": {"$in": [0, None]}}
+    return {"generation": generation}
+
+
+def replace_annotations_for_track(
+    track_id: PydanticObjectId,
+    annotations: Iterable[AnnotationRecord | dict[str, Any]],
+    db: Database[Any],
+    batch_size: int = ANNOTATION_BATCH_SIZE,
+) -> int:
+    """Replace the annotations of a track without a window of missing annotations.
+
+    The new annotations are inserted as the next generation of the track, which
+    is not visible to readers until the track is switched to it in a single
+    update. Annotations of older generations are removed afterwards. The track
+    is not switched if there were no annotations. Raises DatabaseLockError if
+    the track is already being loaded. Returns the number of inserted
+    annotations.
+    """
+    with database_lock(db, f"annotation-track-{track_id}"):
+        current_generation = get_annotation_track_generation(track_id, db)
+        generation = current_generation + 1
+        annotations_c = db.get_collection(ANNOTATIONS_COLLECTION)
+        # remove leftovers of an interrupted load
+        annotations_c.delete_many(
+            {"track_id": track_id, "generation": {"$gt": current_generation}}
+        )
+        LOG.info("Inserting generation %d of annotation track", generation)
+        try:
+            n_inserted = create_annotations_for_track(
+                annotations, db, generation=generation, batch_size=batch_size
+            )
+        except Exception:
+            # the track keeps the annotations of the current generation
+            annotations_c.delete_many({"track_id": track_id, "generation": generation})
+            raise
+        if n_inserted == 0:
+            return 0
+        db.get_collection(ANNOTATION_TRACKS_COLLECTION).update_one(
+            {"_id": track_id},
+            {"$set": {"generation": generation, "modified_at": get_timestamp()}},
+        )
+        resp = annotations_c.delete_many(
+            {"track_id": track_id, "generation": {"$ne": generation}}
+        )
+        LOG.info("Removed %d annotations of older generations", resp.deleted_count)
+    return n_inserted
 
 
 def get_annotation(
@@ -184,6 +336,20 @@ def register_data_update(
     collection.insert_one({**track, "timestamp": get_timestamp()})
 
 
+def get_latest_data_update(
+    db: Database[Any], track_types: list[str]
+) -> datetime.datetime | None:
+    """Get when any of the given track types was last updated."""
+    latest = db.get_collection(UPDATES_COLLECTION).find_one(
+        {"track": {"$in": track_types}},
+        {"_id": False, "timestamp": True},
+        sort=[("timestamp", DESCENDING)],
+    )
+    if latest is None:
+        return None
+    return latest["timestamp"]
+
+
 def get_data_update_timestamp(
     gens_db: Database[Any], track_type: str = "all"
 ) -> dict[str, list[dict[str, Any]]]:
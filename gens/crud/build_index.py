@@ -0,0 +1,135 @@
+"""Base of in-memory indexes of genome build data that reload on updates."""
+
+import datetime
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, TypeVar
+
+from pymongo.database import Database
+
+from gens.crud.annotations import get_latest_data_update
+from gens.models.genomic import GenomeBuild
+
+LOG = logging.getLogger(__name__)
+
+DataT = TypeVar("DataT")
+
+
+@dataclass
+class LoadedBuild(Generic[DataT]):
+    """Data of a genome build and the update it was loaded from."""
+
+    data: DataT
+    updated_at: datetime.datetime | None
+    checked_at: float
+
+
+class GenomeBuildIndex(ABC, Generic[DataT]):
+    """Data of each genome build kept in process memory.
+
+    A genome build is loaded on first use. The update timestamps of the
+    collections are checked at most every refresh_interval seconds and the
+    build is reloaded when they change. The check and the reload run outside
+    the index lock, by one thread per build, while other requests are answered
+    with the loaded data until the reloaded data is swapped in.
+    """
+
+    # collections whose update timestamps trigger a reload
+    collections: list[str]
+
+    def __init__(
+        self,
+        refresh_interval: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_interval = refresh_interval
+        self._timer = timer
+        # guards the loaded builds and the loader locks, never held during reads
+        self._lock = threading.Lock()
+        self._builds: dict[GenomeBuild, LoadedBuild[DataT]] = {}
+        self._loader_locks: dict[GenomeBuild, threading.Lock] = {}
+
+    @abstractmethod
+    def _read(self, db: Database[Any], genome_build: GenomeBuild) -> DataT:
+        """Read the data of a genome build from the database."""
+
+    def load(self, db: Database[Any], genome_build: GenomeBuild) -> None:
+        """Load, or reload, the data of a genome build."""
+        with self._loader_lock(genome_build):
+            self._reload(db, genome_build)
+
+    def clear(self) -> None:
+        """Remove all loaded data."""
+        with self._lock:
+            self._builds.clear()
+
+    def get(self, db: Database[Any], genome_build: GenomeBuild) -> LoadedBuild[DataT]:
+        """Get a genome build, reloading it if it was updated.
+
+        The returned build can be older than the latest update while another
+        thread reloads it, use its updated_at for what was served.
+        """
+        build = self._get_fresh(genome_build)
+        if build is not None:
+            return build
+        with self._lock:
+            build = self._builds.get(genome_build)
+        loader_lock = self._loader_lock(genome_build)
+        if build is not None:
+            # another thread is checking for updates, keep using the loaded data
+            if not loader_lock.acquire(blocking=False):
+                return build
+        else:
+            # nothing to answer with until the build is loaded
+            loader_lock.acquire()
+        try:
+            # the build can have been loaded while waiting for the loader lock
+            build = self._get_fresh(genome_build)
+            if build is not None:
+                return build
+            return self._reload(db, genome_build, only_if_updated=True)
+        finally:
+            loader_lock.release()
+
+    def _get(self, db: Database[Any], genome_build: GenomeBuild) -> DataT:
+        """Get the data of a genome build, reloading it if it was updated."""
+        return self.get(db, genome_build).data
+
+    def _get_fresh(self, genome_build: GenomeBuild) -> LoadedBuild[DataT] | None:
+        """Get a build checked for updates within the refresh interval."""
+        with self._lock:
+            build = self._builds.get(genome_build)
+            if (
+                build is not None
+                and self._timer() - build.checked_at < self.refresh_interval
+            ):
+                return build
+        return None
+
+    def _loader_lock(self, genome_build: GenomeBuild) -> threading.Lock:
+        with self._lock:
+            return self._loader_locks.setdefault(genome_build, threading.Lock())
+
+    def _reload(
+        self,
+        db: Database[Any],
+        genome_build: GenomeBuild,
+        only_if_updated: bool = False,
+    ) -> LoadedBuild[DataT]:
+        """Read a build and swap it in, the caller holds its loader lock."""
+        checked_at = self._timer()
+        # the timestamp is read first, updates during the read cause a reload
+        updated_at = get_latest_data_update(db, self.collections)
+        with self._lock:
+            build = self._builds.get(genome_build)
+        if only_if_updated and build is not None and build.updated_at == updated_at:
+            data = build.data
+        else:
+            data = self._read(db, genome_build)
+        build = LoadedBuild(data=data, updated_at=updated_at, checked_at=checked_at)
+        with self._lock:
+            self._builds[genome_build] = build
+        return build
@@ -0,0 +1,59 @@
+"""Locks preventing concurrent loads from overwriting each other's data."""
+
+import datetime
+import logging
+import os
+import socket
+from contextlib import contextmanager
+from typing import Any, Iterator
+from uuid import uuid4
+
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from gens.db.collections import LOCKS_COLLECTION
+from gens.exceptions import DatabaseLockError
+from gens.utils import get_timestamp
+
+LOG = logging.getLogger(__name__)
+
+# locks of loads that crashed without releasing them are taken over after this
+LOCK_EXPIRY = datetime.timedelta(hours=12)
+
+
+@contextmanager
+def database_lock(db: Database[Any], name: str) -> Iterator[None]:
+    """Hold a lock stored in the database while loading data.
+
+    Fails immediately with DatabaseLockError if another load holds the lock.
+    """
+    locks_c = db.get_collection(LOCKS_COLLECTION)
+    now = get_timestamp()
+    owner = str(uuid4())
+    try:
+        # inserts the lock, or takes over an expired one, a held lock is a duplicate
+        locks_c.update_one(
+            {"_id": name, "locked_at": {"$lt": now - LOCK_EXPIRY}},
+            {
+                "$set": {
+                    "owner": owner,
+                    "host": socket.gethostname(),
+                    "pid": os.getpid(),
+                    "locked_at": now,
+                }
+            },
+            upsert=True,
+        )
+    except DuplicateKeyError as err:
+        lock = locks_c.find_one({"_id": name}) or {}
+        raise DatabaseLockError(
+            f"{name} is being loaded by process {lock.get('pid')} on "
+            f"{lock.get('host')} since {lock.get('locked_at')}, try again once "
+            f"it has finished"
+        ) from err
+    LOG.debug("Acquired lock %s", name)
+    try:
+        yield
+    finally:
+        locks_c.delete_one({"_id": name, "owner": owner})
+        LOG.debug("Released lock %s", name)
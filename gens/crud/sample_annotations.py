@@ -20,6 +20,8 @@ from gens.models.sample_annotation import (
 )
 from gens.utils import get_timestamp
 
+from .utils import MAX_BIN_POSITION, query_genomic_region, region_to_bin
+
 LOG = logging.getLogger(__name__)
 
 
@@ -97,8 +99,15 @@ def get_sample_annotation_tracks(
 
 
 def get_sample_annotations_for_track(
-    track_id: PydanticObjectId, chromosome: Chromosome, db: Database[Any]
+    track_id: PydanticObjectId,
+    chromosome: Chromosome,
+    db: Database[Any],
+    start: int | None = None,
+    end: int | None = None,
 ) -> list[SimplifiedTrackInfo]:
+    query: dict[str, Any] = {"track_id": track_id, "chrom": chromosome}
+    if start is not None or end is not None:
+        query.update(query_genomic_region(start or 1, end or MAX_BIN_POSITION))
     projection = {
         "name": True,
         "start": True,
@@ -107,7 +116,7 @@ def get_sample_annotations_for_track(
         "color": True,
     }
     cursor: Cursor = db.get_collection(SAMPLE_ANNOTATIONS_COLLECTION).find(
-        {"track_id": track_id, "chrom": chromosome}, projection
+        query, projection
     )
     return [
         SimplifiedTrackInfo.model_validate(
@@ -181,7 +190,10 @@ def delete_sample_annotation_tracks_for_sample(
 def create_sample_annotations_for_track(
     annotations: list[SampleAnnotationRecord], db: Database[Any]
 ) -> list[PydanticObjectId]:
-    data = [annot.model_dump() for annot in annotations]
+    data = [
+        {**annot.model_dump(), "bin": region_to_bin(annot.start, annot.end)}
+        for annot in annotations
+    ]
     resp = db.get_collection(SAMPLE_ANNOTATIONS_COLLECTION).insert_many(data)
     if len(resp.inserted_ids) > 0:
         for track_id in {annot.track_id for annot in annotations}:
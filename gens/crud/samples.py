@@ -6,21 +6,34 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from pymongo import DESCENDING
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.collection import Collection
 from pymongo.database import Database
 from pymongo.errors import DuplicateKeyError
 
+from gens.cache import TtlCache
+from gens.config import settings
 from gens.crud.sample_annotations import delete_sample_annotation_tracks_for_sample
 from gens.db.collections import SAMPLES_COLLECTION
 from gens.exceptions import NonUniqueIndexError, SampleNotFoundError
+from gens.io import run_in_tabix_executor
 from gens.models.genomic import GenomeBuild
-from gens.models.sample import MetaEntry, MultipleSamples, SampleInfo
+from gens.models.sample import MetaEntry, MultipleSamples, SampleFiles, SampleInfo
 
 LOG = logging.getLogger(__name__)
 
 
 INDEX_FIELDS: set[str] = {"baf_index", "coverage_index"}
 
+SampleFilesKey = tuple[str, str, int]
+
+# Resolved sample files, keyed on sample_id, case_id and genome_build. Samples
+# are changed by the CLI in another process, so entries are only dropped when
+# they expire.
+sample_files_cache: TtlCache[SampleFilesKey, SampleFiles] = TtlCache(
+    max_size=settings.sample_cache_size, ttl=settings.sample_cache_ttl
+)
+
 
 def update_sample(db: Database[Any], sample_obj: SampleInfo) -> None:
     """Update an existing sample in the database."""
@@ -268,6 +281,81 @@ def get_sample(
     )
 
 
+def _sample_files_key(
+    sample_id: str, case_id: str, genome_build: GenomeBuild
+) -> SampleFilesKey:
+    return (sample_id, case_id, int(genome_build))
+
+
+def _sample_files_query(key: SampleFilesKey) -> tuple[dict[str, Any], dict[str, bool]]:
+    sample_id, case_id, genome_build = key
+    return (
+        {"sample_id": sample_id, "case_id": case_id, "genome_build": genome_build},
+        {"_id": False, "baf_file": True, "coverage_file": True},
+    )
+
+
+def _cache_sample_files(
+    key: SampleFilesKey, result: dict[str, Any] | None
+) -> SampleFiles:
+    """Check that the files of a sample exist and cache them."""
+    if result is None:
+        raise SampleNotFoundError(f'No sample with id: "{key[0]}" in database', key[0])
+
+    error_msgs = []
+    if not Path(result["baf_file"]).is_file():
+        error_msgs.append(f"BAF file {result['baf_file']} not found on disk")
+    if not Path(result["coverage_file"]).is_file():
+        error_msgs.append(f"Coverage file {result['coverage_file']} not found on disk")
+    if error_msgs:
+        raise FileNotFoundError(
+            "Encountered errors while accessing sample files: " + "\n".join(error_msgs)
+        )
+
+    sample_files = SampleFiles(
+        baf_file=result["baf_file"], coverage_file=result["coverage_file"]
+    )
+    sample_files_cache.set(key, sample_files)
+    return sample_files
+
+
+def get_sample_files(
+    samples_c: Collection[dict[str, Any]],
+    sample_id: str,
+    case_id: str,
+    genome_build: GenomeBuild,
+) -> SampleFiles:
+    """Get the coverage and BAF files of a sample.
+
+    Lookups are cached for sample_cache_ttl seconds, so samples updated or
+    deleted with the CLI can be served with their old files until then.
+    """
+    key = _sample_files_key(sample_id, case_id, genome_build)
+    cached = sample_files_cache.get(key)
+    if cached is not None:
+        return cached
+    return _cache_sample_files(key, samples_c.find_one(*_sample_files_query(key)))
+
+
+async def get_sample_files_async(
+    samples_c: AsyncCollection[dict[str, Any]],
+    sample_id: str,
+    case_id: str,
+    genome_build: GenomeBuild,
+) -> SampleFiles:
+    """Get the coverage and BAF files of a sample without blocking the event loop.
+
+    Shares the cache with get_sample_files. The files are checked in the
+    tabix reader threads.
+    """
+    key = _sample_files_key(sample_id, case_id, genome_build)
+    cached = sample_files_cache.get(key)
+    if cached is not None:
+        return cached
+    result = await samples_c.find_one(*_sample_files_query(key))
+    return await run_in_tabix_executor(_cache_sample_files, key, result)
+
+
 def delete_sample(
     db: Database[Any], sample_id: str, case_id: str, genome_build: GenomeBuild
 ) -> None:
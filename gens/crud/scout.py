@@ -21,22 +21,35 @@ class VariantNotFoundError(Exception):
     pass
 
 
-def get_variants(
+# fields needed for the simplified variant records
+SIMPLIFIED_VARIANT_PROJECTION: dict[str, bool] = {
+    "_id": False,
+    "document_id": True,
+    "position": True,
+    "end": True,
+    "end_chrom": True,
+    "variant_type": True,
+    "sub_category": True,
+    "rank_score": True,
+    "samples.sample_id": True,
+    "samples.display_name": True,
+    "samples.genotype_call": True,
+}
+
+
+def build_variants_query(
     case_id: str,
     sample_name: str,
     region: GenomicRegion,
     variant_category: VariantCategory,
-    db: Database[Any],
-) -> list[SimplifiedVariantRecord]:
-    """Search the scout database for variants associated with a case.
-
-    case_id :: id for a case
-    sample_name :: display name for a sample
-    variant_category :: categories
+    rank_score_threshold: float | None = None,
+    sub_categories: list[str] | None = None,
+) -> dict[str, Any]:
+    """Build the query for the variants of a sample in a region.
 
-    Kwargs are optional search parameters that are passed to db.find().
+    The case, category, chromosome and position fields lead the query so that
+    it can use the indexes of the Scout variant collection.
     """
-    # build query
     valid_genotype_calls = [
         "0/1",
         "1/1",
@@ -52,31 +65,80 @@ def get_variants(
             }
         },
     }
-    # add start, end position to query
-    if all(param is not None for param in [region.start, region.end]):
-        # FIXME: Is the query_genomic_region important? Why is it used?
-        query = {
-            **query,
-            # **query_genomic_region(region.start, region.end, variant_category),  # type: ignore
-        }
-    projection: dict[str, bool] = {}
+    conditions: list[dict[str, Any]] = []
+    # variants overlapping the region, start is called position in Scout
+    if region.end is not None:
+        query["position"] = {"$lte": region.end}
+    if region.start is not None and region.start > 1:
+        conditions.append(
+            {
+                "$or": [
+                    {"end": {"$gte": region.start}},
+                    # the end of a translocation is on the other chromosome
+                    {"end_chrom": {"$nin": [None, region.chromosome]}},
+                ]
+            }
+        )
+    if rank_score_threshold is not None:
+        # variants without a rank score are kept
+        conditions.append(
+            {
+                "$or": [
+                    {"rank_score": None},
+                    {"rank_score": {"$gte": rank_score_threshold}},
+                ]
+            }
+        )
+    if sub_categories is not None:
+        query["sub_category"] = {"$in": sub_categories}
+    if conditions:
+        query["$and"] = conditions
+    return query
+
+
+def get_variants(
+    case_id: str,
+    sample_name: str,
+    region: GenomicRegion,
+    variant_category: VariantCategory,
+    db: Database[Any],
+    rank_score_threshold: float | None = None,
+    sub_categories: list[str] | None = None,
+) -> list[SimplifiedVariantRecord]:
+    """Search the scout database for variants associated with a case.
+
+    case_id :: id for a case
+    sample_name :: display name for a sample
+    variant_category :: categories
+    rank_score_threshold :: min rank score of variants with a rank score
+    sub_categories :: sub categories to include
+    """
+    query = build_variants_query(
+        case_id,
+        sample_name,
+        region,
+        variant_category,
+        rank_score_threshold=rank_score_threshold,
+        sub_categories=sub_categories,
+    )
     # query database
     LOG.info("Query variant database: %s", query)
+    cursor = db.get_collection("variant").find(query, SIMPLIFIED_VARIANT_PROJECTION)
     try:
         result: list[SimplifiedVariantRecord] = []
-        for doc in db.get_collection("variant").find(query, projection):
+        for doc in cursor:
             genotype = None
 
-            for sample in doc.get("samples", []):
+            for sample in doc.pop("samples", []):
                 if (
                     sample.get("sample_id") == sample_name
                     or sample.get("display_name") == sample_name
                 ):
                     genotype = sample.get("genotype_call")
 
-            doc_with_genotype = {**doc, "genotype": genotype}
+            doc["genotype"] = genotype
 
-            result.append(SimplifiedVariantRecord.model_validate(doc_with_genotype))
+            result.append(SimplifiedVariantRecord.model_validate(doc))
 
     except ValidationError as e:
         LOG.error("Failed to validate variant data: %s", e)
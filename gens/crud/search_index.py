@@ -0,0 +1,162 @@
+"""In-memory prefix index of gene and annotation names for search suggestions."""
+
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+from bson import ObjectId
+from pymongo.database import Database
+
+from gens.config import settings
+from gens.constants import ENSEMBL_CANONICAL, MANE_PLUS_CLINICAL, MANE_SELECT
+from gens.crud.annotations import get_current_annotation_names
+from gens.crud.build_index import GenomeBuildIndex
+from gens.db.collections import ANNOTATIONS_COLLECTION, TRANSCRIPTS_COLLECTION
+from gens.models.genomic import GenomeBuild
+from gens.models.search import SearchSuggestions, Suggestion
+
+LOG = logging.getLogger(__name__)
+
+MANE_RANKS = {MANE_SELECT: 3, MANE_PLUS_CLINICAL: 2, ENSEMBL_CANONICAL: 1}
+SUGGESTION_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class PrefixIndex:
+    """Names sorted on their lower case key for prefix lookups.
+
+    Each key is stored once, with the record of the best ranked entry.
+    """
+
+    keys: list[str]
+    texts: list[str]
+    record_ids: list[ObjectId]
+    ranks: np.ndarray
+    key_lengths: np.ndarray
+
+    @classmethod
+    def from_entries(
+        cls, entries: Iterable[tuple[str, str, ObjectId, int]]
+    ) -> "PrefixIndex":
+        """Build the index from (key, text, record id, rank) entries."""
+        best: dict[str, tuple[str, ObjectId, int]] = {}
+        for key, text, record_id, rank in entries:
+            key = key.lower()
+            if key not in best or rank > best[key][2]:
+                best[key] = (text, record_id, rank)
+        keys = sorted(best)
+        return cls(
+            keys=keys,
+            texts=[best[key][0] for key in keys],
+            record_ids=[best[key][1] for key in keys],
+            ranks=np.array([best[key][2] for key in keys], dtype=np.int8),
+            key_lengths=np.array([len(key) for key in keys], dtype=np.int32),
+        )
+
+    def search(self, query: str, limit: int = SUGGESTION_LIMIT) -> list[Suggestion]:
+        """Get the best ranked names starting with the query.
+
+        Names are ranked on their rank, then on how much of the name the query
+        covers, the score is the sum of the two.
+        """
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+        first = bisect_left(self.keys, prefix)
+        last = bisect_right(self.keys, prefix + "\uffff", lo=first)
+        if first == last:
+            return []
+        scores = self.ranks[first:last] + len(prefix) / self.key_lengths[first:last]
+        # the same text can be found with different keys, keep spare candidates
+        n_candidates = min(len(scores), 2 * limit)
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        suggestions: dict[str, Suggestion] = {}
+        for idx in sorted(candidates, key=lambda idx: (-scores[idx], idx)):
+            text = self.texts[first + idx]
+            if text not in suggestions:
+                suggestions[text] = Suggestion(
+                    text=text,
+                    record_id=self.record_ids[first + idx],
+                    score=float(scores[idx]),
+                )
+            if len(suggestions) == limit:
+                break
+        return list(suggestions.values())
+
+
+def _transcript_entries(
+    db: Database[Any], genome_build: GenomeBuild
+) -> Iterable[tuple[str, str, ObjectId, int]]:
+    """Gene symbols, HGNC ids and RefSeq ids of the transcripts."""
+    cursor = db.get_collection(TRANSCRIPTS_COLLECTION).find(
+        {"genome_build": genome_build},
+        {"gene_name": True, "hgnc_id": True, "refseq_id": True, "mane": True},
+    )
+    for doc in cursor:
+        gene_name = doc["gene_name"]
+        rank = MANE_RANKS.get(doc.get("mane") or "", 0)
+        yield gene_name, gene_name, doc["_id"], rank
+        if doc.get("hgnc_id"):
+            yield f"HGNC:{doc['hgnc_id']}", gene_name, doc["_id"], rank
+        if doc.get("refseq_id"):
+            yield doc["refseq_id"], gene_name, doc["_id"], rank
+
+
+def _annotation_entries(
+    db: Database[Any], genome_build: GenomeBuild
+) -> Iterable[tuple[str, str, ObjectId, int]]:
+    """Names of the annotations shown for each track."""
+    for doc in get_current_annotation_names(db, genome_build):
+        yield doc["name"], doc["name"], doc["_id"], 0
+
+
+@dataclass
+class _GenomeBuildSuggestions:
+    transcripts: PrefixIndex
+    annotations: PrefixIndex
+
+
+class SuggestionIndex(GenomeBuildIndex[_GenomeBuildSuggestions]):
+    """Prefix indexes of each genome build kept in process memory.
+
+    A genome build is reloaded when transcripts or annotations are updated.
+    """
+
+    collections = [TRANSCRIPTS_COLLECTION, ANNOTATIONS_COLLECTION]
+
+    def suggest(
+        self,
+        db: Database[Any],
+        query: str,
+        genome_build: GenomeBuild,
+        limit: int = SUGGESTION_LIMIT,
+    ) -> SearchSuggestions:
+        """Suggest genes and annotations starting with the query."""
+        build = self._get(db, genome_build)
+        return SearchSuggestions(
+            transcript_suggestion=build.transcripts.search(query, limit),
+            annotation_suggestion=build.annotations.search(query, limit),
+        )
+
+    def _read(
+        self, db: Database[Any], genome_build: GenomeBuild
+    ) -> _GenomeBuildSuggestions:
+        LOG.info("Loading search suggestions of genome build %s", genome_build)
+        start_time = time.perf_counter()
+        transcripts = PrefixIndex.from_entries(_transcript_entries(db, genome_build))
+        annotations = PrefixIndex.from_entries(_annotation_entries(db, genome_build))
+        LOG.info(
+            "Loaded %d gene and %d annotation names in %.1f s",
+            len(transcripts.keys),
+            len(annotations.keys),
+            time.perf_counter() - start_time,
+        )
+        return _GenomeBuildSuggestions(transcripts=transcripts, annotations=annotations)
+
+
+suggestion_index = SuggestionIndex(
+    refresh_interval=settings.search_index_refresh_interval
+)
@@ -0,0 +1,207 @@
+"""In-memory index of transcripts answering region queries without the database."""
+
+import gzip
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from pymongo.database import Database
+
+from gens.config import settings
+from gens.crud.build_index import GenomeBuildIndex
+from gens.db.collections import TRANSCRIPT_PAYLOADS_COLLECTION, TRANSCRIPTS_COLLECTION
+from gens.models.annotation import SimplifiedTranscriptInfo
+from gens.models.genomic import GenomeBuild, GenomicRegion
+
+from .transcripts import (
+    CANONICAL_TYPES,
+    SIMPLIFIED_TRANSCRIPT_PROJECTION,
+    to_simplified_transcript,
+)
+from .utils import MAX_BIN_POSITION
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChromosomeTranscripts:
+    """Transcripts of a chromosome sorted on start position.
+
+    The transcripts are kept serialized as JSON, a region query only selects
+    which of them to join into the response.
+    """
+
+    starts: np.ndarray
+    ends: np.ndarray
+    # running max of the end positions, used to skip transcripts ending
+    # before the region without scanning them
+    max_ends: np.ndarray
+    is_canonical: np.ndarray
+    serialized: list[bytes]
+
+    @classmethod
+    def from_transcripts(
+        cls, transcripts: list[SimplifiedTranscriptInfo]
+    ) -> "ChromosomeTranscripts":
+        transcripts = sorted(transcripts, key=lambda tr: tr.start)
+        ends = np.array([tr.end for tr in transcripts], dtype=np.int64)
+        return cls(
+            starts=np.array([tr.start for tr in transcripts], dtype=np.int64),
+            ends=ends,
+            max_ends=np.maximum.accumulate(ends) if len(ends) > 0 else ends,
+            is_canonical=np.array(
+                [tr.type in CANONICAL_TYPES for tr in transcripts], dtype=bool
+            ),
+            serialized=[
+                tr.model_dump_json(by_alias=True).encode() for tr in transcripts
+            ],
+        )
+
+    def query(self, start: int, end: int, only_canonical: bool = False) -> list[bytes]:
+        """Get the serialized transcripts overlapping a region."""
+        first = int(np.searchsorted(self.max_ends, start, side="left"))
+        last = int(np.searchsorted(self.starts, end, side="right"))
+        if first >= last:
+            return []
+        keep = self.ends[first:last] >= start
+        if only_canonical:
+            keep &= self.is_canonical[first:last]
+        return [self.serialized[idx] for idx in np.flatnonzero(keep) + first]
+
+    def to_json(self, only_canonical: bool = False) -> bytes:
+        """Get all transcripts of the chromosome as a JSON array."""
+        return _to_json_array(self.query(1, MAX_BIN_POSITION, only_canonical))
+
+
+def _to_json_array(serialized: list[bytes]) -> bytes:
+    return b"[" + b",".join(serialized) + b"]"
+
+
+def read_chromosome_transcripts(
+    db: Database[Any], genome_build: GenomeBuild
+) -> dict[str, ChromosomeTranscripts]:
+    """Read the transcripts of a genome build from the database."""
+    by_chrom: dict[str, list[SimplifiedTranscriptInfo]] = defaultdict(list)
+    cursor = db.get_collection(TRANSCRIPTS_COLLECTION).find(
+        {"genome_build": genome_build},
+        {**SIMPLIFIED_TRANSCRIPT_PROJECTION, "chrom": True},
+    )
+    for doc in cursor:
+        by_chrom[doc["chrom"]].append(to_simplified_transcript(doc))
+    return {
+        chrom: ChromosomeTranscripts.from_transcripts(transcripts)
+        for chrom, transcripts in by_chrom.items()
+    }
+
+
+def create_transcript_payloads(db: Database[Any], genome_build: GenomeBuild) -> int:
+    """Store the transcripts of each chromosome as gzipped JSON arrays.
+
+    Requests for whole chromosomes, the most common request, are answered with
+    these as is. Each payload is replaced in place, and payloads of chromosomes
+    without transcripts are removed last. The update is not registered, do that
+    once the transcripts are loaded. Returns the number of stored payloads.
+    """
+    collection = db.get_collection(TRANSCRIPT_PAYLOADS_COLLECTION)
+    chromosomes = read_chromosome_transcripts(db, genome_build)
+    for chrom, transcripts in chromosomes.items():
+        for only_canonical in (False, True):
+            key = {
+                "genome_build": genome_build,
+                "chrom": chrom,
+                "only_canonical": only_canonical,
+            }
+            data = gzip.compress(transcripts.to_json(only_canonical), mtime=0)
+            collection.replace_one(key, {**key, "data": data}, upsert=True)
+    collection.delete_many(
+        {"genome_build": genome_build, "chrom": {"$nin": list(chromosomes)}}
+    )
+    return 2 * len(chromosomes)
+
+
+@dataclass
+class GenomeBuildTranscripts:
+    """Transcripts of a genome build."""
+
+    chromosomes: dict[str, ChromosomeTranscripts]
+    # gzipped JSON of whole chromosomes, keyed on chromosome and only_canonical
+    payloads: dict[tuple[str, bool], bytes]
+
+    def query(self, region: GenomicRegion, only_canonical: bool = False) -> bytes:
+        """Get transcripts overlapping a region as a JSON array."""
+        if region.start is None or region.end is None:
+            raise ValueError("Start and end coordinates must be set.")
+        chrom_transcripts = self.chromosomes.get(region.chromosome)
+        if chrom_transcripts is None:
+            return b"[]"
+        serialized = chrom_transcripts.query(region.start, region.end, only_canonical)
+        return _to_json_array(serialized)
+
+    def get_payload(
+        self, chromosome: str, only_canonical: bool = False
+    ) -> bytes | None:
+        """Get all transcripts of a chromosome as gzipped JSON.
+
+        None if no payload was created when the transcripts were loaded.
+        """
+        return self.payloads.get((chromosome, only_canonical))
+
+
+class TranscriptIndex(GenomeBuildIndex[GenomeBuildTranscripts]):
+    """Transcripts of each genome build kept in process memory.
+
+    A genome build is reloaded when the transcripts are updated, i.e. after
+    running "gens load transcripts".
+    """
+
+    collections = [TRANSCRIPTS_COLLECTION]
+
+    def query(
+        self,
+        db: Database[Any],
+        region: GenomicRegion,
+        genome_build: GenomeBuild,
+        only_canonical: bool = False,
+    ) -> bytes:
+        """Get transcripts overlapping a region as a JSON array."""
+        return self._get(db, genome_build).query(region, only_canonical)
+
+    def get_payload(
+        self,
+        db: Database[Any],
+        chromosome: str,
+        genome_build: GenomeBuild,
+        only_canonical: bool = False,
+    ) -> bytes | None:
+        """Get all transcripts of a chromosome as gzipped JSON.
+
+        None if no payload was created when the transcripts were loaded.
+        """
+        return self._get(db, genome_build).get_payload(chromosome, only_canonical)
+
+    def _read(
+        self, db: Database[Any], genome_build: GenomeBuild
+    ) -> GenomeBuildTranscripts:
+        LOG.info("Loading transcripts of genome build %s into memory", genome_build)
+        start_time = time.perf_counter()
+        chromosomes = read_chromosome_transcripts(db, genome_build)
+        payloads = {
+            (doc["chrom"], doc["only_canonical"]): doc["data"]
+            for doc in db.get_collection(TRANSCRIPT_PAYLOADS_COLLECTION).find(
+                {"genome_build": genome_build}
+            )
+        }
+        LOG.info(
+            "Loaded %d transcripts in %.1f s",
+            sum(len(transcripts.starts) for transcripts in chromosomes.values()),
+            time.perf_counter() - start_time,
+        )
+        return GenomeBuildTranscripts(chromosomes=chromosomes, payloads=payloads)
+
+
+transcript_index = TranscriptIndex(
+    refresh_interval=settings.transcript_index_refresh_interval
+)
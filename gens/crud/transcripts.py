@@ -1,12 +1,17 @@
 """Transcript related CRUD functions."""
 
 import logging
+import time
+from itertools import islice
 from typing import Any, Iterable
 
+from pymongo.collection import Collection
 from pymongo.database import Database
 
-from gens.crud.annotations import register_data_update
-from gens.db.collections import TRANSCRIPTS_COLLECTION
+from gens.constants import ENSEMBL_CANONICAL, MANE_PLUS_CLINICAL, MANE_SELECT
+from gens.crud.locks import database_lock
+from gens.db.collections import TRANSCRIPTS_COLLECTION, TRANSCRIPTS_STAGING_COLLECTION
+from gens.db.index import INDEXES
 from gens.models.annotation import (
     ExonFeature,
     SimplifiedTranscriptInfo,
@@ -16,10 +21,24 @@ from gens.models.annotation import (
 from gens.models.base import PydanticObjectId
 from gens.models.genomic import GenomeBuild, GenomicRegion
 
-from .utils import query_genomic_region
+from .utils import query_genomic_region, region_to_bin
 
 LOG = logging.getLogger(__name__)
 
+TRANSCRIPT_BATCH_SIZE = 5000
+
+CANONICAL_TYPES = {MANE_SELECT, MANE_PLUS_CLINICAL, ENSEMBL_CANONICAL}
+
+SIMPLIFIED_TRANSCRIPT_PROJECTION: dict[str, bool] = {
+    "gene_name": True,
+    "start": True,
+    "end": True,
+    "mane": True,
+    "strand": True,
+    "transcript_biotype": True,
+    "features": True,
+}
+
 
 def _format_features(features: list[dict[str, Any]]) -> list[ExonFeature | UtrFeature]:
     """Format a transcript features to simplified models."""
@@ -43,6 +62,25 @@ def _format_features(features: list[dict[str, Any]]) -> list[ExonFeature | UtrFe
     return formatted
 
 
+def to_simplified_transcript(doc: dict[str, Any]) -> SimplifiedTranscriptInfo:
+    """Convert a transcript document to a simplified transcript.
+
+    The document needs the fields in SIMPLIFIED_TRANSCRIPT_PROJECTION.
+    """
+    return SimplifiedTranscriptInfo.model_validate(
+        {
+            "record_id": doc["_id"],
+            "name": doc["gene_name"],
+            "start": doc["start"],
+            "end": doc["end"],
+            "type": doc["mane"] if doc["mane"] is not None else "non-mane",
+            "strand": doc["strand"],
+            "is_protein_coding": doc["transcript_biotype"] == "protein_coding",
+            "features": _format_features(doc["features"]),
+        }
+    )
+
+
 def get_transcripts(
     region: GenomicRegion,
     genome_build: GenomeBuild,
@@ -61,34 +99,10 @@ def get_transcripts(
     # build sort order
     sort_order: list[tuple[str, int]] = [("start", 1)]
 
-    projection: dict[str, bool] = {
-        "gene_name": True,
-        "start": True,
-        "end": True,
-        "mane": True,
-        "strand": True,
-        "transcript_biotype": True,
-        "features": True,
-    }
     cursor = db.get_collection(TRANSCRIPTS_COLLECTION).find(
-        query, projection, sort=sort_order
+        query, SIMPLIFIED_TRANSCRIPT_PROJECTION, sort=sort_order
     )
-    transcripts = []
-    for doc in cursor:
-        tr = SimplifiedTranscriptInfo.model_validate(
-            {
-                "record_id": doc["_id"],
-                "name": doc["gene_name"],
-                "start": doc["start"],
-                "end": doc["end"],
-                "type": doc["mane"] if doc["mane"] is not None else "non-mane",
-                "strand": doc["strand"],
-                "is_protein_coding": doc["transcript_biotype"] == "protein_coding",
-                "features": _format_features(doc["features"]),
-            }
-        )
-        transcripts.append(tr)
-    return transcripts
+    return [to_simplified_transcript(doc) for doc in cursor]
 
 
 def get_transcript(
@@ -101,6 +115,36 @@ def get_transcript(
     return None
 
 
+def get_transcripts_by_gene_symbols(
+    gene_symbols: Iterable[str],
+    genome_build: GenomeBuild,
+    db: Database[Any],
+    chromosome: str | None = None,
+    only_canonical: bool = False,
+) -> list[SimplifiedTranscriptInfo]:
+    """Get the transcripts of several genes in one query.
+
+    The transcripts are sorted on chromosome and start position.
+    """
+    query: dict[str, Any] = {
+        "gene_name": {"$in": list(gene_symbols)},
+        "genome_build": genome_build,
+    }
+    if chromosome is not None:
+        query["chrom"] = chromosome
+    if only_canonical:
+        query["mane"] = {"$in": sorted(CANONICAL_TYPES)}
+    cursor = db.get_collection(TRANSCRIPTS_COLLECTION).find(
+        query,
+        {**SIMPLIFIED_TRANSCRIPT_PROJECTION, "chrom": True},
+        sort=[("chrom", 1), ("start", 1)],
+    )
+    return [
+        to_simplified_transcript(doc).model_copy(update={"chrom": doc["chrom"]})
+        for doc in cursor
+    ]
+
+
 def get_simplified_transcripts_by_gene_symbol(
     gene_symbol: str, genome_build: GenomeBuild, db: Database[Any], only_mane: bool
 ) -> list[SimplifiedTranscriptInfo]:
@@ -132,10 +176,76 @@ def get_simplified_transcripts_by_gene_symbol(
     return return_transcripts
 
 
-def create_transcripts(transcripts: Iterable[TranscriptRecord], db: Database[Any]):
-    """Insert many transcripts in the database."""
-
-    db.get_collection(TRANSCRIPTS_COLLECTION).insert_many(
-        [tr.model_dump() for tr in transcripts]
+def create_transcripts(
+    transcripts: Iterable[TranscriptRecord],
+    db: Database[Any],
+    batch_size: int = TRANSCRIPT_BATCH_SIZE,
+) -> int:
+    """Insert transcripts in the database in batches.
+
+    The transcripts are consumed as they are inserted, which allows loading
+    from a stream without holding all of them in memory. The update is not
+    registered, do that once data derived from the transcripts has been
+    created. Returns the number of inserted transcripts.
+    """
+    return _insert_transcripts(
+        db.get_collection(TRANSCRIPTS_COLLECTION), transcripts, batch_size
     )
-    register_data_update(db, TRANSCRIPTS_COLLECTION)
+
+
+def replace_transcripts(
+    transcripts: Iterable[TranscriptRecord],
+    db: Database[Any],
+    genome_build: GenomeBuild,
+    batch_size: int = TRANSCRIPT_BATCH_SIZE,
+) -> int:
+    """Replace the transcripts of a genome build in one atomic switch.
+
+    The transcripts are written to a staging collection together with a copy of
+    the transcripts of the other genome builds. The staging collection is
+    indexed and then renamed to replace the transcripts collection, so readers
+    never see a partially loaded genome build.
+
+    Raises DatabaseLockError if transcripts are already being replaced. The
+    update is not registered, do that once data derived from the transcripts
+    has been created. Returns the number of inserted transcripts.
+    """
+    # the build is copied to staging and renamed, so loads must not overlap
+    with database_lock(db, TRANSCRIPTS_COLLECTION):
+        staging = db.get_collection(TRANSCRIPTS_STAGING_COLLECTION)
+        staging.drop()
+        LOG.info("Copying transcripts of other genome builds to staging collection")
+        db.get_collection(TRANSCRIPTS_COLLECTION).aggregate(
+            [
+                {"$match": {"genome_build": {"$ne": genome_build}}},
+                {"$out": TRANSCRIPTS_STAGING_COLLECTION},
+            ]
+        )
+        n_inserted = _insert_transcripts(staging, transcripts, batch_size)
+        LOG.info("Indexing staging collection")
+        staging.create_indexes(INDEXES[TRANSCRIPTS_COLLECTION])
+        staging.rename(TRANSCRIPTS_COLLECTION, dropTarget=True)
+    LOG.info("Replaced transcripts of genome build %s", genome_build)
+    return n_inserted
+
+
+def _insert_transcripts(
+    collection: Collection[Any],
+    transcripts: Iterable[TranscriptRecord],
+    batch_size: int,
+) -> int:
+    transcripts_iter = iter(transcripts)
+    start_time = time.perf_counter()
+    n_inserted = 0
+    while batch := [
+        {**tr.model_dump(), "bin": region_to_bin(tr.start, tr.end)}
+        for tr in islice(transcripts_iter, batch_size)
+    ]:
+        collection.insert_many(batch)
+        n_inserted += len(batch)
+        LOG.info(
+            "Inserted %d transcripts, %.0f transcripts/s",
+            n_inserted,
+            n_inserted / (time.perf_counter() - start_time),
+        )
+    return n_inserted
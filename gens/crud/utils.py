@@ -2,21 +2,47 @@
 
 from typing import Any
 
+# Standard UCSC binning scheme (Kent et al. 2002): 128 kb bins at the finest
+# level and each level up is 8 times larger, covering up to 512 Mb.
+BIN_OFFSETS = (512 + 64 + 8 + 1, 64 + 8 + 1, 8 + 1, 1, 0)
+BIN_FIRST_SHIFT = 17
+BIN_NEXT_SHIFT = 3
+MAX_BIN_POSITION = (1 << (BIN_FIRST_SHIFT + BIN_NEXT_SHIFT * 4)) - 1
 
-def query_genomic_region(
-    start_pos: int, end_pos: int, motif_type: str = "other"
-) -> dict[str, Any]:
-    """Make a query for a chromosomal region."""
-    if motif_type == "sv":  # for sv are start called position
-        start_name = "position"
-    else:
-        start_name = "start"
-    pos = {"$gte": start_pos, "$lte": end_pos}
-    query: dict[str, Any] = {
-        "$or": [
-            {start_name: pos},
-            {"end": pos},
-            {"$and": [{start_name: {"$lte": start_pos}}, {"end": {"$gte": end_pos}}]},
-        ],
+
+def region_to_bin(start: int, end: int) -> int:
+    """Get the smallest bin that fully contains a closed interval."""
+    start_bin = start >> BIN_FIRST_SHIFT
+    end_bin = end >> BIN_FIRST_SHIFT
+    for offset in BIN_OFFSETS:
+        if start_bin == end_bin:
+            return offset + start_bin
+        start_bin >>= BIN_NEXT_SHIFT
+        end_bin >>= BIN_NEXT_SHIFT
+    raise ValueError(f"Interval {start}-{end} is outside the range of the bins")
+
+
+def overlapping_bins(start: int, end: int) -> list[int]:
+    """Get all bins that can contain features overlapping a closed interval."""
+    bins: list[int] = []
+    start_bin = start >> BIN_FIRST_SHIFT
+    end_bin = end >> BIN_FIRST_SHIFT
+    for offset in BIN_OFFSETS:
+        bins.extend(range(offset + start_bin, offset + end_bin + 1))
+        start_bin >>= BIN_NEXT_SHIFT
+        end_bin >>= BIN_NEXT_SHIFT
+    return bins
+
+
+def query_genomic_region(start_pos: int, end_pos: int) -> dict[str, Any]:
+    """Make a query for records overlapping a chromosomal region.
+
+    Overlapping records can only be in the bins overlapping the region, which
+    bounds the index scan on both bin and start. The records needs a bin field,
+    see region_to_bin, and an index with bin followed by start.
+    """
+    return {
+        "bin": {"$in": overlapping_bins(start_pos, end_pos)},
+        "start": {"$lte": end_pos},
+        "end": {"$gte": start_pos},
     }
-    return query
@@ -4,7 +4,10 @@ SAMPLES_COLLECTION = "samples"
 ANNOTATIONS_COLLECTION = "annotations"
 ANNOTATION_TRACKS_COLLECTION = "annotation-tracks"
 TRANSCRIPTS_COLLECTION = "transcripts"
+TRANSCRIPTS_STAGING_COLLECTION = "transcripts-staging"
+TRANSCRIPT_PAYLOADS_COLLECTION = "transcript-payloads"
 UPDATES_COLLECTION = "updates"
+LOCKS_COLLECTION = "locks"
 CHROMSIZES_COLLECTION = "chrom-sizes"
 USER_COLLECTION = "user"
 SAMPLE_ANNOTATIONS_COLLECTION = "sample-annotations"
@@ -15,7 +18,9 @@ ALL_COLLECTIONS = [
     ANNOTATIONS_COLLECTION,
     ANNOTATION_TRACKS_COLLECTION,
     TRANSCRIPTS_COLLECTION,
+    TRANSCRIPT_PAYLOADS_COLLECTION,
     UPDATES_COLLECTION,
+    LOCKS_COLLECTION,
     CHROMSIZES_COLLECTION,
     USER_COLLECTION,
     SAMPLE_ANNOTATIONS_COLLECTION,
@@ -1,34 +1,253 @@
 """Functions for handeling database connection."""
 
 import logging
-from typing import Any, Generator
+import threading
+from dataclasses import dataclass
+from typing import Any
 
 from fastapi import HTTPException
 from flask import Flask
 from pydantic import MongoDsn
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient, monitoring
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 
 from gens.adapters.base import InterpretationAdapter
+from gens.adapters.cached import CachedInterpretationAdapter, variant_cache
 from gens.adapters.null import NullInterpretationAdapter
 from gens.adapters.scout import ScoutMongoAdapter
-from gens.config import settings
+from gens.config import MongoDbConfig, settings
 
 LOG = logging.getLogger(__name__)
 
+GENS_DB_NAME = "gens"
+VARIANT_DB_NAME = "variant"
+
+
+@dataclass
+class ConnectionPoolStats:
+    """Utilization of the connection pools of a MongoDB client."""
+
+    max_pool_size: int
+    open_connections: int = 0
+    checked_out: int = 0
+    waiting: int = 0
+    checkout_failures: int = 0
+
+
+class PoolUsageListener(monitoring.ConnectionPoolListener):
+    """Track connection pool utilization from pymongo pool events."""
+
+    def __init__(self, max_pool_size: int) -> None:
+        self._lock = threading.Lock()
+        self._stats = ConnectionPoolStats(max_pool_size=max_pool_size)
+
+    @property
+    def stats(self) -> ConnectionPoolStats:
+        with self._lock:
+            return ConnectionPoolStats(**vars(self._stats))
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._stats.open_connections += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self._stats.open_connections -= 1
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        with self._lock:
+            self._stats.waiting += 1
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        with self._lock:
+            self._stats.waiting -= 1
+            self._stats.checked_out += 1
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        with self._lock:
+            self._stats.waiting -= 1
+            self._stats.checkout_failures += 1
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self._stats.checked_out -= 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+
+@dataclass
+class _RegisteredClient:
+    client: MongoClient[Any] | AsyncMongoClient[Any]
+    config: MongoDbConfig
+    listener: PoolUsageListener
+
+
+ASYNC_CLIENT_SUFFIX = "-async"
+
+
+class MongoClientRegistry:
+    """MongoDB clients shared for the lifetime of the application.
+
+    A MongoClient is thread safe and keeps its own connection pool, so one
+    client per database is reused by all requests instead of connecting anew.
+    Async routes use a separate AsyncMongoClient with the same pool settings.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: dict[str, _RegisteredClient] = {}
+        self._async_clients: dict[str, _RegisteredClient] = {}
+        # async clients can only be closed from an event loop, replaced clients
+        # are kept until aclose
+        self._replaced_async_clients: list[_RegisteredClient] = []
+
+    def get_client(self, name: str, config: MongoDbConfig) -> MongoClient[Any]:
+        """Get the client of a database, create it on first use."""
+        with self._lock:
+            entry = self._clients.get(name)
+            if entry is not None and entry.config != config:
+                LOG.info("Configuration of %s database changed, reconnecting", name)
+                entry.client.close()
+                entry = None
+            if entry is None:
+                entry = self._connect(config)
+                self._clients[name] = entry
+            return entry.client  # type: ignore[return-value]
+
+    def get_async_client(
+        self, name: str, config: MongoDbConfig
+    ) -> AsyncMongoClient[Any]:
+        """Get the async client of a database, create it on first use.
+
+        The client binds to the event loop of the first operation using it.
+        """
+        with self._lock:
+            entry = self._async_clients.get(name)
+            if entry is not None and entry.config != config:
+                LOG.info("Configuration of %s database changed, reconnecting", name)
+                self._replaced_async_clients.append(entry)
+                entry = None
+            if entry is None:
+                entry = self._connect(config, client_cls=AsyncMongoClient)
+                self._async_clients[name] = entry
+            return entry.client  # type: ignore[return-value]
+
+    def get_async_database(
+        self, name: str, config: MongoDbConfig
+    ) -> AsyncDatabase[Any]:
+        """Get a database using the shared async client."""
+        return self.get_async_client(name, config).get_database(config.database)
+
+    def get_database(self, name: str, config: MongoDbConfig) -> Database[Any]:
+        """Get a database using the shared client."""
+        return self.get_client(name, config).get_database(config.database)
+
+    def stats(self) -> dict[str, ConnectionPoolStats]:
+        """Get connection pool utilization of the clients."""
+        with self._lock:
+            stats = {
+                name: entry.listener.stats for name, entry in self._clients.items()
+            }
+            for name, entry in self._async_clients.items():
+                stats[f"{name}{ASYNC_CLIENT_SUFFIX}"] = entry.listener.stats
+            return stats
+
+    def ping(self, name: str) -> None:
+        """Check that the server of a client responds.
+
+        Async clients are bound to an event loop, their server is checked with
+        the sync client of the same database.
+        """
+        if name.endswith(ASYNC_CLIENT_SUFFIX):
+            name = name[: -len(ASYNC_CLIENT_SUFFIX)]
+            with self._lock:
+                config = self._async_clients[name].config
+            client = self.get_client(name, config)
+        else:
+            with self._lock:
+                client = self._clients[name].client  # type: ignore[assignment]
+        client.admin.command("ping")
+
+    def close(self) -> None:
+        """Close all clients and their connections.
+
+        Async clients are only replaced, use aclose from a running event loop to
+        also close their connections.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._replaced_async_clients.extend(self._async_clients.values())
+            self._async_clients.clear()
+        for entry in clients:
+            entry.client.close()
+
+    async def aclose(self) -> None:
+        """Close all sync and async clients and their connections."""
+        with self._lock:
+            async_clients = [
+                *self._async_clients.values(),
+                *self._replaced_async_clients,
+            ]
+            self._async_clients.clear()
+            self._replaced_async_clients.clear()
+        for entry in async_clients:
+            await entry.client.close()  # type: ignore[misc]
+        self.close()
+
+    @staticmethod
+    def _connect(
+        config: MongoDbConfig,
+        client_cls: type[MongoClient[Any]] | type[AsyncMongoClient[Any]] | None = None,
+    ) -> _RegisteredClient:
+        listener = PoolUsageListener(max_pool_size=config.max_pool_size)
+        # look up MongoClient at call time so that it can be patched in tests
+        client_cls = client_cls or MongoClient
+        client = client_cls(
+            str(config.connection),
+            maxPoolSize=config.max_pool_size,
+            minPoolSize=config.min_pool_size,
+            connectTimeoutMS=config.connect_timeout_ms,
+            serverSelectionTimeoutMS=config.server_selection_timeout_ms,
+            waitQueueTimeoutMS=config.wait_queue_timeout_ms,
+            event_listeners=[listener],
+        )
+        return _RegisteredClient(client=client, config=config, listener=listener)
+
+
+mongo_clients = MongoClientRegistry()
+
 
 def init_database_connection(app: Flask) -> None:
     """Initialize database connection and store variables to the two databases."""
 
     LOG.info("Initialize db connection")
 
-    app.config["GENS_DB"] = MongoClient(str(settings.gens_db.connection)).get_database(
-        name=settings.gens_db.database
-    )
+    app.config["GENS_DB"] = mongo_clients.get_database(GENS_DB_NAME, settings.gens_db)
     if settings.variant_db is not None:
-        app.config["VARIANT_DB"] = MongoClient(
-            str(settings.variant_db.connection)
-        ).get_database(name=settings.variant_db.database)
+        app.config["VARIANT_DB"] = mongo_clients.get_database(
+            VARIANT_DB_NAME, settings.variant_db
+        )
 
 
 def get_db_connection(mongo_uri: MongoDsn, db_name: str) -> Database[Any]:
@@ -37,21 +256,21 @@ def get_db_connection(mongo_uri: MongoDsn, db_name: str) -> Database[Any]:
     return db
 
 
-def get_gens_db() -> Generator[Database[Any], None, None]:
-    """Connect to the Gens database."""
-    client: MongoClient[Any] = MongoClient(str(settings.gens_db.connection))
-    try:
-        yield client.get_database(settings.gens_db.database)
-    finally:
-        client.close()
+def get_gens_db() -> Database[Any]:
+    """Get the Gens database."""
+    return mongo_clients.get_database(GENS_DB_NAME, settings.gens_db)
+
 
+def get_gens_db_async() -> AsyncDatabase[Any]:
+    """Get the Gens database for use in async routes."""
+    return mongo_clients.get_async_database(GENS_DB_NAME, settings.gens_db)
 
-def get_variant_software_adapter() -> Generator[InterpretationAdapter, None, None]:
+
+def get_variant_software_adapter() -> InterpretationAdapter:
     """Return the configured interpretation adapter."""
 
     if not settings.variant_db:
-        yield NullInterpretationAdapter()
-        return
+        return NullInterpretationAdapter()
 
     if settings.variant_software_backend != "scout_mongo":
         raise HTTPException(
@@ -59,10 +278,9 @@ def get_variant_software_adapter() -> Generator[InterpretationAdapter, None, Non
             detail=f"Unsupported variant software backend: {settings.variant_software_backend}",
         )
 
-    client: MongoClient[Any] = MongoClient(str(settings.variant_db.connection))
-
-    try:
-        db = client.get_database(settings.variant_db.database)
-        yield ScoutMongoAdapter(db)
-    finally:
-        client.close()
+    adapter = ScoutMongoAdapter(
+        mongo_clients.get_database(VARIANT_DB_NAME, settings.variant_db)
+    )
+    if settings.variant_cache_ttl == 0:
+        return adapter
+    return CachedInterpretationAdapter(adapter, variant_cache)
@@ -1,11 +1,13 @@
 """Create indexes in the database."""
 
 import logging
+from collections import defaultdict
 from typing import Any
 
 from pymongo import ASCENDING, TEXT, IndexModel
 from pymongo.database import Database
 
+from gens.crud.utils import region_to_bin
 from gens.db.collections import SAMPLES_COLLECTION
 
 from .collections import (
@@ -14,13 +16,27 @@ from .collections import (
     CHROMSIZES_COLLECTION,
     SAMPLE_ANNOTATION_TRACKS_COLLECTION,
     SAMPLE_ANNOTATIONS_COLLECTION,
+    TRANSCRIPT_PAYLOADS_COLLECTION,
     TRANSCRIPTS_COLLECTION,
 )
 
 LOG = logging.getLogger(__name__)
 
+BIN_BACKFILL_BATCH_SIZE = 1000
+
 INDEXES = {
     ANNOTATIONS_COLLECTION: [
+        IndexModel(
+            [
+                ("track_id", ASCENDING),
+                ("generation", ASCENDING),
+                ("chrom", ASCENDING),
+                ("bin", ASCENDING),
+                ("start", ASCENDING),
+            ],
+            name="track_generation_region",
+            background=True,
+        ),
         IndexModel(
             [("chrom", ASCENDING), ("start", ASCENDING), ("end", ASCENDING)],
             name="genome_position",
@@ -55,6 +71,16 @@ INDEXES = {
         ),
     ],
     TRANSCRIPTS_COLLECTION: [
+        IndexModel(
+            [
+                ("chrom", ASCENDING),
+                ("genome_build", ASCENDING),
+                ("bin", ASCENDING),
+                ("start", ASCENDING),
+            ],
+            name="genome_region",
+            background=True,
+        ),
         IndexModel(
             [("chrom", ASCENDING), ("start", ASCENDING), ("end", ASCENDING)],
             name="genome_position",
@@ -76,6 +102,18 @@ INDEXES = {
             background=True,
         ),
     ],
+    TRANSCRIPT_PAYLOADS_COLLECTION: [
+        IndexModel(
+            [
+                ("genome_build", ASCENDING),
+                ("chrom", ASCENDING),
+                ("only_canonical", ASCENDING),
+            ],
+            name="genome_build_chrom_canonical",
+            background=True,
+            unique=True,
+        ),
+    ],
     CHROMSIZES_COLLECTION: [
         IndexModel(
             [("genome_build", ASCENDING)],
@@ -123,6 +161,16 @@ INDEXES = {
             background=True,
         ),
         IndexModel([("track_id", ASCENDING)], name="track_id", background=True),
+        IndexModel(
+            [
+                ("track_id", ASCENDING),
+                ("chrom", ASCENDING),
+                ("bin", ASCENDING),
+                ("start", ASCENDING),
+            ],
+            name="track_region",
+            background=True,
+        ),
         IndexModel([("genome_build", ASCENDING)], name="genome_build", background=True),
     ],
     SAMPLE_ANNOTATION_TRACKS_COLLECTION: [
@@ -187,3 +235,38 @@ def update_indexes(db: Database[Any]) -> int:
                 n_updated += 1
     LOG.info("Updated %d indexes to the database", n_updated)
     return n_updated
+
+
+BINNED_COLLECTIONS = [
+    ANNOTATIONS_COLLECTION,
+    SAMPLE_ANNOTATIONS_COLLECTION,
+    TRANSCRIPTS_COLLECTION,
+]
+
+
+def add_missing_bins(db: Database[Any]) -> int:
+    """Add the genomic bin to records that were loaded before bins were used.
+
+    Region queries use the bin together with the region indexes, records
+    without one are not found by them.
+    """
+    n_updated = 0
+    for collection_name in BINNED_COLLECTIONS:
+        collection = db[collection_name]
+        cursor = collection.find(
+            {"bin": {"$exists": False}}, {"_id": True, "start": True, "end": True}
+        )
+        # most records share a few bins, update them one bin at the time
+        ids_by_bin: dict[int, list[Any]] = defaultdict(list)
+        for doc in cursor:
+            ids_by_bin[region_to_bin(doc["start"], doc["end"])].append(doc["_id"])
+        for bin_id, ids in ids_by_bin.items():
+            for offset in range(0, len(ids), BIN_BACKFILL_BATCH_SIZE):
+                resp = collection.update_many(
+                    {"_id": {"$in": ids[offset : offset + BIN_BACKFILL_BATCH_SIZE]}},
+                    {"$set": {"bin": bin_id}},
+                )
+                n_updated += resp.modified_count
+    if n_updated > 0:
+        LOG.info("Added genomic bins to %d records", n_updated)
+    return n_updated
@@ -9,6 +9,10 @@ class DatabaseException(BaseException):
     """Paranet class for database releated errors."""
 
 
+class DatabaseLockError(Exception):
+    """Data is locked by another load."""
+
+
 class GraphException(BaseException):
     """Parent class for graph and coordinate exceptions."""
 
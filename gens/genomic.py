@@ -1,5 +1,10 @@
 """Genomic"""
 
+import math
+
+import numpy as np
+
+from gens.models.annotation import SimplifiedVariantRecord, VariantDensity
 from gens.models.genomic import Chromosome, GenomicRegion
 from gens.models.sample import ZoomLevel
 
@@ -40,3 +45,54 @@ def calc_zoom_level(start_pos: int, end_pos: int) -> ZoomLevel:
     elif size > 200000:
         resolution = ZoomLevel.C
     return resolution
+
+
+def bin_variant_density(
+    variants: list[SimplifiedVariantRecord],
+    chromosome: str,
+    start: int,
+    end: int,
+    n_bins: int,
+    rank_score_bands: list[float],
+) -> VariantDensity:
+    """Count the variants starting in each bin of a region.
+
+    The counts are split by rank score band and by sub category.
+    """
+    bin_size = max(1, math.ceil((end - start + 1) / n_bins))
+    n_bins = math.ceil((end - start + 1) / bin_size)
+    positions = np.array([var.position for var in variants], dtype=np.int64)
+    in_region = (positions >= start) & (positions <= end)
+    bins = (positions[in_region] - start) // bin_size
+    rank_scores = np.array(
+        [np.nan if var.rank_score is None else var.rank_score for var in variants],
+        dtype=np.float64,
+    )[in_region]
+    sub_categories = np.array(
+        [var.sub_category or "" for var in variants], dtype=object
+    )[in_region]
+
+    def _count(mask: np.ndarray) -> list[int]:
+        return np.bincount(bins[mask], minlength=n_bins).tolist()
+
+    is_scored = ~np.isnan(rank_scores)
+    bands = np.digitize(rank_scores, sorted(rank_score_bands))
+    return VariantDensity(
+        chromosome=chromosome,
+        start=start,
+        end=end,
+        bin_size=bin_size,
+        bin_starts=list(range(start, end + 1, bin_size)),
+        counts=_count(np.ones(len(bins), dtype=bool)),
+        rank_score_bands=sorted(rank_score_bands),
+        rank_score_band_counts=[
+            _count(is_scored & (bands == band))
+            for band in range(len(rank_score_bands) + 1)
+        ],
+        unscored_counts=_count(~is_scored),
+        sub_category_counts={
+            sub_category: _count(sub_categories == sub_category)
+            for sub_category in sorted(set(sub_categories.tolist()))
+            if sub_category
+        },
+    )
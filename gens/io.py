@@ -1,27 +1,171 @@
 """Functions for loading and converting data."""
 
-import gzip
+import asyncio
+import functools
 import itertools
-import json
 import logging
+import os
+import stat
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from fractions import Fraction
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Iterable, Iterator, Literal, TypeVar
 
-from pymongo.collection import Collection
+import numpy as np
 from pysam import TabixFile
 
-from gens.crud.samples import get_sample
-from gens.models.genomic import Chromosome, GenomeBuild, GenomicRegion
-from gens.models.sample import GenomeCoverage, SampleInfo, ScatterDataType, ZoomLevel
+from gens.cache import CacheStats
+from gens.config import settings
+from gens.models.genomic import Chromosome, GenomicRegion
+from gens.models.sample import (
+    GenomeCoverage,
+    SampleFiles,
+    SampleInfo,
+    ScatterDataType,
+    ZoomLevel,
+)
 
 BAF_SUFFIX = ".baf.bed.gz"
 COV_SUFFIX = ".cov.bed.gz"
-JSON_SUFFIX = ".overview.json.gz"
+OVERVIEW_CACHE_SUFFIX = ".overview.npz"
+OVERVIEW_CACHE_VERSION = 1
+
+BINARY_COVERAGE_MEDIA_TYPE = "application/octet-stream"
+BINARY_COVERAGE_MAGIC = b"GCOV"
+BINARY_COVERAGE_VERSION = 1
+# magic, version, zoom level (ascii or 0), region length, number of points
+BINARY_COVERAGE_HEADER = struct.Struct("<4sBBHI")
 
 
 LOG = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@dataclass
+class _PooledTabixFile:
+    """An open tabix handle and the lock guarding its use."""
+
+    handle: TabixFile
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    closed: bool = False
+
+
+def file_signature(path: Path) -> tuple[str, int, int, int]:
+    """Identify a specific version of a file on disk.
+
+    A file that is rewritten or replaced gets a new inode, mtime or size and
+    therefore a new signature.
+    """
+    file_stat = os.stat(path)
+    return (str(path), file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+class TabixFilePool:
+    """Bounded, thread-safe LRU pool of open tabix file handles.
+
+    Opening a TabixFile re-reads the .tbi index, which is costly when the same
+    sample files are queried on every pan and zoom. Handles are keyed on the
+    file path together with its inode, mtime and size, so that a file rewritten
+    by `gens load sample --force` or `gens update sample` is reopened.
+    """
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("The tabix pool must hold at least one file handle")
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._handles: OrderedDict[tuple[str, int, int, int], _PooledTabixFile] = (
+            OrderedDict()
+        )
+        self._stats = CacheStats(max_size=max_size)
+
+    @contextmanager
+    def open(self, path: Path | str) -> Iterator[TabixFile]:
+        """Check out an open tabix handle for a file.
+
+        The handle is reserved for the caller until the context exits, so all
+        records should be consumed within the block.
+        """
+        key = file_signature(Path(path))
+        stale: list[_PooledTabixFile] = []
+        with self._lock:
+            entry = self._handles.get(key)
+            if entry is not None:
+                self._handles.move_to_end(key)
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+                # drop handles to older versions of the same file
+                for old_key in [k for k in self._handles if k[0] == key[0]]:
+                    stale.append(self._handles.pop(old_key))
+                    self._stats.invalidations += 1
+                entry = _PooledTabixFile(TabixFile(key[0]))
+                self._handles[key] = entry
+                while len(self._handles) > self.max_size:
+                    _, evicted = self._handles.popitem(last=False)
+                    stale.append(evicted)
+                    self._stats.evictions += 1
+        for old_entry in stale:
+            self._close(old_entry)
+
+        with entry.lock:
+            if not entry.closed:
+                yield entry.handle
+                return
+        # the handle was evicted before it could be used, fall back to a private one
+        handle = TabixFile(key[0])
+        try:
+            yield handle
+        finally:
+            handle.close()
+
+    def invalidate(self, path: Path | str | None = None) -> int:
+        """Close pooled handles for a file, or all handles if no path is given.
+
+        Return the number of closed handles.
+        """
+        target = None if path is None else str(path)
+        with self._lock:
+            keys = [k for k in self._handles if target is None or k[0] == target]
+            stale = [self._handles.pop(key) for key in keys]
+            self._stats.invalidations += len(stale)
+        for entry in stale:
+            self._close(entry)
+        return len(stale)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the pool counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._handles),
+                max_size=self.max_size,
+            )
+
+    @staticmethod
+    def _close(entry: _PooledTabixFile) -> None:
+        # wait for any reader still using the handle
+        with entry.lock:
+            entry.handle.close()
+            entry.closed = True
+
+
+tabix_pool = TabixFilePool(max_size=settings.tabix_pool_size)
+tabix_executor = ThreadPoolExecutor(
+    max_workers=settings.tabix_read_workers, thread_name_prefix="tabix"
+)
+
 
 def tabix_query(
     tbix: TabixFile,
@@ -49,46 +193,167 @@ def tabix_query(
     return [r.split("\t") for r in records]
 
 
-def parse_raw_tabix(tabix_result: list[list[str]]) -> GenomeCoverage:
-    zoom: str | None = None
-    region: str | None = None
-    values: list[float] = []
-    positions: list[int] = []
-    entry: list[str]
+@dataclass
+class CoverageArrays:
+    """Coverage or BAF values of a region as NumPy arrays."""
 
-    if len(tabix_result) > 0:
-        zoom, region = tabix_result[0][0].split("_")
+    region: str | None
+    zoom: ZoomLevel | None
+    position: np.ndarray
+    value: np.ndarray
 
-    for entry in tabix_result:
-        start = int(entry[1])
-        end = int(entry[2])
-        positions.append(round((start + end) / 2))
-        values.append(float(entry[3]))
-    return GenomeCoverage(
+    @classmethod
+    def empty(cls) -> "CoverageArrays":
+        return cls(
+            region=None,
+            zoom=None,
+            position=np.empty(0, dtype=np.int64),
+            value=np.empty(0, dtype=np.float64),
+        )
+
+    def to_model(self) -> GenomeCoverage:
+        """Convert to the API response model."""
+        # the arrays are already typed, no need to validate every element again
+        return GenomeCoverage.model_construct(
+            region=self.region,
+            zoom=self.zoom,
+            position=self.position.tolist(),
+            value=self.value.tolist(),
+        )
+
+
+def parse_tabix_records(records: Iterable[str]) -> CoverageArrays:
+    """Parse tabix lines from a single zoom level and chromosome.
+
+    The columns of all lines are converted to numbers in bulk. The position of a
+    record is the midpoint of its start and end coordinates.
+    """
+    records = iter(records)
+    first_record = next(records, None)
+    if first_record is None:
+        return CoverageArrays.empty()
+
+    record_name = first_record.split("\t", 1)[0]
+    zoom, region = record_name.split("_")
+
+    # bulk convert the start, end and value columns using NumPy's C parser
+    table = np.loadtxt(
+        itertools.chain([first_record], records),
+        dtype=np.float64,
+        delimiter="\t",
+        usecols=(1, 2, 3),
+        comments=None,
+        ndmin=2,
+    )
+
+    return CoverageArrays(
         region=region,
-        zoom=None if zoom is None else ZoomLevel(zoom),
-        position=positions,
-        value=values,
+        zoom=ZoomLevel(zoom),
+        # np.rint rounds half to even, same as the builtin round
+        position=np.rint((table[:, 0] + table[:, 1]) / 2).astype(np.int64),
+        value=table[:, 2],
     )
 
 
-def get_scatter_data(
-    collection: Collection[dict[str, Any]],
-    sample_id: str,
-    case_id: str,
-    genome_build: GenomeBuild,
-    region: GenomicRegion,
-    data_type: ScatterDataType,
-    zoom_level: Literal["o", "a", "b", "c", "d"],
-) -> GenomeCoverage:  # type: ignore
-    """Development entrypoint for getting the coverage of a region."""
-    sample_obj = get_sample(collection, sample_id, case_id, genome_build)
+def downsample_coverage(
+    coverage: CoverageArrays,
+    max_points: int,
+    start: int | None = None,
+    end: int | None = None,
+) -> CoverageArrays:
+    """Reduce the number of points with min/max preserving M4 decimation.
+
+    The region is split into max_points / 4 equally wide bins, i.e. roughly one
+    bin per pixel, and the first, last, smallest and largest point of each bin
+    are kept. Peaks and dips are preserved, unlike when taking every n:th point.
+    """
+    if max_points < 4:
+        raise ValueError(f"max_points must be at least 4, got {max_points}")
+
+    n_points = len(coverage.position)
+    n_bins = max_points // 4
+    if n_points <= max_points:
+        return coverage
+
+    position = coverage.position
+    start = int(position.min()) if start is None else start
+    end = int(position.max()) + 1 if end is None else end
+    span = max(end - start, 1)
+    bins = np.clip((position - start) * n_bins // span, 0, n_bins - 1)
+
+    # tabix records are sorted, make sure bins are too to group them by slicing
+    order = np.argsort(bins, kind="stable")
+    bins = bins[order]
+    value = coverage.value[order]
+
+    first = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    last = np.r_[first[1:], n_points] - 1
+    counts = last - first + 1
+
+    # index of the first point in each bin equal to the bin minimum / maximum
+    extremes = []
+    for reduce_fn in (np.minimum, np.maximum):
+        is_extreme = value == np.repeat(reduce_fn.reduceat(value, first), counts)
+        candidates = np.flatnonzero(is_extreme)
+        _, first_candidate = np.unique(bins[candidates], return_index=True)
+        extremes.append(candidates[first_candidate])
+
+    keep = order[np.unique(np.concatenate([first, last, *extremes]))]
+    keep.sort()
+    return CoverageArrays(
+        region=coverage.region,
+        zoom=coverage.zoom,
+        position=position[keep],
+        value=coverage.value[keep],
+    )
+
+
+def encode_binary_coverage(coverage: CoverageArrays) -> bytes:
+    """Encode coverage data as a compact little-endian columnar payload.
+
+    Layout:
+        12 byte header (magic "GCOV", uint8 version, uint8 zoom level as ascii,
+        uint16 region length, uint32 number of points),
+        the region name in utf-8, zero padded to a multiple of four bytes,
+        int32 positions followed by float32 values.
+    """
+    region = (coverage.region or "").encode("utf-8")
+    zoom = ord(coverage.zoom) if coverage.zoom is not None else 0
+    header = BINARY_COVERAGE_HEADER.pack(
+        BINARY_COVERAGE_MAGIC,
+        BINARY_COVERAGE_VERSION,
+        zoom,
+        len(region),
+        len(coverage.position),
+    )
+    padding = b"\0" * (-len(region) % 4)
+    return b"".join(
+        [
+            header,
+            region,
+            padding,
+            coverage.position.astype("<i4").tobytes(),
+            coverage.value.astype("<f4").tobytes(),
+        ]
+    )
 
+
+def get_sample_file(
+    sample: SampleFiles | SampleInfo, data_type: ScatterDataType
+) -> Path:
+    """Get the coverage or BAF file of a sample."""
     if data_type == ScatterDataType.COV:
-        tabix_file = TabixFile(str(sample_obj.coverage_file))
-    else:
-        tabix_file = TabixFile(str(sample_obj.baf_file))
+        return sample.coverage_file
+    return sample.baf_file
+
 
+def read_scatter_data(
+    sample_file: Path,
+    region: GenomicRegion,
+    zoom_level: Literal["o", "a", "b", "c", "d"],
+    max_points: int | None = None,
+) -> CoverageArrays:
+    """Read coverage or BAF data of a region from a bed file."""
     valid_zoom_levels = {"o", "a", "b", "c", "d"}
     if zoom_level not in valid_zoom_levels:
         raise ValueError(
@@ -98,59 +363,190 @@ def get_scatter_data(
     # Tabix
     record_name = f"{zoom_level}_{region.chromosome}"
 
-    try:
-        records = tabix_file.fetch(record_name, region.start, region.end)
-    except ValueError as err:
-        LOG.error(err)
-        records = iter([])
+    with tabix_pool.open(sample_file) as tabix_file:
+        try:
+            records = tabix_file.fetch(record_name, region.start, region.end)
+        except ValueError as err:
+            LOG.error(err)
+            records = iter([])
+        coverage = parse_tabix_records(records)
 
-    return parse_raw_tabix([r.split("\t") for r in records])
+    if max_points is not None:
+        coverage = downsample_coverage(
+            coverage, max_points, start=region.start, end=region.end
+        )
+    return coverage
 
 
-def get_overview_data(file: Path, data_type: ScatterDataType) -> list[GenomeCoverage]:
-    """Read overview data from json file."""
+async def run_in_tabix_executor(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking file read in the tabix reader threads.
 
-    if not file.is_file():
-        raise FileNotFoundError(f"Overview file {file} is not found")
+    Keeps the event loop free while the number of concurrent reads is bounded
+    by the tabix_read_workers setting.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(tabix_executor, functools.partial(func, *args))
 
-    with gzip.open(file, "r") as json_gz:
-        json_data = json.loads(json_gz.read().decode("utf-8"))
 
-    results: list[GenomeCoverage] = []
-    for chrom in json_data.keys():
-        chrom_data = json_data[chrom][
-            "cov" if data_type == ScatterDataType.COV else "baf"
-        ]
+async def get_scatter_data_batch(
+    sample_files: dict[str, SampleFiles],
+    region: GenomicRegion,
+    data_types: list[ScatterDataType],
+    zoom_level: Literal["o", "a", "b", "c", "d"],
+    max_points: int | None = None,
+) -> list[tuple[str, ScatterDataType, CoverageArrays]]:
+    """Get coverage or BAF data of a region for several samples.
 
-        results.append(
-            GenomeCoverage(
-                region=chrom,
-                position=[pos for (pos, _) in chrom_data],
-                value=[val for (_, val) in chrom_data],
+    The bed files are read concurrently using the tabix reader threads. Results
+    are ordered by sample and data type.
+    """
+    requested = [
+        (sample_id, data_type, get_sample_file(files, data_type))
+        for sample_id, files in sample_files.items()
+        for data_type in data_types
+    ]
+    results = await asyncio.gather(
+        *(
+            run_in_tabix_executor(
+                read_scatter_data, sample_file, region, zoom_level, max_points
             )
+            for _, _, sample_file in requested
         )
+    )
+    return [
+        (sample_id, data_type, coverage)
+        for (sample_id, data_type, _), coverage in zip(requested, results)
+    ]
+
+
+def get_overview_cache_path(sample_file: Path) -> Path:
+    """Get path to the precomputed overview of a coverage or BAF file."""
+    sample_file = Path(sample_file)
+    return sample_file.with_name(sample_file.name + OVERVIEW_CACHE_SUFFIX)
+
+
+def read_overview_from_tabix(sample_file: Path) -> list[CoverageArrays]:
+    """Read the "o" resolution of every chromosome from a bed file."""
+    results: list[CoverageArrays] = []
+    with tabix_pool.open(sample_file) as tabix_file:
+        for chrom in Chromosome:
+            record_name = f"{ZoomLevel.overview.value}_{chrom.value}"
+            try:
+                records = tabix_file.fetch(record_name)
+            except ValueError as err:
+                LOG.error(err)
+                continue
+
+            results.append(parse_tabix_records(records))
     return results
 
 
-def get_overview_from_tabix(
-    sample: SampleInfo, data_type: ScatterDataType
-) -> list[GenomeCoverage]:
-    """Generate overview data using the "o" resolution from bed files."""
+def write_overview_cache(sample_file: Path) -> list[CoverageArrays]:
+    """Compute the overview of a bed file and store it next to the file."""
+    # stat before reading, a file replaced while reading then gives a stale cache
+    source_stat = os.stat(sample_file)
+    overview = read_overview_from_tabix(sample_file)
+    store_overview_cache(sample_file, overview, source_stat)
+    return overview
 
-    if data_type == ScatterDataType.COV:
-        tabix_file = TabixFile(str(sample.coverage_file))
-    else:
-        tabix_file = TabixFile(str(sample.baf_file))
 
-    results: list[GenomeCoverage] = []
-    for chrom in Chromosome:
-        record_name = f"o_{chrom.value}"
+def store_overview_cache(
+    sample_file: Path, overview: list[CoverageArrays], source_stat: os.stat_result
+) -> None:
+    """Store the overview of a bed file next to the file.
+
+    The cache records the mtime and size of the bed file so that it is ignored
+    once the bed file changes.
+    """
+    offsets = np.cumsum([0] + [len(cov.position) for cov in overview])
+    cache_path = get_overview_cache_path(sample_file)
+    # unique per writer, several threads can store the same overview at once
+    with tempfile.NamedTemporaryFile(
+        dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp", delete=False
+    ) as cache_file:
+        tmp_path = Path(cache_file.name)
         try:
-            records = tabix_file.fetch(record_name)
-        except ValueError as err:
-            LOG.error(err)
-            continue
+            np.savez(
+                cache_file,
+                version=OVERVIEW_CACHE_VERSION,
+                source_mtime_ns=source_stat.st_mtime_ns,
+                source_size=source_stat.st_size,
+                regions=np.array([cov.region or "" for cov in overview], dtype=str),
+                offsets=offsets,
+                position=np.concatenate(
+                    [np.empty(0, dtype=np.int64)] + [cov.position for cov in overview]
+                ),
+                value=np.concatenate(
+                    [np.empty(0, dtype=np.float64)] + [cov.value for cov in overview]
+                ),
+            )
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    try:
+        # temporary files are private, make the cache as readable as the bed file
+        os.chmod(tmp_path, stat.S_IMODE(source_stat.st_mode))
+        # replace atomically so readers never see a partially written file
+        os.replace(tmp_path, cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
-        results.append(parse_raw_tabix([r.split("\t") for r in records]))
 
-    return results
+def read_overview_cache(sample_file: Path) -> list[CoverageArrays] | None:
+    """Read the precomputed overview of a bed file.
+
+    Returns None if there is no overview or if it is outdated.
+    """
+    cache_path = get_overview_cache_path(sample_file)
+    try:
+        source_stat = os.stat(sample_file)
+        with np.load(cache_path) as cache:
+            is_current = (
+                int(cache["version"]) == OVERVIEW_CACHE_VERSION
+                and int(cache["source_mtime_ns"]) == source_stat.st_mtime_ns
+                and int(cache["source_size"]) == source_stat.st_size
+            )
+            if not is_current:
+                return None
+            regions = cache["regions"].tolist()
+            offsets = cache["offsets"].tolist()
+            position = cache["position"]
+            value = cache["value"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as err:
+        LOG.warning("Could not read overview cache %s: %s", cache_path, err)
+        return None
+
+    return [
+        CoverageArrays(
+            region=region or None,
+            zoom=ZoomLevel.overview if region else None,
+            position=position[start:end],
+            value=value[start:end],
+        )
+        for region, start, end in zip(regions, offsets, offsets[1:])
+    ]
+
+
+def get_overview(
+    sample: SampleFiles | SampleInfo, data_type: ScatterDataType
+) -> list[GenomeCoverage]:
+    """Get overview data of all chromosomes using the "o" resolution.
+
+    The precomputed overview is used if it is up to date. Otherwise it is built
+    from the bed file and stored for the next request.
+    """
+
+    sample_file = get_sample_file(sample, data_type)
+    overview = read_overview_cache(sample_file)
+    if overview is None:
+        source_stat = os.stat(sample_file)
+        overview = read_overview_from_tabix(sample_file)
+        # storing is best effort, e.g. the data directory can be read-only
+        try:
+            store_overview_cache(sample_file, overview, source_stat)
+        except OSError as err:
+            LOG.info("Could not store overview of %s: %s", sample_file, err)
+
+    return [coverage.to_model() for coverage in overview]
@@ -4,9 +4,10 @@ import csv
 import logging
 import re
 from datetime import datetime
+from functools import lru_cache
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Any, Iterator, Optional, TypeAlias
+from typing import Any, Callable, Iterator, Optional, TypeAlias
 
 from pydantic import AnyHttpUrl, BaseModel, ValidationError
 from pydantic_core import PydanticCustomError
@@ -43,6 +44,9 @@ AED_URL_REFERENCE_NOTE = re.compile(r"(\w+).+\((.+)\)", re.I)
 AED_PMID_REFERENCE_NOTE = re.compile(r"(\w+).+\(PMID:\s+(\d+).+\)", re.I)
 
 DEFAULT_COLOUR = "grey"
+DEFAULT_BED_COLOR = Color(DEFAULT_COLOUR).as_rgb_tuple()
+BED_RGB = re.compile(r"\d+,\d+,\d+")
+CHROMOSOMES = frozenset(chrom.value for chrom in Chromosome)
 
 
 class ParserError(Exception):
@@ -119,28 +123,119 @@ def fmt_bed_to_annotation(
     genome_build: GenomeBuild,
 ) -> AnnotationRecord:
     """Parse a bed or aed entry"""
+    return AnnotationRecord.model_validate(
+        fmt_bed_to_document(entry, track_id, genome_build)
+    )
+
+
+def fmt_bed_to_document(
+    entry: dict[str, str],
+    track_id: PydanticObjectId,
+    genome_build: GenomeBuild,
+) -> dict[str, Any]:
+    """Parse a bed entry to the database document of an annotation record.
 
+    A fast path for the plain BED records, the core fields are converted and
+    checked with the converters of each column instead of validating a model.
+    The document equals the dumped AnnotationRecord.
+    """
     annotation: dict[str, Any] = {}
     if len(entry) < len(BED_CORE_FIELDS):
         fields_in_row = "\t".join(entry.values())
         raise ValueError(f"Malformad entry in BED file!, row: {fields_in_row}")
     for colname, value in entry.items():
-        new_colname = FIELD_TRANSLATIONS.get(colname, colname)
+        new_colname, converter = _get_bed_converter(colname)
+        if converter is None:
+            continue
         try:
-            annotation[new_colname] = format_bed_data(new_colname, value)
+            annotation[new_colname] = converter(value)
         except ValueError as err:
             LOG.info("Bad line: %s", entry)
             raise ParserError(str(err)) from err
 
-    return AnnotationRecord(
-        track_id=track_id,
-        name="The Nameless One" if annotation["name"] is None else annotation["name"],
-        genome_build=genome_build,
-        chrom=annotation["chrom"],
-        start=annotation["start"],
-        end=annotation["end"],
-        color=annotation["color"],
-    )
+    chrom = annotation.get("chrom")
+    if chrom not in CHROMOSOMES:
+        raise ValueError(f"Invalid chromosome {chrom}, row: {entry}")
+    start = annotation.get("start")
+    end = annotation.get("end")
+    if start is None or end is None or start < 1 or end < 1:
+        raise ValueError(f"Positions must be greater than 0, row: {entry}")
+
+    return {
+        "start": start,
+        "end": end,
+        "track_id": track_id,
+        "name": annotation.get("name") or "The Nameless One",
+        "description": None,
+        "genome_build": GenomeBuild(genome_build).value,
+        "chrom": chrom,
+        "color": annotation.get("color", DEFAULT_BED_COLOR),
+        "comments": [],
+        "references": [],
+        "metadata": [],
+    }
+
+
+def _convert_bed_chrom(value: str) -> str:
+    if value in {"", "."}:
+        raise ValueError("field chrom must exist")
+    return value.strip("chr")
+
+
+def _convert_bed_start(value: str) -> int:
+    if value in {"", "."}:
+        raise ValueError("field start must exist")
+    # Bed files are zero-indexed
+    return int(value) + 1
+
+
+def _convert_bed_end(value: str) -> int:
+    if value in {"", "."}:
+        raise ValueError("field end must exist")
+    return int(value)
+
+
+def _convert_bed_score(value: str) -> int | None:
+    return None if value in {"", "."} else int(value)
+
+
+def _convert_bed_value(value: str) -> str | None:
+    return None if value == "." else value
+
+
+@lru_cache(maxsize=1024)
+def _convert_bed_color(
+    value: str,
+) -> tuple[int, int, int] | tuple[int, int, int, float]:
+    """Parse the color of a BED record, the colors are cached by string.
+
+    The itemRgb column of the BED specification is a comma separated RGB value.
+    """
+    if value in {"", ".", "0"}:
+        return DEFAULT_BED_COLOR
+    if BED_RGB.fullmatch(value):
+        return Color(f"rgb({value})").as_rgb_tuple()
+    return Color(value).as_rgb_tuple()
+
+
+BED_COLUMN_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "chrom": _convert_bed_chrom,
+    "start": _convert_bed_start,
+    "end": _convert_bed_end,
+    "name": _convert_bed_value,
+    "score": _convert_bed_score,
+    "color": _convert_bed_color,
+}
+
+
+@lru_cache(maxsize=None)
+def _get_bed_converter(colname: str) -> tuple[str, Callable[[str], Any] | None]:
+    """Get the record field and converter of a BED column.
+
+    Columns that are not part of the annotation record have no converter.
+    """
+    new_colname = FIELD_TRANSLATIONS.get(colname, colname)
+    return new_colname, BED_COLUMN_CONVERTERS.get(new_colname)
 
 
 def _is_metadata_row(line: str) -> bool:
@@ -2,12 +2,9 @@
 
 import csv
 import logging
-from collections import defaultdict
 from dataclasses import dataclass
-from itertools import chain
-from typing import Generator, Iterable, Optional, TextIO, TypedDict
+from typing import Generator, Iterable, Iterator, Optional, TypedDict
 
-import click
 from pydantic import ValidationError
 
 from gens.constants import ENSEMBL_CANONICAL
@@ -45,85 +42,118 @@ class TranscriptEntry(TypedDict):
     features: list
 
 
-# FIXME: Reduce complexity to satisfy flake8 warnings
-def build_transcripts(
-    transc_file: TextIO, mane_file: TextIO, genome_build: GenomeBuild
-) -> Iterable[TranscriptRecord]:
-    """Build transcript object from transcript and mane file."""
-    mane_info = parse_mane_transc(mane_file)
-
-    LOG.info("%s MANE entries loaded", len(mane_info))
-
-    annotated_mane_transc: dict[str, list[TranscriptRecord]] = defaultdict(list)
-    transc_index: dict[str, TranscriptRecord] = {}
-    n_lines = _count_file_len(transc_file)
-    with click.progressbar(
-        transc_file, length=n_lines, label="Processing transcripts"
-    ) as progressbar:
+@dataclass
+class BuildStats:
+    """Counters of transcripts that were not loaded."""
 
-        skipped_no_gene_name = 0
+    skipped_no_gene_name: int = 0
+    # features read after their transcript was yielded
+    orphaned_features: int = 0
 
-        for transc in _parse_transcript_gtf(progressbar):
-            transcript_id = transc.attribs.get("transcript_id")
-            if not transcript_id:
-                raise ValueError(f"Expected an ID, found: {transcript_id}")
 
-            if transc.feature == "transcript":
-                selected_mane: dict[str, str] = mane_info.get(transcript_id, {})
+def build_transcripts(
+    transc_file: Iterable[str], mane_file: Iterable[str], genome_build: GenomeBuild
+) -> Iterator[TranscriptRecord]:
+    """Build transcript objects from transcript and mane file.
+
+    The GTF file is streamed and transcripts are yielded once all features of
+    their chromosome have been read. This requires that the features of a
+    chromosome are on consecutive lines, as in sorted GTF files where the
+    features of different genes can be interleaved, and keeps one chromosome
+    at the time in memory.
+    """
+    mane_info = parse_mane_transc(mane_file)
 
-                if not selected_mane and transc.is_canonical:
-                    selected_mane = {"mane_status": ENSEMBL_CANONICAL}
+    LOG.info("%s MANE entries loaded", len(mane_info))
 
-                if transc.attribs.get("gene_name") is None:
-                    skipped_no_gene_name += 1
-                    continue
+    stats = BuildStats()
+    yield from _build_transcripts(transc_file, mane_info, genome_build, stats)
+    _log_build_stats(stats)
 
-                try:
-                    transcript_entry = make_transcript_entry(
-                        transcript_id, selected_mane, transc, genome_build
-                    )
-                except ValidationError as e:
-                    LOG.warning(
-                        "Skipping transcript %r: validation failed: %s",
-                        transcript_id,
-                        e,
-                    )
-                    continue
-                transc_index[transcript_id] = transcript_entry
-                annotated_mane_transc[transc.attribs["gene_name"]].append(
-                    transcript_entry
-                )
-            elif transc.feature in ["exon", "three_prime_utr", "five_prime_utr"]:
-                # add features to existing transcript
-                if transcript_id in transc_index:
-                    feature: ExonFeature | UtrFeature
-                    if transc.feature == "exon":
-                        feature = ExonFeature.model_validate(
-                            {
-                                "feature": transc.feature,
-                                "start": transc.start,
-                                "end": transc.end,
-                                "exon_number": int(transc.attribs["exon_number"]),
-                            }
-                        )
-                    else:
-                        feature = UtrFeature.model_validate(
-                            {
-                                "feature": transc.feature,
-                                "start": transc.start,
-                                "end": transc.end,
-                            }
-                        )
-                    transcript_obj = transc_index[transcript_id]
-                    transcript_obj.features.append(feature)
 
+def _log_build_stats(stats: BuildStats) -> None:
     LOG.info(
         "%s transcripts skipped due to missing gene symbol ('gene_name' in the loaded GTF)",
-        skipped_no_gene_name,
+        stats.skipped_no_gene_name,
     )
+    if stats.orphaned_features:
+        LOG.warning(
+            "%s exons and UTRs skipped as they were read after the other features "
+            "of their chromosome, the features of a chromosome must be on "
+            "consecutive lines",
+            stats.orphaned_features,
+        )
 
-    flat_transcripts = chain.from_iterable(annotated_mane_transc.values())
-    return flat_transcripts
+
+def _build_transcripts(
+    transc_file: Iterable[str],
+    mane_info: dict[str, dict[str, str]],
+    genome_build: GenomeBuild,
+    stats: BuildStats,
+) -> Iterator[TranscriptRecord]:
+    """Group the features of the GTF file into transcripts."""
+    # transcripts of the current chromosome
+    open_transcripts: dict[str, TranscriptRecord] = {}
+    yielded_transcripts: set[str] = set()
+    current_chrom: str | None = None
+    for transc in _parse_transcript_gtf(transc_file):
+        transcript_id = transc.attribs.get("transcript_id")
+        if not transcript_id:
+            raise ValueError(f"Expected an ID, found: {transcript_id}")
+
+        if transc.seqname != current_chrom:
+            yield from open_transcripts.values()
+            yielded_transcripts.update(open_transcripts)
+            open_transcripts = {}
+            current_chrom = transc.seqname
+
+        if transc.feature == "transcript":
+            selected_mane: dict[str, str] = mane_info.get(transcript_id, {})
+
+            if not selected_mane and transc.is_canonical:
+                selected_mane = {"mane_status": ENSEMBL_CANONICAL}
+
+            if transc.attribs.get("gene_name") is None:
+                stats.skipped_no_gene_name += 1
+                continue
+
+            try:
+                transcript_entry = make_transcript_entry(
+                    transcript_id, selected_mane, transc, genome_build
+                )
+            except ValidationError as e:
+                LOG.warning(
+                    "Skipping transcript %r: validation failed: %s",
+                    transcript_id,
+                    e,
+                )
+                continue
+            open_transcripts[transcript_id] = transcript_entry
+        elif transc.feature in ["exon", "three_prime_utr", "five_prime_utr"]:
+            # add features to existing transcript
+            if transcript_id in open_transcripts:
+                feature: ExonFeature | UtrFeature
+                if transc.feature == "exon":
+                    feature = ExonFeature.model_validate(
+                        {
+                            "feature": transc.feature,
+                            "start": transc.start,
+                            "end": transc.end,
+                            "exon_number": int(transc.attribs["exon_number"]),
+                        }
+                    )
+                else:
+                    feature = UtrFeature.model_validate(
+                        {
+                            "feature": transc.feature,
+                            "start": transc.start,
+                            "end": transc.end,
+                        }
+                    )
+                open_transcripts[transcript_id].features.append(feature)
+            elif transcript_id in yielded_transcripts:
+                stats.orphaned_features += 1
+    yield from open_transcripts.values()
 
 
 def make_transcript_entry(
@@ -196,13 +226,6 @@ def _parse_attribs(attributes_str: str) -> dict[str, str]:
     return attributes_dict
 
 
-def _count_file_len(file: TextIO) -> int:
-    """Count number of lines in file."""
-    n_lines = sum(1 for _ in file)
-    file.seek(0)  # reset file to begining
-    return n_lines
-
-
 def _parse_transcript_gtf(
     transc_file: Iterable[str], delimiter: str = "\t"
 ) -> Generator[GTFEntry, None, None]:
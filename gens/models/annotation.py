@@ -115,6 +115,9 @@ class AnnotationTrack(RWModel, CreatedAtModel, ModifiedAtModel):
     maintainer: str | None = None
     metadata: list[dict[str, Any]] = Field(default_factory=list)
     genome_build: GenomeBuild
+    generation: int = Field(
+        default=0, description="Generation of the annotations shown for the track"
+    )
 
 
 class AnnotationTrackInDb(AnnotationTrack):
@@ -189,12 +192,45 @@ class SimplifiedVariantRecord(RWModel):
         ..., description="Start position of the variant", alias="start"
     )
     end: PositiveInt
+    end_chrom: str | None = Field(
+        default=None, description="Chromosome of the end, differs for translocations"
+    )
     variant_type: str
     sub_category: str | None = None
     rank_score: float | None = None
     genotype: str | None = None
 
 
+class VariantDensity(RWModel):
+    """Number of variants starting in equally sized bins of a region.
+
+    Used to draw variants as a histogram when zoomed out.
+    """
+
+    chromosome: str
+    start: PositiveInt
+    end: PositiveInt
+    bin_size: PositiveInt
+    bin_starts: list[int]
+    counts: list[int] = Field(..., description="Number of variants in each bin")
+    rank_score_bands: list[float] = Field(
+        ..., description="Lowest rank score of each band after the first"
+    )
+    rank_score_band_counts: list[list[int]] = Field(
+        ...,
+        description=(
+            "Number of variants with a rank score in each band and bin, the first "
+            "band has the variants below the lowest band"
+        ),
+    )
+    unscored_counts: list[int] = Field(
+        ..., description="Number of variants without a rank score in each bin"
+    )
+    sub_category_counts: dict[str, list[int]] = Field(
+        ..., description="Number of variants of each sub category in each bin"
+    )
+
+
 class VariantRecord(RWModel):
     """Detailed variant info for rendering variant tooltips.
 
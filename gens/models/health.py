@@ -0,0 +1,25 @@
+"""Models for reporting the health of the application."""
+
+from typing import Literal
+
+from .base import RWModel
+
+
+class DatabaseHealth(RWModel):
+    """Connection status and pool utilization of a database."""
+
+    name: str
+    ok: bool
+    error: str | None = None
+    max_pool_size: int
+    open_connections: int
+    checked_out: int
+    waiting: int
+    checkout_failures: int
+
+
+class HealthStatus(RWModel):
+    """Health of the application and its databases."""
+
+    status: Literal["ok", "degraded"]
+    databases: list[DatabaseHealth]
@@ -153,6 +153,13 @@ class SampleInfo(RWModel, CreatedAtModel):
         return str(path)
 
 
+class SampleFiles(RWModel):
+    """Resolved paths to the coverage and BAF files of a sample."""
+
+    baf_file: Path
+    coverage_file: Path
+
+
 class GenomeCoverage(RWModel):
     """Contains genome coverage info for scatter plots.
 
@@ -165,6 +172,14 @@ class GenomeCoverage(RWModel):
     zoom: ZoomLevel | None = None
 
 
+class SampleCoverage(RWModel):
+    """Coverage or BAF data of one sample in a batch request."""
+
+    sample_id: str
+    data_type: ScatterDataType
+    data: GenomeCoverage
+
+
 class MultipleSamples(RWModel):  # pylint: disable=too-few-public-methods
     """Generic response model for multiple data records."""
 
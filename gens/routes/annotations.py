@@ -4,26 +4,33 @@ When querying multiple annotations or transcripts a subeset of information is re
 Query individual annotations or transcript to get the full info.
 """
 
+import gzip
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from gens.constants import ENSEMBL_CANONICAL, MANE_PLUS_CLINICAL, MANE_SELECT
 from gens.crud.annotations import (
     get_annotation,
     get_annotation_tracks,
     get_annotations_for_track,
     get_data_update_timestamp,
+    get_latest_data_update,
 )
 from gens.crud.genomic import get_chromosome_info, get_chromosomes
 from gens.crud.scout import (
     VariantNotFoundError,
     VariantValidationError,
 )
+from gens.crud.transcript_index import transcript_index
 from gens.crud.transcripts import (
     get_transcript,
 )
-from gens.crud.transcripts import get_transcripts as crud_get_transcripts
+from gens.db.collections import (
+    ANNOTATIONS_COLLECTION,
+    CHROMSIZES_COLLECTION,
+    TRANSCRIPTS_COLLECTION,
+)
+from gens.genomic import bin_variant_density
 from gens.models.annotation import (
     AnnotationRecord,
     AnnotationTrackInDb,
@@ -31,6 +38,7 @@ from gens.models.annotation import (
     SimplifiedTranscriptInfo,
     SimplifiedVariantRecord,
     TranscriptRecord,
+    VariantDensity,
     VariantRecord,
 )
 from gens.models.base import PydanticObjectId
@@ -43,52 +51,126 @@ from gens.models.genomic import (
     VariantCategory,
 )
 
-from .utils import AdapterDep, ApiTags, GensDb
+from .utils import (
+    AdapterDep,
+    ApiTags,
+    GensDb,
+    check_not_modified,
+    track_validators,
+    update_validators,
+)
 
 router = APIRouter(prefix="/tracks")
 
 
 @router.get("/annotations", tags=[ApiTags.ANNOT], response_model_by_alias=False)
-async def get_annotations_tracks(
-    genome_build: GenomeBuild | None, db: GensDb
+def get_annotations_tracks(
+    request: Request, response: Response, genome_build: GenomeBuild | None, db: GensDb
 ) -> list[AnnotationTrackInDb]:
     """Get all avaliable annotation tracks."""
+    check_not_modified(
+        request, response, track_validators(db, [ANNOTATIONS_COLLECTION])
+    )
     tracks = get_annotation_tracks(db=db, genome_build=genome_build)
     return tracks
 
 
 @router.get("/annotations/track/{track_id}", tags=[ApiTags.ANNOT])
-async def get_annotation_track(
-    track_id: PydanticObjectId, db: GensDb
+def get_annotation_track(
+    request: Request,
+    response: Response,
+    track_id: PydanticObjectId,
+    db: GensDb,
+    chromosome: Chromosome | None = None,
+    start: int | None = Query(default=None, ge=1),
+    end: int | None = Query(default=None, ge=1),
 ) -> list[SimplifiedTrackInfo]:
-    """Get annotations for a region."""
-    return get_annotations_for_track(track_id=track_id, db=db)
+    """Get annotations for a track.
+
+    Use query parameters to only get annotations on a chromosome or in a region.
+    """
+    if chromosome is None and (start is not None or end is not None):
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail="A chromosome is required when filtering on position",
+        )
+    check_not_modified(
+        request, response, track_validators(db, [ANNOTATIONS_COLLECTION])
+    )
+    region = (
+        None
+        if chromosome is None
+        else GenomicRegion(chromosome=chromosome, start=start, end=end)
+    )
+    return get_annotations_for_track(track_id=track_id, db=db, region=region)
 
 
 @router.get("/annotations/record/{record_id}", tags=[ApiTags.ANNOT])
-async def get_annotation_with_id(
-    record_id: PydanticObjectId, db: GensDb
+def get_annotation_with_id(
+    request: Request, response: Response, record_id: PydanticObjectId, db: GensDb
 ) -> AnnotationRecord:
     """Get annotations for a region."""
+    check_not_modified(
+        request, response, track_validators(db, [ANNOTATIONS_COLLECTION])
+    )
     result = get_annotation(record_id, db)
     if result is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND)
     return result
 
 
-@router.get("/transcripts", tags=[ApiTags.TRANSC])
-async def get_transcripts(
+@router.get(
+    "/transcripts",
+    tags=[ApiTags.TRANSC],
+    response_model=list[SimplifiedTranscriptInfo],
+)
+def get_transcripts(
+    request: Request,
+    response: Response,
     chromosome: Chromosome,
     genome_build: GenomeBuild,
     db: GensDb,
     start: int | None = 1,
     end: int | None = None,
     only_canonical: bool = False,
-) -> list[SimplifiedTranscriptInfo]:
+) -> Response:
     """Get all transcripts for a genomic region.
 
     Returns a list of simplified transcript records. Use query parameters to filter by region or type.
     """
+    is_whole_chromosome = (start is None or start <= 1) and end is None
+    accepts_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    # the in-memory transcripts can lag behind the database, so the validators
+    # are based on the update the transcripts were loaded from
+    transcripts = transcript_index.get(db, genome_build)
+    validators = update_validators(
+        [TRANSCRIPTS_COLLECTION, CHROMSIZES_COLLECTION],
+        [
+            transcripts.updated_at,
+            get_latest_data_update(db, [CHROMSIZES_COLLECTION]),
+        ],
+        representation="gzip" if is_whole_chromosome and accepts_gzip else "",
+        vary="Accept-Encoding",
+    )
+    check_not_modified(request, response, validators)
+    headers = validators.headers if validators is not None else None
+
+    # whole chromosomes are served as precomputed gzipped JSON
+    if is_whole_chromosome:
+        payload = transcripts.data.get_payload(chromosome, only_canonical)
+        if payload is not None and accepts_gzip:
+            return Response(
+                content=payload,
+                media_type="application/json",
+                headers={**(headers or {}), "Content-Encoding": "gzip"},
+            )
+        if payload is not None:
+            return Response(
+                content=gzip.decompress(payload),
+                media_type="application/json",
+                headers=headers,
+            )
+
     # lookup end of chromosome if no end is defined and calculate zoom level
     start = start if start is not None else 1
     if end is None:
@@ -102,28 +184,22 @@ async def get_transcripts(
 
     region = GenomicRegion(chromosome=chromosome, start=start, end=end)
 
-    # get transcript for the new region
-    transcripts: list[SimplifiedTranscriptInfo] = crud_get_transcripts(
-        region, genome_build, db
-    )
-    if only_canonical:
-        transcripts = [
-            tr
-            for tr in transcripts
-            if tr.type in {MANE_SELECT, MANE_PLUS_CLINICAL, ENSEMBL_CANONICAL}
-        ]
-
-    return transcripts
+    # transcripts are served from memory, already serialized
+    content = transcripts.data.query(region, only_canonical)
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get("/transcripts/{transcript_id}", tags=[ApiTags.TRANSC])
-async def get_transcript_with_id(
-    transcript_id: PydanticObjectId, db: GensDb
+def get_transcript_with_id(
+    request: Request, response: Response, transcript_id: PydanticObjectId, db: GensDb
 ) -> TranscriptRecord:
     """Get a single transcript by its unique ID.
 
     Returns the full transcript record with all available details.
     """
+    check_not_modified(
+        request, response, track_validators(db, [TRANSCRIPTS_COLLECTION])
+    )
     result = get_transcript(transcript_id, db)
     if result is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND)
@@ -131,7 +207,7 @@ async def get_transcript_with_id(
 
 
 @router.get("/updates")
-async def get_track_latest_update_time(
+def get_track_latest_update_time(
     track: str,
     db: GensDb,
 ):
@@ -147,19 +223,25 @@ async def get_track_latest_update_time(
 
 
 @router.get("/chromosomes/", tags=[ApiTags.CHROM])
-async def get_chromosomes_with_build(
-    genome_build: GenomeBuild, db: GensDb
+def get_chromosomes_with_build(
+    request: Request, response: Response, genome_build: GenomeBuild, db: GensDb
 ) -> list[ReducedChromInfo]:
     """Query the database for all chromosomes with a given genome build."""
+    check_not_modified(request, response, track_validators(db, [CHROMSIZES_COLLECTION]))
     chroms = get_chromosomes(db, genome_build)
     return chroms
 
 
 @router.get("/chromosomes/{chromosome}", tags=[ApiTags.CHROM])
-async def get_chromosome_with_build(
-    chromosome: Chromosome, genome_build: GenomeBuild, db: GensDb
+def get_chromosome_with_build(
+    request: Request,
+    response: Response,
+    chromosome: Chromosome,
+    genome_build: GenomeBuild,
+    db: GensDb,
 ) -> ChromInfo:
     """Query the database for a chromosome."""
+    check_not_modified(request, response, track_validators(db, [CHROMSIZES_COLLECTION]))
     chrom_info = get_chromosome_info(db, chromosome, genome_build)
     if chrom_info is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND)
@@ -167,7 +249,7 @@ async def get_chromosome_with_build(
 
 
 @router.get("/variants", tags=[ApiTags.VAR])
-async def get_variants(
+def get_variants(
     sample_id: str,
     case_id: str,
     chromosome: Chromosome,
@@ -197,28 +279,74 @@ async def get_variants(
             case_id=case_id,
             region=region,
             variant_category=category,
+            rank_score_threshold=rank_score_threshold,
+            sub_categories=sub_categories.split(",") if sub_categories else None,
         )
     except VariantValidationError as e:
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=str(e))
 
-    sub_categories_values = sub_categories.split(",") if sub_categories else None
+    return variants
+
+
+@router.get("/variants/density", tags=[ApiTags.VAR])
+def get_variant_density(
+    sample_id: str,
+    case_id: str,
+    chromosome: Chromosome,
+    adapter: AdapterDep,
+    end: int = Query(..., ge=1),
+    category: VariantCategory = Query(
+        VariantCategory.SINGLE_VAR,
+        description="Variant category to include",
+    ),
+    start: int = Query(1, ge=1),
+    n_bins: int = Query(200, ge=1, le=10_000, description="Number of bins"),
+    rank_score_bands: str = Query(
+        "5,10,15", description="Comma-separated lowest rank score of each band"
+    ),
+    rank_score_threshold: float | None = Query(
+        None,
+        description="Minimum allowed rank score for counted variants. Variants with no rank score are counted.",
+    ),
+    sub_categories: str | None = Query(
+        None, description="Comma-separated SV sub-categories to count"
+    ),
+) -> VariantDensity:
+    """Get the number of variants in bins of a genomic region.
 
-    filtered = [
-        var
-        for var in variants
-        if (sub_categories_values is None or var.sub_category in sub_categories_values)
-        and (
-            var.rank_score is None
-            or rank_score_threshold is None
-            or var.rank_score >= rank_score_threshold
+    Used to draw the variants as a histogram when zoomed out instead of drawing
+    every variant.
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail="End must not be before start",
         )
-    ]
+    try:
+        bands = [float(band) for band in rank_score_bands.split(",") if band]
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=f"Invalid rank score bands: {rank_score_bands}",
+        )
+    region = GenomicRegion(chromosome=chromosome, start=start, end=end)
+    try:
+        variants = adapter.get_variants(
+            sample_name=sample_id,
+            case_id=case_id,
+            region=region,
+            variant_category=category,
+            rank_score_threshold=rank_score_threshold,
+            sub_categories=sub_categories.split(",") if sub_categories else None,
+        )
+    except VariantValidationError as e:
+        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=str(e))
 
-    return filtered
+    return bin_variant_density(variants, chromosome, start, end, n_bins, bands)
 
 
 @router.get("/variants/{document_id}", tags=[ApiTags.VAR])
-async def get_variant_with_id(
+def get_variant_with_id(
     document_id: str,
     adapter: AdapterDep,
 ) -> VariantRecord:
@@ -6,10 +6,15 @@ from typing import Annotated
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.encoders import jsonable_encoder
+from pymongo.errors import PyMongoError
 
 from gens.__version__ import VERSION as version
-from gens.crud.search import search_annotations_and_transcripts, text_search_suggestion
+from gens.config import settings
+from gens.crud.search import search_annotations_and_transcripts
+from gens.crud.search_index import suggestion_index
+from gens.db.db import GENS_DB_NAME, VARIANT_DB_NAME, mongo_clients
 from gens.models.genomic import GenomeBuild, GenomicRegion
+from gens.models.health import DatabaseHealth, HealthStatus
 from gens.models.search import SearchSuggestions
 
 from .utils import ApiTags, GensDb
@@ -28,6 +33,30 @@ async def read_root():
     }
 
 
+@router.get("/health", tags=[ApiTags.HEALTH])
+def health() -> HealthStatus:
+    """Check the database connections and report connection pool utilization."""
+
+    # make sure the clients exist even if no request has used them yet
+    mongo_clients.get_client(GENS_DB_NAME, settings.gens_db)
+    if settings.variant_db is not None:
+        mongo_clients.get_client(VARIANT_DB_NAME, settings.variant_db)
+
+    databases: list[DatabaseHealth] = []
+    for name, pool_stats in mongo_clients.stats().items():
+        error = None
+        try:
+            mongo_clients.ping(name)
+        except PyMongoError as err:
+            error = str(err)
+        databases.append(
+            DatabaseHealth(name=name, ok=error is None, error=error, **vars(pool_stats))
+        )
+
+    is_ok = all(database.ok for database in databases)
+    return HealthStatus(status="ok" if is_ok else "degraded", databases=databases)
+
+
 @router.get("/search/result", tags=[ApiTags.SEARCH])
 def search(
     query: SearchQueryParam,
@@ -53,6 +82,6 @@ def search(
 def search_assistant(
     query: SearchQueryParam, genome_build: GenomeBuild, db: GensDb
 ) -> SearchSuggestions:
-    """Suggest hits."""
-    result = text_search_suggestion(query, genome_build, db)
+    """Suggest genes and annotations with names starting with the query."""
+    result = suggestion_index.suggest(db, query, genome_build)
     return jsonable_encoder(result)
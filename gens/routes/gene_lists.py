@@ -2,8 +2,10 @@ import logging
 
 from fastapi import APIRouter
 
-from gens.models.annotation import GeneListRecord
-from gens.routes.utils import AdapterDep, ApiTags
+from gens.crud.transcripts import get_transcripts_by_gene_symbols
+from gens.models.annotation import GeneListRecord, SimplifiedTranscriptInfo
+from gens.models.genomic import Chromosome, GenomeBuild
+from gens.routes.utils import AdapterDep, ApiTags, GensDb
 
 router = APIRouter(prefix="/gene_lists")
 
@@ -11,14 +13,14 @@ LOG = logging.getLogger(__name__)
 
 
 @router.get("/", tags=[ApiTags.GENE_LIST])
-async def get_gene_lists(variant_adapter: AdapterDep) -> list[GeneListRecord]:
+def get_gene_lists(variant_adapter: AdapterDep) -> list[GeneListRecord]:
     """Get ID and name of all available gene lists"""
 
     return variant_adapter.get_gene_lists()
 
 
 @router.get("/track/{panel_id}", tags=[ApiTags.GENE_LIST])
-async def get_gene_list_symbols(
+def get_gene_list_symbols(
     panel_id: str,
     variant_adapter: AdapterDep,
 ) -> list[str]:
@@ -26,3 +28,25 @@ async def get_gene_list_symbols(
 
     gene_names = variant_adapter.get_gene_list(panel_id)
     return gene_names
+
+
+@router.get("/track/{panel_id}/transcripts", tags=[ApiTags.GENE_LIST])
+def get_gene_list_transcripts(
+    panel_id: str,
+    genome_build: GenomeBuild,
+    variant_adapter: AdapterDep,
+    db: GensDb,
+    chromosome: Chromosome | None = None,
+    only_canonical: bool = True,
+) -> list[SimplifiedTranscriptInfo]:
+    """Get the transcripts of the genes in a gene list.
+
+    Limit the transcripts to a chromosome with the chromosome parameter.
+    """
+
+    gene_names = variant_adapter.get_gene_list(panel_id)
+    if not gene_names:
+        return []
+    return get_transcripts_by_gene_symbols(
+        gene_names, genome_build, db, chromosome, only_canonical
+    )
@@ -1,27 +1,44 @@
 """Routes for getting coverage information."""
 
+import asyncio
+from http import HTTPStatus
 from typing import Literal
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
 from gens.crud import samples
 from gens.db.collections import SAMPLES_COLLECTION
-from gens.io import get_overview_from_tabix, get_scatter_data
+from gens.io import (
+    BINARY_COVERAGE_MEDIA_TYPE,
+    encode_binary_coverage,
+    get_overview,
+    get_sample_file,
+    get_scatter_data_batch,
+    read_scatter_data,
+    run_in_tabix_executor,
+)
 from gens.models.genomic import Chromosome, GenomeBuild, GenomicRegion
 from gens.models.sample import (
     GenomeCoverage,
     MultipleSamples,
+    SampleCoverage,
     SampleInfo,
     ScatterDataType,
 )
 
-from .utils import ApiTags, GensDb
+from .utils import (
+    ApiTags,
+    AsyncGensDb,
+    GensDb,
+    check_not_modified,
+    file_validators,
+)
 
 router = APIRouter(prefix="/samples")
 
 
 @router.get("/", tags=[ApiTags.SAMPLE])
-async def get_multiple_samples(
+def get_multiple_samples(
     db: GensDb, skip: int = 0, limit: int | None = None
 ) -> MultipleSamples:
     """Query the database for multiple samples.
@@ -33,7 +50,7 @@ async def get_multiple_samples(
 
 
 @router.get("/sample", tags=[ApiTags.SAMPLE])
-async def get_sample_route(
+def get_sample_route(
     sample_id: str, case_id: str, genome_build: GenomeBuild, db: GensDb
 ) -> SampleInfo:
     sample_info: SampleInfo = samples.get_sample(
@@ -48,48 +65,146 @@ async def get_sample_route(
 @router.get(
     "/sample/{data_type}",
     tags=[ApiTags.SAMPLE],
+    response_model=GenomeCoverage,
+    responses={200: {"content": {BINARY_COVERAGE_MEDIA_TYPE: {}}}},
 )
 async def get_genome_coverage(
+    request: Request,
+    response: Response,
     sample_id: str,
     case_id: str,
     data_type: ScatterDataType,
     chromosome: Chromosome,
     genome_build: GenomeBuild,
-    db: GensDb,
+    db: AsyncGensDb,
     start: int = 1,
     end: int | None = None,
     zoom_level: Literal["o", "a", "b", "c", "d"] = "a",
-) -> GenomeCoverage:
-    """Get genome coverage information."""
+    max_points: int | None = Query(default=None, ge=4),
+) -> GenomeCoverage | Response:
+    """Get genome coverage information.
 
-    region = GenomicRegion(chromosome=chromosome, start=start, end=end)
+    Set max_points, for example to four times the width of the track in pixels,
+    to downsample the region server-side while keeping the min and max values of
+    each pixel.
 
-    return get_scatter_data(
-        collection=db.get_collection(SAMPLES_COLLECTION),
+    Request "application/octet-stream" in the Accept header to get the positions
+    and values as packed int32 and float32 arrays instead of JSON.
+    """
+
+    is_binary = BINARY_COVERAGE_MEDIA_TYPE in request.headers.get("accept", "")
+    sample_files = await samples.get_sample_files_async(
+        db.get_collection(SAMPLES_COLLECTION),
         sample_id=sample_id,
         case_id=case_id,
         genome_build=genome_build,
+    )
+    sample_file = get_sample_file(sample_files, data_type)
+    validators = await run_in_tabix_executor(
+        file_validators,
+        [sample_file],
+        BINARY_COVERAGE_MEDIA_TYPE if is_binary else "json",
+        "Accept",
+    )
+    check_not_modified(request, response, validators)
+
+    region = GenomicRegion(chromosome=chromosome, start=start, end=end)
+    coverage = await run_in_tabix_executor(
+        read_scatter_data, sample_file, region, zoom_level, max_points
+    )
+
+    if is_binary:
+        return Response(
+            content=encode_binary_coverage(coverage),
+            media_type=BINARY_COVERAGE_MEDIA_TYPE,
+            headers=validators.headers,
+        )
+    return coverage.to_model()
+
+
+@router.get("/batch", tags=[ApiTags.SAMPLE])
+async def get_genome_coverage_batch(
+    request: Request,
+    response: Response,
+    case_id: str,
+    chromosome: Chromosome,
+    genome_build: GenomeBuild,
+    db: AsyncGensDb,
+    sample_id: list[str] = Query(min_length=1),
+    data_type: list[ScatterDataType] = Query(
+        default=[ScatterDataType.COV, ScatterDataType.BAF]
+    ),
+    start: int = 1,
+    end: int | None = None,
+    zoom_level: Literal["o", "a", "b", "c", "d"] = "a",
+    max_points: int | None = Query(default=None, ge=4),
+) -> list[SampleCoverage]:
+    """Get coverage and BAF information of several samples in a case.
+
+    The region is read for every combination of sample and data type. Repeat
+    the sample_id and data_type parameters to request more than one.
+    """
+    duplicates = sorted({sid for sid in sample_id if sample_id.count(sid) > 1})
+    if duplicates:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=f"Sample ids requested more than once: {', '.join(duplicates)}",
+        )
+
+    samples_c = db.get_collection(SAMPLES_COLLECTION)
+    sample_files = await asyncio.gather(
+        *(
+            samples.get_sample_files_async(
+                samples_c, sample_id=sid, case_id=case_id, genome_build=genome_build
+            )
+            for sid in sample_id
+        )
+    )
+    validators = await run_in_tabix_executor(
+        file_validators,
+        [get_sample_file(files, dt) for files in sample_files for dt in data_type],
+    )
+    check_not_modified(request, response, validators)
+
+    region = GenomicRegion(chromosome=chromosome, start=start, end=end)
+    results = await get_scatter_data_batch(
+        sample_files=dict(zip(sample_id, sample_files)),
         region=region,
-        data_type=data_type,
+        data_types=data_type,
         zoom_level=zoom_level,
+        max_points=max_points,
     )
+    return [
+        SampleCoverage.model_construct(
+            sample_id=result_sample_id,
+            data_type=result_data_type,
+            data=coverage.to_model(),
+        )
+        for result_sample_id, result_data_type, coverage in results
+    ]
 
 
 @router.get("/sample/{data_type}/overview", tags=[ApiTags.SAMPLE])
 async def get_cov_overview(
+    request: Request,
+    response: Response,
     sample_id: str,
     case_id: str,
     data_type: ScatterDataType,
     genome_build: GenomeBuild,
-    db: GensDb,
+    db: AsyncGensDb,
 ):
     """Get aggregated overview coverage information."""
 
-    sample_info: SampleInfo = samples.get_sample(
+    sample_files = await samples.get_sample_files_async(
         db[SAMPLES_COLLECTION],
         sample_id=sample_id,
         case_id=case_id,
         genome_build=genome_build,
     )
 
-    return get_overview_from_tabix(sample_info, data_type)
+    validators = await run_in_tabix_executor(
+        file_validators, [get_sample_file(sample_files, data_type)], "overview"
+    )
+    check_not_modified(request, response, validators)
+    return await run_in_tabix_executor(get_overview, sample_files, data_type)
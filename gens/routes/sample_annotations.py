@@ -1,6 +1,6 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from gens.crud.sample_annotations import (
     get_sample_annotation_tracks,
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/sample-tracks")
 
 
 @router.get("/annotations", tags=[ApiTags.SAMPLE_ANNOT])
-async def get_sample_annotation_tracks_route(
+def get_sample_annotation_tracks_route(
     sample_id: str,
     case_id: str,
     genome_build: GenomeBuild,
@@ -33,16 +33,20 @@ async def get_sample_annotation_tracks_route(
 
 
 @router.get("/annotations/track/{track_id}", tags=[ApiTags.SAMPLE_ANNOT])
-async def get_sample_annotations_route(
-    track_id: PydanticObjectId, chromosome: Chromosome, db: GensDb
+def get_sample_annotations_route(
+    track_id: PydanticObjectId,
+    chromosome: Chromosome,
+    db: GensDb,
+    start: int | None = Query(default=None, ge=1),
+    end: int | None = Query(default=None, ge=1),
 ) -> list[SimplifiedTrackInfo]:
     return get_sample_annotations_for_track(
-        track_id=track_id, chromosome=chromosome, db=db
+        track_id=track_id, chromosome=chromosome, db=db, start=start, end=end
     )
 
 
 @router.get("/annotations/record/{record_id}", tags=[ApiTags.SAMPLE_ANNOT])
-async def get_sample_annotation_record_route(
+def get_sample_annotation_record_route(
     record_id: PydanticObjectId,
     db: GensDb,
 ) -> SampleAnnotationRecord:
@@ -1,15 +1,26 @@
 """Shared support functions and data."""
 
+import datetime
+import hashlib
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
 from enum import StrEnum
+from http import HTTPStatus
+from pathlib import Path
 from typing import Annotated, Any
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, Response
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 
 from gens.adapters.base import InterpretationAdapter
-from gens.db.db import get_gens_db, get_variant_software_adapter
+from gens.config import AuthMethod, settings
+from gens.crud.annotations import get_latest_data_update
+from gens.db.db import get_gens_db, get_gens_db_async, get_variant_software_adapter
+from gens.io import file_signature
 
 GensDb = Annotated[Database[Any], Depends(get_gens_db)]
+AsyncGensDb = Annotated[AsyncDatabase[Any], Depends(get_gens_db_async)]
 AdapterDep = Annotated[InterpretationAdapter, Depends(get_variant_software_adapter)]
 
 
@@ -23,3 +34,130 @@ class ApiTags(StrEnum):
     VAR = "variant"
     SAMPLE_ANNOT = "sample-annotation"
     GENE_LIST = "gene-list"
+    HEALTH = "health"
+
+
+@dataclass(frozen=True)
+class CacheValidators:
+    """Validators used for answering conditional requests."""
+
+    etag: str
+    last_modified: datetime.datetime | None = None
+    vary: str | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        # clients may store responses but must revalidate before reusing them
+        cache_control = "no-cache"
+        if settings.authentication != AuthMethod.DISABLED:
+            cache_control = "private, no-cache"
+        headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        if self.vary is not None:
+            headers["Vary"] = self.vary
+        return headers
+
+    def is_current(self, request: Request) -> bool:
+        """Check if the copy the client has cached is still current."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        # HTTP dates have a resolution of one second
+        return self.last_modified.replace(microsecond=0) <= since
+
+
+def _make_etag(*parts: object) -> str:
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def file_validators(
+    paths: list[Path], representation: str = "", vary: str | None = None
+) -> CacheValidators:
+    """Get validators for data read from files, based on their mtime and size.
+
+    Stats the files, async routes run it in the tabix reader threads.
+    """
+    signatures = [file_signature(path) for path in paths]
+    last_modified = datetime.datetime.fromtimestamp(
+        max(mtime_ns for _, _, mtime_ns, _ in signatures) / 1e9,
+        tz=datetime.timezone.utc,
+    )
+    return CacheValidators(
+        etag=_make_etag(representation, *signatures),
+        last_modified=last_modified,
+        vary=vary,
+    )
+
+
+def track_validators(
+    db: Database[Any],
+    track_types: list[str],
+    representation: str = "",
+    vary: str | None = None,
+) -> CacheValidators | None:
+    """Get validators for tracks loaded with the CLI.
+
+    Based on the update timestamps written when the tracks are loaded. None if
+    the tracks have no registered updates.
+    """
+    return update_validators(
+        track_types,
+        [get_latest_data_update(db, track_types)],
+        representation=representation,
+        vary=vary,
+    )
+
+
+def update_validators(
+    track_types: list[str],
+    timestamps: list[datetime.datetime | None],
+    representation: str = "",
+    vary: str | None = None,
+) -> CacheValidators | None:
+    """Get validators for tracks from the update timestamps they were read at.
+
+    Use for tracks served from memory, which can lag behind the database. None
+    if the tracks have no registered updates.
+    """
+    known = [
+        ts if ts.tzinfo is not None else ts.replace(tzinfo=datetime.timezone.utc)
+        for ts in timestamps
+        if ts is not None
+    ]
+    if len(known) == 0:
+        return None
+    timestamp = max(known)
+    return CacheValidators(
+        etag=_make_etag(representation, *track_types, timestamp.isoformat()),
+        last_modified=timestamp,
+        vary=vary,
+    )
+
+
+def check_not_modified(
+    request: Request, response: Response, validators: CacheValidators | None
+) -> None:
+    """Add cache headers and answer with 304 if the client copy is current.
+
+    Call before doing any work to produce the response.
+    """
+    if validators is None:
+        return
+    if validators.is_current(request):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_MODIFIED, headers=validators.headers
+        )
+    response.headers.update(validators.headers)
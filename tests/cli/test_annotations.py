@@ -298,3 +298,42 @@ def test_delete_annotation_cli_removes_documents(
 
     assert tracks.count_documents({}) == 0
     assert annots.count_documents({}) == 0
+
+
+def test_load_annotations_in_unordered_batches(
+    cli_load: ModuleType,
+    tmp_path: Path,
+    db: mongomock.Database,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    for track_name in ["track1", "track2"]:
+        (tmp_path / f"{track_name}.bed").write_text(
+            "\n".join(
+                f"1\t{idx * 100}\t{idx * 100 + 50}\tannot{idx}\t0\t+\t.\t.\trgb(0,0,0)"
+                for idx in range(5)
+            )
+        )
+
+    inserts: list[tuple[int, bool]] = []
+    insert_many = mongomock.Collection.insert_many
+
+    def _insert_many(self, documents, ordered=True, **kwargs):
+        inserts.append((len(documents), ordered))
+        return insert_many(self, documents, ordered=ordered, **kwargs)
+
+    monkeypatch.setattr(mongomock.Collection, "insert_many", _insert_many)
+
+    cli_load.annotations.callback(
+        file=tmp_path,
+        genome_build=38,
+        is_tsv=False,
+        ignore_errors=False,
+        batch_size=2,
+        workers=2,
+    )
+
+    assert sorted(inserts) == [(1, False)] * 2 + [(2, False)] * 4
+    annot_coll = db.get_collection(ANNOTATIONS_COLLECTION)
+    track_coll = db.get_collection(ANNOTATION_TRACKS_COLLECTION)
+    for track in track_coll.find({}):
+        assert annot_coll.count_documents({"track_id": track["_id"]}) == 5
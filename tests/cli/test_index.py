@@ -3,6 +3,8 @@ from types import ModuleType
 
 import mongomock
 
+from gens.crud.utils import region_to_bin
+from gens.db.collections import ANNOTATIONS_COLLECTION
 from gens.db.index import INDEXES
 
 LOG = logging.getLogger(__name__)
@@ -39,3 +41,18 @@ def test_index_updates_indexes(cli_index: ModuleType, db: mongomock.Database):
         info = db.get_collection(collection_name).index_information()
         for model in models:
             assert _index_name(model) in info
+
+
+def test_index_adds_missing_bins(cli_index: ModuleType, db: mongomock.Database):
+    """Ensure that annotations loaded without a bin gets one."""
+    annotations = db.get_collection(ANNOTATIONS_COLLECTION)
+    annotations.insert_many(
+        [{"start": 100, "end": 200}, {"start": 1, "end": 200_000, "bin": 73}]
+    )
+
+    cli_index.index.callback(build=False, update=True)
+
+    assert [doc["bin"] for doc in annotations.find()] == [
+        region_to_bin(100, 200),
+        73,
+    ]
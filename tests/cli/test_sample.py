@@ -780,3 +780,36 @@ def test_update_sample_modifies_collection(db: Any, tmp_path: Path) -> None:
     assert doc is not None
 
     sample_obj.sample_type = "tumor"
+
+
+def test_update_overview_cli(
+    cli_update: ModuleType,
+    db: mongomock.Database,
+    coverage_file_path: Path,
+):
+    update_sample(
+        db,
+        SampleInfo(
+            sample_id="sample1",
+            case_id="caseA",
+            genome_build=GenomeBuild(38),
+            baf_file=coverage_file_path,
+            coverage_file=coverage_file_path,
+        ),
+    )
+
+    cli_update.overview.callback(
+        sample_id=None, case_id="caseA", genome_build=None, force=False
+    )
+
+    overview_file = coverage_file_path.with_name(
+        coverage_file_path.name + ".overview.npz"
+    )
+    assert overview_file.is_file()
+    mtime = overview_file.stat().st_mtime_ns
+
+    # up to date overviews are kept unless forced
+    cli_update.overview.callback(
+        sample_id=None, case_id="caseA", genome_build=None, force=False
+    )
+    assert overview_file.stat().st_mtime_ns == mtime
@@ -3,6 +3,7 @@ from types import ModuleType
 
 import mongomock
 
+from gens.crud.sample_annotations import get_sample_annotations_for_track
 from gens.db.collections import (
     SAMPLE_ANNOTATION_TRACKS_COLLECTION,
     SAMPLE_ANNOTATIONS_COLLECTION,
@@ -50,6 +51,15 @@ def test_load_sample_annotation_creates_documents(
     assert rec["start"] == 1
     assert rec["end"] == 10
 
+    def _names_in_region(start: int, end: int) -> list[str]:
+        annots = get_sample_annotations_for_track(
+            rec["track_id"], "1", db, start=start, end=end
+        )
+        return [annot.name for annot in annots]
+
+    assert _names_in_region(5, 100) == ["rec"]
+    assert _names_in_region(11, 100) == []
+
 
 def test_load_sample_annotation_updates_existing(
     cli_load: ModuleType,
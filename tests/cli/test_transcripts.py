@@ -4,7 +4,7 @@ from typing import Any
 import mongomock
 import pytest
 
-from gens.db.collections import TRANSCRIPTS_COLLECTION
+from gens.db.collections import TRANSCRIPTS_COLLECTION, UPDATES_COLLECTION
 from gens.models.genomic import GenomeBuild
 
 
@@ -33,7 +33,17 @@ def test_load_transcripts_invokes_crud(
     cli_load: Any,
     tmp_path: Path,
     db: mongomock.Database,
+    monkeypatch: pytest.MonkeyPatch,
 ):
+    updates: list[dict[str, Any]] = []
+    insert_one = mongomock.Collection.insert_one
+
+    def _insert_one(self, doc, *args, **kwargs):
+        if self.name == UPDATES_COLLECTION:
+            updates.append(doc)
+        return insert_one(self, doc, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.Collection, "insert_one", _insert_one)
 
     gtf = tmp_path / "transcript.gtf"
     gtf_content = (
@@ -75,16 +85,13 @@ def test_load_transcripts_invokes_crud(
     assert rec["hgnc_id"] == "1"
     assert rec["refseq_id"] == "rs1"
     assert rec["mane"] == "MANE Select"
+    # running instances reload once, when the payloads have been created
+    assert [update["track"] for update in updates] == [TRANSCRIPTS_COLLECTION]
 
 
-def test_create_transcripts_adds_documents(
-    monkeypatch: pytest.MonkeyPatch, db: mongomock.Database
-) -> None:
-
+def test_create_transcripts_adds_documents(db: mongomock.Database) -> None:
     from gens.crud import transcripts as transcripts_mod
 
-    monkeypatch.setattr(transcripts_mod, "register_data_update", lambda db, col: None)
-
     coll = db.get_collection(TRANSCRIPTS_COLLECTION)
 
     tr = _build_transcript()
@@ -92,3 +99,86 @@ def test_create_transcripts_adds_documents(
 
     assert coll.count_documents({}) == 1
     assert coll.find_one({"transcript_id": "t1"}) is not None
+
+
+def _gtf_line(feature: str, start: int, end: int, attribs: str, chrom="1") -> str:
+    return "\t".join(
+        [chrom, "ensembl", feature, str(start), str(end), ".", "+", ".", attribs]
+    )
+
+
+def test_build_transcripts_streams_chromosomes() -> None:
+    from gens.load.transcripts import build_transcripts
+
+    gene1 = 'gene_id "G1"; gene_name "GENE1"; transcript_id "t1"; transcript_biotype "protein_coding";'
+    gene2 = 'gene_id "G2"; gene_name "GENE2"; transcript_id "t2"; transcript_biotype "protein_coding";'
+    gene3 = 'gene_id "G3"; gene_name "GENE3"; transcript_id "t3"; transcript_biotype "protein_coding";'
+    # the genes of a chromosome are interleaved, as in coordinate sorted files
+    lines = [
+        _gtf_line("transcript", 1, 300, gene1),
+        _gtf_line("exon", 1, 50, gene1 + ' exon_number "1";'),
+        _gtf_line("transcript", 100, 200, gene2),
+        _gtf_line("exon", 100, 150, gene2 + ' exon_number "1";'),
+        _gtf_line("exon", 250, 300, gene1 + ' exon_number "2";'),
+        _gtf_line("transcript", 1, 100, gene3, chrom="2"),
+    ]
+    n_read = 0
+
+    def read_lines():
+        nonlocal n_read
+        for line in lines:
+            n_read += 1
+            yield line
+
+    mane = ["Ensembl_nuc\tHGNC_ID\tRefSeq_nuc\tMANE_status"]
+    transcripts = build_transcripts(read_lines(), mane, GenomeBuild(38))
+
+    first = next(transcripts)
+    # the first chromosome is done when the second chromosome starts
+    assert n_read == 6
+    assert first.transcript_id == "t1"
+    assert [feat.start for feat in first.features] == [1, 250]
+    assert [tr.transcript_id for tr in transcripts] == ["t2", "t3"]
+
+
+def test_build_transcripts_warns_on_unsorted_chromosomes(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    from gens.load.transcripts import build_transcripts
+
+    gene1 = 'gene_id "G1"; gene_name "GENE1"; transcript_id "t1"; transcript_biotype "protein_coding";'
+    gene2 = 'gene_id "G2"; gene_name "GENE2"; transcript_id "t2"; transcript_biotype "protein_coding";'
+    lines = [
+        _gtf_line("transcript", 1, 300, gene1),
+        _gtf_line("transcript", 1, 100, gene2, chrom="2"),
+        _gtf_line("exon", 250, 300, gene1 + ' exon_number "1";'),
+    ]
+    mane = ["Ensembl_nuc\tHGNC_ID\tRefSeq_nuc\tMANE_status"]
+
+    transcripts = list(build_transcripts(lines, mane, GenomeBuild(38)))
+
+    assert [tr.features for tr in transcripts] == [[], []]
+    assert "1 exons and UTRs skipped" in caplog.text
+
+
+def test_create_transcripts_inserts_in_batches(
+    monkeypatch: pytest.MonkeyPatch, db: mongomock.Database
+) -> None:
+    from gens.crud import transcripts as transcripts_mod
+
+    insert_sizes: list[int] = []
+    insert_many = mongomock.Collection.insert_many
+
+    def _insert_many(self, docs, *args, **kwargs):
+        insert_sizes.append(len(docs))
+        return insert_many(self, docs, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.Collection, "insert_many", _insert_many)
+
+    n_inserted = transcripts_mod.create_transcripts(
+        (_build_transcript() for _ in range(5)), db, batch_size=2
+    )
+
+    assert n_inserted == 5
+    assert insert_sizes == [2, 2, 1]
+    assert db.get_collection(TRANSCRIPTS_COLLECTION).count_documents({}) == 5
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Callable
 
 import mongomock
+import pysam
 import pytest
 from pymongo import MongoClient
 
@@ -125,12 +126,97 @@ def meta_norow_file_path(data_path: Path) -> Path:
     return data_path.joinpath("meta_norow.tsv")
 
 
+def write_tabix_file(
+    file_path: Path, records: list[tuple[str, int, int, float]]
+) -> Path:
+    """Write Gens bed records to a bgzipped and tabix indexed file."""
+    file_path.write_text(
+        "".join(
+            f"{name}\t{start}\t{end}\t{value}\n" for name, start, end, value in records
+        )
+    )
+    return Path(pysam.tabix_index(str(file_path), preset="bed", force=True))
+
+
+@pytest.fixture()
+def coverage_file_path(tmp_path: Path) -> Path:
+    """Get path to a small tabix indexed coverage file with all zoom levels."""
+    records = [
+        (f"{zoom}_{chrom}", pos, pos + 1, round(0.01 * pos, 2))
+        for zoom in ["a", "b", "c", "d", "o"]
+        for chrom in ["1", "2"]
+        for pos in range(10, 110, 10)
+    ]
+    return write_tabix_file(tmp_path / "sample.cov.bed", records)
+
+
 @pytest.fixture()
 def db() -> mongomock.Database:
     client: mongomock.MongoClient = mongomock.MongoClient()
     return client.get_database("test")
 
 
+class AsyncMockCollection:
+    """Await-able facade over a mongomock collection for the async routes."""
+
+    def __init__(self, collection: mongomock.Collection) -> None:
+        self._collection = collection
+
+    def __getattr__(self, name: str):
+        method = getattr(self._collection, name)
+
+        async def _call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return _call
+
+
+class AsyncMockDatabase:
+    """Await-able facade over a mongomock database for the async routes."""
+
+    def __init__(self, db: mongomock.Database) -> None:
+        self._db = db
+
+    def get_collection(self, name: str) -> AsyncMockCollection:
+        return AsyncMockCollection(self._db.get_collection(name))
+
+    __getitem__ = get_collection
+
+
+@pytest.fixture()
+def api_client(db: mongomock.Database):
+    """Get a client for the Gens API backed by the mock database."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from gens.app import add_api_routers
+    from gens.db.db import get_gens_db, get_gens_db_async
+
+    app = FastAPI()
+    add_api_routers(app)
+    app.dependency_overrides[get_gens_db] = lambda: db
+    app.dependency_overrides[get_gens_db_async] = lambda: AsyncMockDatabase(db)
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Make sure in-process caches do not leak between tests."""
+    from gens.adapters.cached import variant_cache
+    from gens.adapters.scout import gene_list_cache
+    from gens.crud.samples import sample_files_cache
+    from gens.crud.search_index import suggestion_index
+    from gens.crud.transcript_index import transcript_index
+    from gens.db.db import mongo_clients
+
+    sample_files_cache.clear()
+    variant_cache.clear()
+    gene_list_cache.clear()
+    suggestion_index.clear()
+    transcript_index.clear()
+    mongo_clients.close()
+
+
 @pytest.fixture(autouse=True)
 def fail_fast_real_mongo(monkeypatch: pytest.MonkeyPatch) -> None:
     """Fail fast if a test accidentally uses a real MongoDB connection."""
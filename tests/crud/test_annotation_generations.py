@@ -0,0 +1,94 @@
+"""Test annotation CRUD functions."""
+
+from typing import Iterator
+
+import mongomock
+import pytest
+
+from gens.crud.annotations import (
+    create_annotation_track,
+    create_annotations_for_track,
+    get_annotations_for_track,
+    replace_annotations_for_track,
+)
+from gens.crud.locks import database_lock
+from gens.db.collections import ANNOTATIONS_COLLECTION
+from gens.exceptions import DatabaseLockError
+from gens.models.annotation import AnnotationRecord, AnnotationTrack
+from gens.models.base import PydanticObjectId
+
+
+def _annotations(track_id: PydanticObjectId, name: str) -> list[AnnotationRecord]:
+    return [
+        AnnotationRecord(
+            track_id=track_id,
+            name=f"{name}{idx}",
+            genome_build=38,
+            chrom="1",
+            start=idx * 1000 + 1,
+            end=idx * 1000 + 100,
+        )
+        for idx in range(3)
+    ]
+
+
+def test_replace_annotations_switches_generation(db: mongomock.Database):
+    track_id = create_annotation_track(
+        AnnotationTrack(name="track", description="", genome_build=38), db
+    )
+    # annotations loaded before generations were used
+    create_annotations_for_track(_annotations(track_id, "old"), db)
+    db.get_collection(ANNOTATIONS_COLLECTION).update_many(
+        {}, {"$unset": {"generation": ""}}
+    )
+
+    def _names() -> list[str]:
+        return [annot.name for annot in get_annotations_for_track(track_id, db)]
+
+    # annotations of the next generation, here from an interrupted load, are
+    # not visible until switched to
+    create_annotations_for_track(_annotations(track_id, "staged"), db, generation=1)
+    assert _names() == ["old0", "old1", "old2"]
+
+    replace_annotations_for_track(track_id, _annotations(track_id, "new"), db)
+
+    assert _names() == ["new0", "new1", "new2"]
+    assert db.get_collection(ANNOTATIONS_COLLECTION).count_documents({}) == 3
+
+
+def test_failed_replace_keeps_current_annotations(db: mongomock.Database):
+    track_id = create_annotation_track(
+        AnnotationTrack(name="track", description="", genome_build=38), db
+    )
+    replace_annotations_for_track(track_id, _annotations(track_id, "old"), db)
+
+    def _failing_annotations() -> Iterator[AnnotationRecord]:
+        yield from _annotations(track_id, "new")
+        raise ValueError("Invalid record")
+
+    with pytest.raises(ValueError):
+        replace_annotations_for_track(
+            track_id, _failing_annotations(), db, batch_size=2
+        )
+
+    names = [annot.name for annot in get_annotations_for_track(track_id, db)]
+    assert names == ["old0", "old1", "old2"]
+    assert db.get_collection(ANNOTATIONS_COLLECTION).count_documents({}) == 3
+
+
+def test_replace_fails_while_track_is_loaded(db: mongomock.Database):
+    track_id = create_annotation_track(
+        AnnotationTrack(name="track", description="", genome_build=38), db
+    )
+    replace_annotations_for_track(track_id, _annotations(track_id, "old"), db)
+
+    with database_lock(db, f"annotation-track-{track_id}"):
+        with pytest.raises(DatabaseLockError):
+            replace_annotations_for_track(track_id, _annotations(track_id, "new"), db)
+
+    names = [annot.name for annot in get_annotations_for_track(track_id, db)]
+    assert names == ["old0", "old1", "old2"]
+    # the lock is released once the load holding it has finished
+    replace_annotations_for_track(track_id, _annotations(track_id, "new"), db)
+    names = [annot.name for annot in get_annotations_for_track(track_id, db)]
+    assert names == ["new0", "new1", "new2"]
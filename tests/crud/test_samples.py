@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import mongomock
+import pytest
+
+from gens.cache import TtlCache
+from gens.crud import samples
+from gens.crud.samples import delete_sample, get_sample_files, update_sample
+from gens.db.collections import SAMPLES_COLLECTION
+from gens.exceptions import SampleNotFoundError
+from gens.models.genomic import GenomeBuild
+from gens.models.sample import SampleInfo
+
+
+@pytest.fixture()
+def sample_obj(coverage_file_path: Path) -> SampleInfo:
+    return SampleInfo(
+        sample_id="sample1",
+        case_id="caseA",
+        genome_build=GenomeBuild(38),
+        baf_file=coverage_file_path,
+        coverage_file=coverage_file_path,
+    )
+
+
+def test_get_sample_files_is_cached(
+    db: mongomock.Database, sample_obj: SampleInfo, monkeypatch: pytest.MonkeyPatch
+):
+    update_sample(db, sample_obj)
+    samples_c = db.get_collection(SAMPLES_COLLECTION)
+
+    files = get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
+    assert files.coverage_file == sample_obj.coverage_file
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("The database should not be queried")
+
+    monkeypatch.setattr(samples_c, "find_one", _fail)
+    monkeypatch.setattr(Path, "is_file", _fail)
+    assert get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38)) == files
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def timer(monkeypatch: pytest.MonkeyPatch) -> FakeTimer:
+    timer = FakeTimer()
+    monkeypatch.setattr(
+        samples, "sample_files_cache", TtlCache(max_size=8, ttl=30, timer=timer)
+    )
+    return timer
+
+
+def test_updated_sample_files_are_used_once_expired(
+    db: mongomock.Database, sample_obj: SampleInfo, tmp_path: Path, timer: FakeTimer
+):
+    update_sample(db, sample_obj)
+    samples_c = db.get_collection(SAMPLES_COLLECTION)
+    get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
+
+    new_baf = tmp_path / "new.baf.bed.gz"
+    new_baf.write_bytes(sample_obj.baf_file.read_bytes())
+    old_baf = sample_obj.baf_file
+    sample_obj.baf_file = new_baf
+    update_sample(db, sample_obj)
+
+    files = get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
+    assert files.baf_file == old_baf
+
+    timer.now = 31
+    files = get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
+    assert files.baf_file == new_baf
+
+
+def test_deleted_sample_is_not_found_once_expired(
+    db: mongomock.Database, sample_obj: SampleInfo, timer: FakeTimer
+):
+    update_sample(db, sample_obj)
+    samples_c = db.get_collection(SAMPLES_COLLECTION)
+    get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
+
+    delete_sample(db, "sample1", "caseA", GenomeBuild(38))
+    get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
+
+    timer.now = 31
+    with pytest.raises(SampleNotFoundError):
+        get_sample_files(samples_c, "sample1", "caseA", GenomeBuild(38))
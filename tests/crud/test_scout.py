@@ -0,0 +1,216 @@
+"""Test queries against the Scout database."""
+
+import mongomock
+import pytest
+
+from gens.adapters.base import InterpretationAdapter
+from gens.adapters.cached import CachedInterpretationAdapter
+from gens.adapters.scout import ScoutMongoAdapter
+from gens.cache import TtlCache
+from gens.models.genomic import GenomicRegion, VariantCategory
+
+
+def _variant(
+    document_id: str,
+    position: int,
+    end: int,
+    chromosome: str = "1",
+    end_chrom: str | None = None,
+    rank_score: float | None = None,
+    sub_category: str = "del",
+    genotype_call: str = "0/1",
+) -> dict:
+    return {
+        "_id": document_id,
+        "document_id": document_id,
+        "case_id": "case",
+        "category": "sv",
+        "chromosome": chromosome,
+        "end_chrom": end_chrom or chromosome,
+        "position": position,
+        "end": end,
+        "variant_type": "clinical",
+        "sub_category": sub_category,
+        "rank_score": rank_score,
+        "samples": (
+            [
+                {
+                    "sample_id": "sample",
+                    "display_name": "Sample",
+                    "genotype_call": "0/0",
+                },
+                {"sample_id": "other", "display_name": "Other", "genotype_call": "1/1"},
+            ]
+            if genotype_call == "0/0"
+            else [
+                {
+                    "sample_id": "sample",
+                    "display_name": "Sample",
+                    "genotype_call": genotype_call,
+                }
+            ]
+        ),
+        "display_name": "not projected",
+    }
+
+
+@pytest.fixture()
+def adapter() -> ScoutMongoAdapter:
+    db = mongomock.MongoClient().get_database("scout")
+    db.get_collection("variant").insert_many(
+        [
+            _variant("before", 100, 900),
+            _variant("overlap_start", 900, 1_100, rank_score=5),
+            _variant("inside", 1_200, 1_300, rank_score=20, sub_category="dup"),
+            _variant("spanning", 500, 5_000),
+            _variant("after", 3_000, 3_100),
+            _variant("translocation", 200, 50_000, end_chrom="2", sub_category="bnd"),
+            _variant("other_chrom", 1_000, 1_100, chromosome="2"),
+            _variant("reference_call", 1_000, 1_100, genotype_call="0/0"),
+        ]
+    )
+    return ScoutMongoAdapter(db)
+
+
+def _ids(adapter: InterpretationAdapter, region: GenomicRegion, **filters) -> list[str]:
+    variants = adapter.get_variants(
+        "case", "sample", region, VariantCategory.SINGLE_VAR, **filters
+    )
+    return sorted(variant.document_id for variant in variants)
+
+
+def test_get_variants_in_region(adapter: ScoutMongoAdapter):
+    region = GenomicRegion(chromosome="1", start=1_000, end=2_000)
+
+    assert _ids(adapter, region) == [
+        "inside",
+        "overlap_start",
+        "spanning",
+        "translocation",
+    ]
+
+
+def test_get_variants_of_whole_chromosome(adapter: ScoutMongoAdapter):
+    region = GenomicRegion(chromosome="1", start=1, end=None)
+
+    variants = adapter.get_variants(
+        "case", "Sample", region, VariantCategory.SINGLE_VAR
+    )
+
+    assert len(variants) == 6
+    assert {variant.genotype for variant in variants} == {"0/1"}
+
+
+def test_get_variants_filters_rank_score_and_sub_category(adapter: ScoutMongoAdapter):
+    region = GenomicRegion(chromosome="1", start=1_000, end=2_000)
+
+    # variants without rank score are kept
+    assert _ids(adapter, region, rank_score_threshold=10) == [
+        "inside",
+        "spanning",
+        "translocation",
+    ]
+    assert _ids(adapter, region, sub_categories=["dup", "bnd"]) == [
+        "inside",
+        "translocation",
+    ]
+
+
+class CountingAdapter(ScoutMongoAdapter):
+    def __init__(self, adapter: ScoutMongoAdapter):
+        super().__init__(adapter._db)
+        self.n_calls = 0
+
+    def get_variants(self, *args, **kwargs):
+        self.n_calls += 1
+        return super().get_variants(*args, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "start, end, filters",
+    [
+        (1_000, 2_000, {}),
+        (1, None, {}),
+        (1_000, 2_000, {"rank_score_threshold": 10}),
+        (1, 4_000, {"sub_categories": ["dup", "bnd"]}),
+    ],
+)
+def test_cached_adapter_equals_queries(
+    adapter: ScoutMongoAdapter, start: int, end: int | None, filters: dict
+):
+    cached = CachedInterpretationAdapter(CountingAdapter(adapter), TtlCache(10))
+    region = GenomicRegion(chromosome="1", start=start, end=end)
+
+    assert _ids(cached, region, **filters) == _ids(adapter, region, **filters)
+
+
+def test_cached_adapter_reuses_chromosome_variants(adapter: ScoutMongoAdapter):
+    counting = CountingAdapter(adapter)
+    cached = CachedInterpretationAdapter(counting, TtlCache(10))
+
+    for start, end in [(1, None), (1_000, 2_000), (1_200, 1_250)]:
+        _ids(cached, GenomicRegion(chromosome="1", start=start, end=end))
+    assert counting.n_calls == 1
+
+    # other chromosomes and samples are fetched separately
+    _ids(cached, GenomicRegion(chromosome="2", start=1, end=None))
+    cached.get_variants(
+        "case",
+        "other",
+        GenomicRegion(chromosome="1", start=1, end=None),
+        VariantCategory.SINGLE_VAR,
+    )
+    assert counting.n_calls == 3
+
+
+@pytest.fixture()
+def panel_db() -> mongomock.Database:
+    db = mongomock.MongoClient().get_database("scout")
+    db.get_collection("gene_panel").insert_many(
+        [
+            {
+                "panel_name": panel_name,
+                "display_name": f"{panel_name} v{version}",
+                "version": version,
+                "genes": [{"hgnc_symbol": symbol} for symbol in symbols],
+            }
+            for panel_name, version, symbols in [
+                ("OMIM", 2.0, ["BRCA1", "BRCA2"]),
+                ("OMIM", 10.0, ["BRCA1", "TP53"]),
+                ("PID", 1.0, ["CD4"]),
+            ]
+        ]
+    )
+    return db
+
+
+def test_get_latest_gene_lists(panel_db: mongomock.Database):
+    gene_lists = ScoutMongoAdapter(panel_db).get_gene_lists()
+
+    assert [(gl.id, gl.name, gl.version) for gl in gene_lists] == [
+        ("OMIM", "OMIM v10.0", "10.0"),
+        ("PID", "PID v1.0", "1.0"),
+    ]
+
+
+def test_gene_list_cached_per_version(panel_db: mongomock.Database):
+    adapter = ScoutMongoAdapter(panel_db)
+    panels = panel_db.get_collection("gene_panel")
+
+    assert adapter.get_gene_list("OMIM") == ["BRCA1", "TP53"]
+    assert adapter.get_gene_list("missing") == []
+
+    # genes of a loaded version are not read again
+    panels.update_one({"version": 10.0}, {"$set": {"genes": []}})
+    assert adapter.get_gene_list("OMIM") == ["BRCA1", "TP53"]
+
+    # a new version is picked up
+    panels.insert_one(
+        {
+            "panel_name": "OMIM",
+            "display_name": "OMIM",
+            "version": 11.0,
+            "genes": [{"symbol": "ATM"}],
+        }
+    )
+    assert adapter.get_gene_list("OMIM") == ["ATM"]
@@ -0,0 +1,195 @@
+"""Test the in-memory search suggestion index."""
+
+import asyncio
+import datetime
+import logging
+from typing import Any
+
+import mongomock
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from pymongo.errors import PyMongoError
+
+from gens import app
+from gens.crud.annotations import (
+    create_annotation_track,
+    register_data_update,
+    replace_annotations_for_track,
+)
+from gens.crud.search_index import PrefixIndex, SuggestionIndex
+from gens.crud.transcripts import create_transcripts
+from gens.db.collections import ANNOTATIONS_COLLECTION, UPDATES_COLLECTION
+from gens.models.annotation import AnnotationRecord, AnnotationTrack, TranscriptRecord
+from gens.models.genomic import GenomeBuild
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _transcript(
+    transcript_id: str,
+    gene_name: str,
+    mane: str | None = None,
+    hgnc_id: str | None = None,
+    refseq_id: str | None = None,
+) -> TranscriptRecord:
+    return TranscriptRecord.model_validate(
+        {
+            "transcript_id": transcript_id,
+            "transcript_biotype": "protein_coding",
+            "gene_name": gene_name,
+            "mane": mane,
+            "hgnc_id": hgnc_id,
+            "refseq_id": refseq_id,
+            "features": [],
+            "chrom": "1",
+            "start": 100,
+            "end": 200,
+            "strand": "+",
+            "genome_build": 38,
+        }
+    )
+
+
+@pytest.fixture()
+def transcripts_db(db: mongomock.Database) -> mongomock.Database:
+    create_transcripts(
+        [
+            _transcript("t1", "BRCA2"),
+            _transcript("t2", "BRCA1", hgnc_id="1100"),
+            _transcript("t3", "BRCA1", mane="MANE Select", refseq_id="NM_007294.4"),
+            _transcript("t4", "BRCA1P1"),
+            _transcript("t5", "BRCA2", mane="MANE Plus Clinical"),
+            _transcript("t6", "TP53", mane="MANE Select"),
+        ],
+        db,
+    )
+    return db
+
+
+def test_prefix_index_ranks_on_mane_then_match():
+    ids = [ObjectId() for _ in range(4)]
+    index = PrefixIndex.from_entries(
+        [
+            ("BRCA1P1", "BRCA1P1", ids[0], 0),
+            ("BRCA1", "BRCA1", ids[1], 0),
+            ("BRCA1", "BRCA1", ids[2], 3),
+            ("BRCA2", "BRCA2", ids[3], 2),
+        ]
+    )
+
+    suggestions = index.search("brc")
+
+    assert [sugg.text for sugg in suggestions] == ["BRCA1", "BRCA2", "BRCA1P1"]
+    # the best ranked record of a name is suggested
+    assert suggestions[0].record_id == ids[2]
+    assert [sugg.text for sugg in index.search("BRCA1", limit=1)] == ["BRCA1"]
+    assert index.search("x") == []
+    assert index.search(" ") == []
+
+
+def test_suggest_gene_symbols_and_ids(transcripts_db: mongomock.Database):
+    index = SuggestionIndex(refresh_interval=30)
+
+    def _texts(query: str) -> list[str]:
+        result = index.suggest(transcripts_db, query, GenomeBuild(38))
+        return [sugg.text for sugg in result.transcript_suggestion]
+
+    assert _texts("brca") == ["BRCA1", "BRCA2", "BRCA1P1"]
+    assert _texts("hgnc:11") == ["BRCA1"]
+    assert _texts("NM_0072") == ["BRCA1"]
+    assert _texts("tp53") == ["TP53"]
+    assert index.suggest(transcripts_db, "brca", GenomeBuild(37)) == (
+        index.suggest(transcripts_db, "nomatch", GenomeBuild(38))
+    )
+
+
+def test_suggest_current_annotations_and_reload(db: mongomock.Database):
+    timer = FakeTimer()
+    index = SuggestionIndex(refresh_interval=30, timer=timer)
+    track_id = create_annotation_track(
+        AnnotationTrack(name="track", description="", genome_build=38), db
+    )
+
+    def _load(names: list[str]) -> None:
+        annotations = [
+            AnnotationRecord(
+                track_id=track_id,
+                name=name,
+                genome_build=38,
+                chrom="1",
+                start=1,
+                end=10,
+            )
+            for name in names
+        ]
+        replace_annotations_for_track(track_id, annotations, db)
+
+    def _texts(query: str) -> list[str]:
+        result = index.suggest(db, query, GenomeBuild(38))
+        return [sugg.text for sugg in result.annotation_suggestion]
+
+    _load(["Cluster_01", "Cluster_02"])
+    register_data_update(db, ANNOTATIONS_COLLECTION, "track")
+    assert _texts("clu") == ["Cluster_01", "Cluster_02"]
+
+    _load(["Cluster_03"])
+    db.get_collection(UPDATES_COLLECTION).update_many(
+        {}, {"$set": {"timestamp": datetime.datetime(2100, 1, 1)}}
+    )
+    # the names are reused until the update is checked for
+    assert _texts("clu") == ["Cluster_01", "Cluster_02"]
+    timer.now = 31
+    assert _texts("clu") == ["Cluster_03"]
+
+
+def test_preload_continues_when_suggestions_fail(
+    transcripts_db: mongomock.Database, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that transcripts of all builds are preloaded if suggestions fail."""
+    monkeypatch.setattr(app, "get_gens_db", lambda: transcripts_db)
+
+    def fail(*_: Any) -> None:
+        raise PyMongoError("suggestions")
+
+    monkeypatch.setattr(app.suggestion_index, "load", fail)
+    loaded: list[GenomeBuild] = []
+    monkeypatch.setattr(
+        app.transcript_index, "load", lambda _db, build: loaded.append(build)
+    )
+
+    app.preload_transcripts()
+
+    assert loaded == list(GenomeBuild)
+
+
+def test_preload_errors_are_logged(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    """Test that errors of the background preload are not lost."""
+
+    def fail() -> None:
+        raise RuntimeError("preload")
+
+    monkeypatch.setattr(app, "preload_transcripts", fail)
+    monkeypatch.setattr(app.mongo_clients, "aclose", lambda: asyncio.sleep(0))
+
+    async def run_lifespan() -> None:
+        async with app.lifespan(FastAPI()):
+            # let the preload finish and its callback run
+            for _ in range(500):
+                if "Preloading transcripts failed" in caplog.text:
+                    break
+                await asyncio.sleep(0.01)
+
+    with caplog.at_level(logging.ERROR, logger=app.LOG.name):
+        asyncio.run(run_lifespan())
+
+    assert "Preloading transcripts failed" in caplog.text
+    assert "RuntimeError: preload" in caplog.text
@@ -0,0 +1,180 @@
+"""Test the in-memory transcript index."""
+
+import datetime
+import gzip
+import json
+import threading
+from typing import Any
+
+import mongomock
+import pytest
+
+from gens.crud.annotations import register_data_update
+from gens.crud.build_index import GenomeBuildIndex
+from gens.crud.transcript_index import TranscriptIndex, create_transcript_payloads
+from gens.crud.transcripts import create_transcripts, get_transcripts
+from gens.db.collections import (
+    TRANSCRIPT_PAYLOADS_COLLECTION,
+    TRANSCRIPTS_COLLECTION,
+    UPDATES_COLLECTION,
+)
+from gens.models.annotation import TranscriptRecord
+from gens.models.genomic import GenomeBuild, GenomicRegion
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _transcript(
+    name: str, start: int, end: int, mane: str | None = None, chrom: str = "1"
+) -> TranscriptRecord:
+    return TranscriptRecord.model_validate(
+        {
+            "transcript_id": name,
+            "transcript_biotype": "protein_coding",
+            "gene_name": name,
+            "mane": mane,
+            "hgnc_id": None,
+            "refseq_id": None,
+            "features": [
+                {"feature": "exon", "exon_number": 1, "start": start, "end": end}
+            ],
+            "chrom": chrom,
+            "start": start,
+            "end": end,
+            "strand": "+",
+            "genome_build": 38,
+        }
+    )
+
+
+@pytest.fixture()
+def transcripts_db(db: mongomock.Database) -> mongomock.Database:
+    create_transcripts(
+        [
+            _transcript("long", 100, 900_000, mane="MANE Select"),
+            _transcript("first", 1_000, 2_000),
+            _transcript("second", 1_500, 5_000, mane="Ensembl canonical"),
+            _transcript("third", 10_000, 20_000),
+            _transcript("other_chrom", 1_000, 2_000, chrom="2"),
+        ],
+        db,
+    )
+    return db
+
+
+@pytest.mark.parametrize(
+    "start, end", [(1, 50), (1, 1_000_000), (1_999, 1_999), (6_000, 9_000)]
+)
+@pytest.mark.parametrize("only_canonical", [False, True])
+def test_index_matches_database_query(
+    transcripts_db: mongomock.Database, start: int, end: int, only_canonical: bool
+):
+    region = GenomicRegion(chromosome="1", start=start, end=end)
+    index = TranscriptIndex(refresh_interval=30)
+
+    result = json.loads(
+        index.query(transcripts_db, region, GenomeBuild(38), only_canonical)
+    )
+
+    expected = [
+        tr.model_dump(mode="json", by_alias=True)
+        for tr in get_transcripts(region, GenomeBuild(38), transcripts_db)
+        if not only_canonical or tr.type != "non-mane"
+    ]
+    assert result == expected
+
+
+def test_index_reloads_when_transcripts_are_updated(
+    transcripts_db: mongomock.Database,
+):
+    timer = FakeTimer()
+    index = TranscriptIndex(refresh_interval=30, timer=timer)
+    region = GenomicRegion(chromosome="1", start=1_000_000, end=1_100_000)
+
+    assert json.loads(index.query(transcripts_db, region, GenomeBuild(38))) == []
+
+    create_transcripts([_transcript("new", 1_050_000, 1_060_000)], transcripts_db)
+    register_data_update(transcripts_db, TRANSCRIPTS_COLLECTION)
+    transcripts_db.get_collection(UPDATES_COLLECTION).update_many(
+        {}, {"$set": {"timestamp": datetime.datetime(2100, 1, 1)}}
+    )
+
+    # the update is not checked until the refresh interval has passed
+    timer.now = 10
+    assert json.loads(index.query(transcripts_db, region, GenomeBuild(38))) == []
+    timer.now = 31
+    result = json.loads(index.query(transcripts_db, region, GenomeBuild(38)))
+    assert [tr["name"] for tr in result] == ["new"]
+
+
+class BlockingIndex(GenomeBuildIndex[int]):
+    """Count the reads of each build, optionally waiting for a release."""
+
+    collections = [TRANSCRIPTS_COLLECTION]
+
+    def __init__(self, timer: FakeTimer):
+        super().__init__(refresh_interval=30, timer=timer)
+        self.n_reads = 0
+        self.reading = threading.Event()
+        self.release = threading.Event()
+        self.block = False
+
+    def _read(self, db: Any, genome_build: GenomeBuild) -> int:
+        self.n_reads += 1
+        n_read = self.n_reads
+        if self.block:
+            self.block = False
+            self.reading.set()
+            assert self.release.wait(5)
+        return n_read
+
+
+def test_reload_does_not_block_readers(db: mongomock.Database):
+    timer = FakeTimer()
+    index = BlockingIndex(timer)
+    assert index.get(db, GenomeBuild(38)).data == 1
+
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
+    timer.now = 31
+    index.block = True
+    reloading = threading.Thread(target=index.get, args=(db, GenomeBuild(38)))
+    reloading.start()
+    assert index.reading.wait(5)
+
+    # the loaded build is used, and other builds load, during the reload
+    assert index.get(db, GenomeBuild(38)).data == 1
+    assert index.get(db, GenomeBuild(37)).data == 3
+
+    index.release.set()
+    reloading.join(5)
+    assert index.get(db, GenomeBuild(38)).data == 2
+    assert index.n_reads == 3
+
+
+@pytest.mark.parametrize("only_canonical", [False, True])
+def test_payloads_contain_whole_chromosomes(
+    transcripts_db: mongomock.Database, only_canonical: bool
+):
+    n_payloads = create_transcript_payloads(transcripts_db, GenomeBuild(38))
+    index = TranscriptIndex(refresh_interval=30)
+
+    payload = index.get_payload(transcripts_db, "1", GenomeBuild(38), only_canonical)
+
+    assert n_payloads == 4
+    assert (
+        transcripts_db.get_collection(TRANSCRIPT_PAYLOADS_COLLECTION).count_documents(
+            {}
+        )
+        == n_payloads
+    )
+    assert payload is not None
+    whole_chromosome = GenomicRegion(chromosome="1", start=1, end=250_000_000)
+    assert gzip.decompress(payload) == index.query(
+        transcripts_db, whole_chromosome, GenomeBuild(38), only_canonical
+    )
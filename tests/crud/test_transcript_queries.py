@@ -0,0 +1,106 @@
+"""Test transcript CRUD functions."""
+
+import mongomock
+import pytest
+
+from gens.crud.locks import database_lock
+from gens.crud.transcripts import (
+    create_transcripts,
+    get_transcripts,
+    replace_transcripts,
+)
+from gens.db.collections import (
+    LOCKS_COLLECTION,
+    TRANSCRIPTS_COLLECTION,
+    TRANSCRIPTS_STAGING_COLLECTION,
+)
+from gens.exceptions import DatabaseLockError
+from gens.models.annotation import TranscriptRecord
+from gens.models.genomic import GenomeBuild, GenomicRegion
+
+
+def _transcript(name: str, chrom: str, start: int, end: int) -> TranscriptRecord:
+    return TranscriptRecord.model_validate(
+        {
+            "transcript_id": name,
+            "transcript_biotype": "protein_coding",
+            "gene_name": name,
+            "mane": None,
+            "hgnc_id": None,
+            "refseq_id": None,
+            "features": [],
+            "chrom": chrom,
+            "start": start,
+            "end": end,
+            "strand": "+",
+            "genome_build": 38,
+        }
+    )
+
+
+def test_get_transcripts_in_region(db: mongomock.Database):
+    create_transcripts(
+        [
+            _transcript("inside", "1", 1_000_100, 1_000_200),
+            _transcript("over_start", "1", 900_000, 1_000_010),
+            _transcript("over_end", "1", 1_000_900, 1_300_000),
+            _transcript("spanning", "1", 10_000, 80_000_000),
+            _transcript("before", "1", 100, 200),
+            _transcript("after", "1", 1_001_001, 1_002_000),
+            _transcript("other_chrom", "2", 1_000_100, 1_000_200),
+        ],
+        db,
+    )
+
+    transcripts = get_transcripts(
+        GenomicRegion(chromosome="1", start=1_000_000, end=1_001_000),
+        GenomeBuild(38),
+        db,
+    )
+
+    assert [tr.name for tr in transcripts] == [
+        "spanning",
+        "over_start",
+        "inside",
+        "over_end",
+    ]
+
+
+def test_replace_transcripts_keeps_other_genome_builds(db: mongomock.Database):
+    create_transcripts([_transcript("old", "1", 100, 200)], db)
+    grch37 = _transcript("grch37", "1", 100, 200).model_dump()
+    grch37["genome_build"] = 37
+    db.get_collection(TRANSCRIPTS_COLLECTION).insert_one(grch37)
+
+    n_inserted = replace_transcripts(
+        [_transcript("new", "1", 300, 400), _transcript("new2", "2", 1, 10)],
+        db,
+        GenomeBuild(38),
+    )
+
+    transcripts = db.get_collection(TRANSCRIPTS_COLLECTION)
+    assert n_inserted == 2
+    assert sorted(doc["gene_name"] for doc in transcripts.find()) == [
+        "grch37",
+        "new",
+        "new2",
+    ]
+    assert transcripts.find_one({"gene_name": "grch37"})["_id"] == grch37["_id"]
+    assert TRANSCRIPTS_STAGING_COLLECTION not in db.list_collection_names()
+    assert "genome_region" in transcripts.index_information()
+
+
+def test_replace_transcripts_fails_while_transcripts_are_loaded(
+    db: mongomock.Database,
+):
+    create_transcripts([_transcript("old", "1", 100, 200)], db)
+
+    with database_lock(db, TRANSCRIPTS_COLLECTION):
+        with pytest.raises(DatabaseLockError):
+            replace_transcripts(
+                [_transcript("new", "1", 300, 400)], db, GenomeBuild(38)
+            )
+
+    transcripts = db.get_collection(TRANSCRIPTS_COLLECTION)
+    assert [doc["gene_name"] for doc in transcripts.find()] == ["old"]
+    assert db.get_collection(LOCKS_COLLECTION).count_documents({}) == 0
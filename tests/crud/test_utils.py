@@ -0,0 +1,34 @@
+"""Test shared query helpers."""
+
+import pytest
+
+from gens.crud.utils import overlapping_bins, region_to_bin
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        (1, 1000, 585),  # smallest 128 kb bin
+        (131071, 131072, 73),  # crosses 128 kb boundary -> 1 Mb bin
+        (1, 2**26, 0),  # larger than 64 Mb -> top level bin
+    ],
+)
+def test_region_to_bin(start: int, end: int, expected: int):
+    assert region_to_bin(start, end) == expected
+
+
+@pytest.mark.parametrize(
+    "feature, region",
+    [
+        ((100, 200), (150, 160)),
+        ((100_000, 300_000), (250_000, 251_000)),
+        ((1, 50_000_000), (49_000_000, 49_500_000)),
+        ((5_000_000, 5_000_010), (1, 10_000_000)),
+    ],
+)
+def test_overlapping_bins_include_bin_of_overlapping_feature(feature, region):
+    assert region_to_bin(*feature) in overlapping_bins(*region)
+
+
+def test_overlapping_bins_exclude_distant_features():
+    assert region_to_bin(10_000_000, 10_001_000) not in overlapping_bins(1, 1000)
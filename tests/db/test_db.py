@@ -0,0 +1,135 @@
+import asyncio
+from typing import Any
+
+import mongomock
+import pytest
+
+from gens.config import MongoDbConfig, settings
+from gens.db.db import (
+    GENS_DB_NAME,
+    MongoClientRegistry,
+    PoolUsageListener,
+    get_gens_db,
+    mongo_clients,
+)
+
+
+@pytest.fixture()
+def created_clients(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    """Replace MongoClient with mongomock and record the options of new clients."""
+    created: list[dict[str, Any]] = []
+
+    def _mongo_client(*args, **kwargs):
+        created.append(kwargs)
+        kwargs.pop("event_listeners")
+        return mongomock.MongoClient(*args, **kwargs)
+
+    monkeypatch.setattr("gens.db.db.MongoClient", _mongo_client)
+    return created
+
+
+def test_get_gens_db_reuses_client(created_clients: list[dict[str, Any]]):
+    first = get_gens_db()
+    second = get_gens_db()
+
+    assert first.client is second.client
+    assert len(created_clients) == 1
+
+
+def test_registry_applies_pool_config(created_clients: list[dict[str, Any]]):
+    config = MongoDbConfig(
+        connection="mongodb://localhost:27017/gens",
+        max_pool_size=5,
+        wait_queue_timeout_ms=1000,
+    )
+    registry = MongoClientRegistry()
+
+    registry.get_database("gens", config)
+
+    assert created_clients[0]["maxPoolSize"] == 5
+    assert created_clients[0]["waitQueueTimeoutMS"] == 1000
+    assert registry.stats()["gens"].max_pool_size == 5
+
+
+def test_registry_reconnects_when_config_changes(
+    created_clients: list[dict[str, Any]],
+):
+    registry = MongoClientRegistry()
+    config = MongoDbConfig(connection="mongodb://localhost:27017/gens")
+
+    first = registry.get_client("gens", config)
+    second = registry.get_client(
+        "gens", config.model_copy(update={"max_pool_size": 10})
+    )
+
+    assert first is not second
+    assert len(created_clients) == 2
+
+
+def test_pool_usage_listener_tracks_connections():
+    listener = PoolUsageListener(max_pool_size=10)
+
+    for _ in range(3):
+        listener.connection_created(None)
+        listener.connection_check_out_started(None)
+    listener.connection_checked_out(None)
+    listener.connection_checked_out(None)
+    listener.connection_check_out_failed(None)
+    listener.connection_checked_in(None)
+    listener.connection_closed(None)
+
+    stats = listener.stats
+    assert stats.open_connections == 2
+    assert stats.checked_out == 1
+    assert stats.waiting == 0
+    assert stats.checkout_failures == 1
+
+
+def test_health_route(api_client, created_clients: list[dict[str, Any]]):
+    resp = api_client.get("/api/health")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "ok"
+    assert data["databases"][0]["name"] == "gens"
+    assert data["databases"][0]["ok"] is True
+
+
+def test_health_route_with_async_client(
+    api_client, created_clients: list[dict[str, Any]]
+):
+    mongo_clients.get_async_client(GENS_DB_NAME, settings.gens_db)
+
+    resp = api_client.get("/api/health")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "ok"
+    databases = {database["name"]: database for database in data["databases"]}
+    assert databases["gens-async"]["ok"] is True
+
+
+def test_registry_closes_replaced_async_clients(monkeypatch: pytest.MonkeyPatch):
+    closed: list[Any] = []
+
+    class FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def close(self) -> None:
+            closed.append(self)
+
+    monkeypatch.setattr("gens.db.db.AsyncMongoClient", FakeAsyncClient)
+    registry = MongoClientRegistry()
+    config = MongoDbConfig(connection="mongodb://localhost:27017/gens")
+
+    first = registry.get_async_client("gens", config)
+    second = registry.get_async_client(
+        "gens", config.model_copy(update={"max_pool_size": 10})
+    )
+    registry.close()
+    third = registry.get_async_client("gens", config)
+    asyncio.run(registry.aclose())
+
+    assert len({id(first), id(second), id(third)}) == 3
+    assert closed == [third, first, second]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from gens.io import CoverageArrays, downsample_coverage
+from gens.models.sample import ZoomLevel
+
+
+def make_coverage(position, value) -> CoverageArrays:
+    return CoverageArrays(
+        region="1",
+        zoom=ZoomLevel.D,
+        position=np.asarray(position, dtype=np.int64),
+        value=np.asarray(value, dtype=np.float64),
+    )
+
+
+def test_downsample_keeps_small_regions_untouched():
+    coverage = make_coverage([1, 2, 3], [0.1, 0.2, 0.3])
+
+    assert downsample_coverage(coverage, max_points=8) is coverage
+
+
+def test_downsample_keeps_extremes_of_each_bin():
+    rng = np.random.default_rng(1)
+    position = np.arange(0, 100_000, 10)
+    value = rng.normal(size=position.size)
+    value[5_000] = 25.0  # single point peak
+    value[7_777] = -25.0  # single point dip
+    coverage = make_coverage(position, value)
+
+    result = downsample_coverage(coverage, max_points=400, start=0, end=100_000)
+
+    assert result.region == "1"
+    assert result.zoom == ZoomLevel.D
+    assert result.position.size <= 400
+    assert np.all(np.diff(result.position) > 0)
+    assert 25.0 in result.value
+    assert -25.0 in result.value
+
+    # every bin has its first, last, min and max point
+    bins = position * 100 // 100_000
+    for bin_idx in (0, 42, 99):
+        in_bin = bins == bin_idx
+        bin_pos = position[in_bin]
+        bin_val = value[in_bin]
+        kept = set(result.position.tolist())
+        assert {
+            bin_pos[0],
+            bin_pos[-1],
+            bin_pos[bin_val.argmin()],
+            bin_pos[bin_val.argmax()],
+        } <= kept
+
+
+def test_downsample_requires_room_for_one_bin():
+    with pytest.raises(ValueError):
+        downsample_coverage(make_coverage([1], [1.0]), max_points=3)
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tests.conftest import write_tabix_file
+
+import gens.io
+from gens.io import (
+    get_overview,
+    get_overview_cache_path,
+    read_overview_cache,
+    read_overview_from_tabix,
+    tabix_pool,
+    write_overview_cache,
+)
+from gens.models.sample import SampleFiles, ScatterDataType, ZoomLevel
+
+
+def test_overview_cache_round_trip(coverage_file_path: Path):
+    expected = read_overview_from_tabix(coverage_file_path)
+
+    write_overview_cache(coverage_file_path)
+    result = read_overview_cache(coverage_file_path)
+
+    cache_path = get_overview_cache_path(coverage_file_path)
+    assert cache_path.is_file()
+    assert cache_path.stat().st_mode == coverage_file_path.stat().st_mode
+    assert result is not None
+    assert [cov.region for cov in result] == ["1", "2"]
+    assert all(cov.zoom == ZoomLevel.overview for cov in result)
+    for cached, from_tabix in zip(result, expected):
+        np.testing.assert_array_equal(cached.position, from_tabix.position)
+        np.testing.assert_array_equal(cached.value, from_tabix.value)
+
+
+def test_overview_cache_is_outdated_when_file_changes(coverage_file_path: Path):
+    write_overview_cache(coverage_file_path)
+
+    write_tabix_file(
+        coverage_file_path.with_suffix(""), [("o_1", 10, 11, 1.0), ("o_2", 10, 11, 2.0)]
+    )
+    tabix_pool.invalidate()
+
+    assert read_overview_cache(coverage_file_path) is None
+
+
+def test_get_overview_uses_cache(
+    coverage_file_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    sample = SampleFiles(baf_file=coverage_file_path, coverage_file=coverage_file_path)
+    expected = get_overview(sample, ScatterDataType.COV)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("tabix should not be read")
+
+    monkeypatch.setattr(gens.io, "read_overview_from_tabix", _fail)
+
+    assert get_overview(sample, ScatterDataType.COV) == expected
+
+
+def test_get_overview_without_write_access(
+    coverage_file_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    def _read_only(*_args, **_kwargs):
+        raise PermissionError("read-only")
+
+    n_reads = 0
+    read_overview = gens.io.read_overview_from_tabix
+
+    def _count_reads(sample_file):
+        nonlocal n_reads
+        n_reads += 1
+        return read_overview(sample_file)
+
+    monkeypatch.setattr(os, "replace", _read_only)
+    monkeypatch.setattr(gens.io, "read_overview_from_tabix", _count_reads)
+    sample = SampleFiles(baf_file=coverage_file_path, coverage_file=coverage_file_path)
+
+    result = get_overview(sample, ScatterDataType.BAF)
+
+    assert [cov.region for cov in result] == ["1", "2"]
+    assert n_reads == 1
+    assert not get_overview_cache_path(coverage_file_path).exists()
+    assert list(coverage_file_path.parent.glob("*.tmp")) == []
+
+
+def test_concurrent_overview_cache_writes(coverage_file_path: Path):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write_overview_cache, [coverage_file_path] * 8))
+
+    result = read_overview_cache(coverage_file_path)
+    assert result is not None
+    assert [cov.region for cov in result] == ["1", "2"]
+    assert list(coverage_file_path.parent.glob("*.tmp")) == []
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from gens.io import encode_binary_coverage, parse_tabix_records
+from gens.models.sample import ZoomLevel
+
+
+def test_parse_tabix_records():
+    records = ["c_X\t10\t11\t0.1", "c_X\t20\t30\t-1.25", "c_X\t40\t41\t1e-3"]
+
+    result = parse_tabix_records(records)
+
+    assert result.region == "X"
+    assert result.zoom == ZoomLevel.C
+    # midpoints are rounded half to even like the builtin round
+    assert result.position.tolist() == [round(21 / 2), 25, round(81 / 2)]
+    assert result.value.tolist() == [0.1, -1.25, 0.001]
+
+
+def test_parse_tabix_records_matches_line_by_line_parsing():
+    rng = np.random.default_rng(1)
+    starts = np.sort(rng.integers(1, 250_000_000, size=500))
+    records = [
+        f"d_1\t{start}\t{start + length}\t{value}"
+        for start, length, value in zip(
+            starts, rng.integers(1, 1000, size=500), rng.normal(size=500)
+        )
+    ]
+
+    result = parse_tabix_records(records)
+
+    expected_pos = []
+    expected_val = []
+    for record in records:
+        _, start, end, value = record.split("\t")
+        expected_pos.append(round((int(start) + int(end)) / 2))
+        expected_val.append(float(value))
+    assert result.position.tolist() == expected_pos
+    assert result.value.tolist() == expected_val
+
+
+def test_parse_tabix_records_empty():
+    result = parse_tabix_records(iter([]))
+
+    assert result.region is None
+    assert result.zoom is None
+    assert result.position.size == 0
+    assert result.to_model().position == []
+
+
+def test_parse_tabix_records_malformed():
+    with pytest.raises(ValueError):
+        parse_tabix_records(["a_1\t10\t11\t0.1", "a_1\t20\t21\tNA value"])
+
+
+def test_encode_binary_coverage_empty_region():
+    payload = encode_binary_coverage(parse_tabix_records([]))
+
+    assert len(payload) == 12
+    assert payload[:4] == b"GCOV"
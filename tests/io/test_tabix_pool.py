@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+import pytest
+from tests.conftest import write_tabix_file
+
+from gens.io import TabixFilePool
+
+
+def test_pool_reuses_open_handles(coverage_file_path: Path):
+    pool = TabixFilePool(max_size=2)
+
+    with pool.open(coverage_file_path) as tbx:
+        first_handle = tbx
+        records = list(tbx.fetch("a_1", 0, 50))
+    with pool.open(coverage_file_path) as tbx:
+        assert tbx is first_handle
+
+    assert len(records) == 4
+    stats = pool.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_pool_evicts_least_recently_used(tmp_path: Path):
+    pool = TabixFilePool(max_size=2)
+    paths = [
+        write_tabix_file(tmp_path / f"s{i}.bed", [("a_1", 1, 2, 0.1)]) for i in range(3)
+    ]
+
+    for path in [paths[0], paths[1], paths[0], paths[2]]:
+        with pool.open(path):
+            pass
+
+    stats = pool.stats
+    assert stats.evictions == 1
+    assert stats.size == 2
+    # the second file was least recently used and should have been closed
+    with pool.open(paths[1]):
+        pass
+    assert pool.stats.misses == 4
+
+
+def test_pool_reopens_rewritten_file(coverage_file_path: Path):
+    pool = TabixFilePool(max_size=4)
+    with pool.open(coverage_file_path) as tbx:
+        assert len(list(tbx.fetch("a_1"))) == 10
+
+    write_tabix_file(
+        coverage_file_path.with_suffix(""), [("a_1", 1, 2, 0.5), ("a_1", 3, 4, 0.5)]
+    )
+    # make sure the mtime differs even on coarse grained file systems
+    stat = coverage_file_path.stat()
+    os.utime(coverage_file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with pool.open(coverage_file_path) as tbx:
+        assert len(list(tbx.fetch("a_1"))) == 2
+
+    stats = pool.stats
+    assert stats.misses == 2
+    assert stats.invalidations == 1
+    assert stats.size == 1
+
+
+def test_pool_invalidate_closes_handles(coverage_file_path: Path):
+    pool = TabixFilePool(max_size=4)
+    with pool.open(coverage_file_path):
+        pass
+
+    assert pool.invalidate(coverage_file_path) == 1
+    assert pool.stats.size == 0
+
+
+def test_pool_requires_positive_size():
+    with pytest.raises(ValueError):
+        TabixFilePool(max_size=0)
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+
+from gens.load.annotations import (
+    ParserError,
+    fmt_bed_to_document,
+    parse_bed_file,
+)
+
+
+def test_fmt_bed_to_document_reads_standard_bed(standard_bed_file_path: Path):
+    track_id = ObjectId()
+    records = list(parse_bed_file(standard_bed_file_path))
+
+    docs = [fmt_bed_to_document(rec, track_id, 38) for rec in records]
+
+    assert len(docs) == len(records)
+    assert docs[0]["chrom"] == "1"
+    assert docs[0]["start"] == 809861
+    assert docs[0]["end"] == 1565798
+    # itemRgb is a comma separated RGB value
+    assert docs[0]["color"] == (0, 0, 255)
+
+
+def _bed_entry(**columns: str) -> dict[str, str]:
+    entry = {
+        "chrom": "chr1",
+        "chrom_start": "99",
+        "chrom_end": "200",
+        "name": "annot",
+        "score": "500",
+        "strand": "+",
+        "thick_start": "99",
+    }
+    entry.update(columns)
+    return entry
+
+
+@pytest.mark.parametrize(
+    "entry, name, color",
+    [
+        # score and strand placeholders
+        (_bed_entry(score=".", strand="."), "annot", (128, 128, 128)),
+        # a missing name
+        (_bed_entry(name="."), "The Nameless One", (128, 128, 128)),
+        # no thickEnd and itemRgb columns
+        (_bed_entry(), "annot", (128, 128, 128)),
+        (_bed_entry(thick_end="200", item_rgb="0"), "annot", (128, 128, 128)),
+        (_bed_entry(thick_end="200", item_rgb="."), "annot", (128, 128, 128)),
+        (_bed_entry(thick_end="200", item_rgb="255,0,0"), "annot", (255, 0, 0)),
+        (_bed_entry(thick_end="200", item_rgb="rgb(0,128,0)"), "annot", (0, 128, 0)),
+        (_bed_entry(thick_end="200", item_rgb="#0000ff"), "annot", (0, 0, 255)),
+        (_bed_entry(thick_end="200", item_rgb="red"), "annot", (255, 0, 0)),
+    ],
+)
+def test_fmt_bed_to_document(
+    entry: dict[str, str], name: str, color: tuple[int, int, int]
+):
+    track_id = ObjectId()
+
+    doc = fmt_bed_to_document(entry, track_id, 38)
+
+    assert doc == {
+        "start": 100,
+        "end": 200,
+        "track_id": track_id,
+        "name": name,
+        "description": None,
+        "genome_build": 38,
+        "chrom": "1",
+        "color": color,
+        "comments": [],
+        "references": [],
+        "metadata": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "chrom, start, error",
+    [("1", "a", ParserError), ("chr1", ".", ParserError), ("25", "10", ValueError)],
+)
+def test_fmt_bed_to_document_validates_core_fields(
+    chrom: str, start: str, error: type[Exception]
+):
+    entry = {
+        "chrom": chrom,
+        "chrom_start": start,
+        "chrom_end": "100",
+        "name": "annot",
+        "score": ".",
+        "strand": "+",
+        "thick_start": ".",
+    }
+
+    with pytest.raises(error):
+        fmt_bed_to_document(entry, ObjectId(), 38)
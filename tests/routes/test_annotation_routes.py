@@ -0,0 +1,204 @@
+import mongomock
+from bson import ObjectId
+
+from gens.crud.annotations import create_annotations_for_track, register_data_update
+from gens.crud.transcript_index import create_transcript_payloads, transcript_index
+from gens.crud.transcripts import create_transcripts
+from gens.db.collections import CHROMSIZES_COLLECTION, TRANSCRIPTS_COLLECTION
+from gens.models.annotation import AnnotationRecord, TranscriptRecord
+from gens.models.genomic import GenomeBuild
+
+CHROMOSOMES_URL = "/api/tracks/chromosomes/"
+
+
+def test_tracks_without_updates_have_no_etag(api_client):
+    resp = api_client.get(CHROMOSOMES_URL, params={"genome_build": 38})
+
+    assert resp.status_code == 200
+    assert "etag" not in resp.headers
+
+
+def test_track_conditional_request(api_client, db: mongomock.Database):
+    register_data_update(db, CHROMSIZES_COLLECTION)
+
+    resp = api_client.get(CHROMOSOMES_URL, params={"genome_build": 38})
+    etag = resp.headers["etag"]
+    not_modified = api_client.get(
+        CHROMOSOMES_URL, params={"genome_build": 38}, headers={"If-None-Match": etag}
+    )
+
+    assert resp.headers["cache-control"].endswith("no-cache")
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    # updating other tracks does not change the etag
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
+    unrelated = api_client.get(
+        CHROMOSOMES_URL, params={"genome_build": 38}, headers={"If-None-Match": etag}
+    )
+    assert unrelated.status_code == 304
+
+    register_data_update(db, CHROMSIZES_COLLECTION)
+    updated = api_client.get(
+        CHROMOSOMES_URL, params={"genome_build": 38}, headers={"If-None-Match": etag}
+    )
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != etag
+
+
+def test_annotation_track_region(api_client, db: mongomock.Database):
+    track_id = ObjectId()
+    positions = [("1", 100, 200), ("1", 150_000, 400_000), ("1", 9_000_000, 9_000_100)]
+    positions.append(("2", 100, 200))
+    create_annotations_for_track(
+        [
+            AnnotationRecord(
+                track_id=track_id,
+                name=f"annot{idx}",
+                genome_build=38,
+                chrom=chrom,
+                start=start,
+                end=end,
+            )
+            for idx, (chrom, start, end) in enumerate(positions)
+        ],
+        db,
+    )
+    url = f"/api/tracks/annotations/track/{track_id}"
+
+    whole_track = api_client.get(url)
+    chromosome = api_client.get(url, params={"chromosome": "1"})
+    region = api_client.get(
+        url, params={"chromosome": "1", "start": 180, "end": 200_000}
+    )
+
+    assert len(whole_track.json()) == 4
+    assert len(chromosome.json()) == 3
+    assert [annot["name"] for annot in region.json()] == ["annot0", "annot1"]
+    assert api_client.get(url, params={"start": 1}).status_code == 422
+
+
+def test_transcripts_served_with_etag(api_client, db: mongomock.Database):
+    create_transcripts(
+        [
+            TranscriptRecord.model_validate(
+                {
+                    "transcript_id": "t1",
+                    "transcript_biotype": "protein_coding",
+                    "gene_name": "GENE1",
+                    "mane": "MANE Select",
+                    "hgnc_id": None,
+                    "refseq_id": None,
+                    "features": [],
+                    "chrom": "1",
+                    "start": 100,
+                    "end": 200,
+                    "strand": "+",
+                    "genome_build": 38,
+                }
+            )
+        ],
+        db,
+    )
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
+    params = {"chromosome": "1", "genome_build": 38, "start": 1, "end": 1000}
+
+    resp = api_client.get("/api/tracks/transcripts", params=params)
+    not_modified = api_client.get(
+        "/api/tracks/transcripts",
+        params=params,
+        headers={"If-None-Match": resp.headers["etag"]},
+    )
+
+    assert resp.headers["content-type"] == "application/json"
+    assert [(tr["name"], tr["type"]) for tr in resp.json()] == [
+        ("GENE1", "MANE Select")
+    ]
+    assert not_modified.status_code == 304
+
+
+def test_transcript_etag_follows_loaded_transcripts(api_client, db: mongomock.Database):
+    def _transcript(name: str) -> TranscriptRecord:
+        return TranscriptRecord.model_validate(
+            {
+                "transcript_id": name,
+                "transcript_biotype": "protein_coding",
+                "gene_name": name,
+                "mane": None,
+                "hgnc_id": None,
+                "refseq_id": None,
+                "features": [],
+                "chrom": "1",
+                "start": 100,
+                "end": 200,
+                "strand": "+",
+                "genome_build": 38,
+            }
+        )
+
+    create_transcripts([_transcript("OLD")], db)
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
+    params = {"chromosome": "1", "genome_build": 38, "start": 1, "end": 1000}
+    resp = api_client.get("/api/tracks/transcripts", params=params)
+
+    # until the index is reloaded the old transcripts are served with the old etag
+    create_transcripts([_transcript("NEW")], db)
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
+    stale = api_client.get("/api/tracks/transcripts", params=params)
+    assert [tr["name"] for tr in stale.json()] == ["OLD"]
+    assert stale.headers["etag"] == resp.headers["etag"]
+
+    transcript_index.load(db, GenomeBuild(38))
+    reloaded = api_client.get(
+        "/api/tracks/transcripts",
+        params=params,
+        headers={"If-None-Match": resp.headers["etag"]},
+    )
+    assert reloaded.status_code == 200
+    assert sorted(tr["name"] for tr in reloaded.json()) == ["NEW", "OLD"]
+    assert reloaded.headers["etag"] != resp.headers["etag"]
+
+
+def test_whole_chromosome_transcripts_served_gzipped(
+    api_client, db: mongomock.Database
+):
+    create_transcripts(
+        [
+            TranscriptRecord.model_validate(
+                {
+                    "transcript_id": "t1",
+                    "transcript_biotype": "protein_coding",
+                    "gene_name": "GENE1",
+                    "mane": None,
+                    "hgnc_id": None,
+                    "refseq_id": None,
+                    "features": [],
+                    "chrom": "1",
+                    "start": 100,
+                    "end": 200,
+                    "strand": "+",
+                    "genome_build": 38,
+                }
+            )
+        ],
+        db,
+    )
+    create_transcript_payloads(db, 38)
+    register_data_update(db, TRANSCRIPTS_COLLECTION)
+    params = {"chromosome": "1", "genome_build": 38}
+
+    gzipped = api_client.get(
+        "/api/tracks/transcripts", params=params, headers={"Accept-Encoding": "gzip"}
+    )
+    plain = api_client.get(
+        "/api/tracks/transcripts",
+        params=params,
+        headers={"Accept-Encoding": "identity"},
+    )
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert gzipped.json() == plain.json()
+    assert [tr["name"] for tr in plain.json()] == ["GENE1"]
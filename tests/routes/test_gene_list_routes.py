@@ -0,0 +1,71 @@
+import mongomock
+import pytest
+
+from gens.adapters.scout import ScoutMongoAdapter
+from gens.crud.transcripts import create_transcripts
+from gens.db.db import get_variant_software_adapter
+from gens.models.annotation import TranscriptRecord
+
+
+@pytest.fixture()
+def panel_client(api_client, db: mongomock.Database):
+    scout_db = mongomock.MongoClient().get_database("scout")
+    scout_db.get_collection("gene_panel").insert_one(
+        {
+            "panel_name": "OMIM",
+            "display_name": "OMIM",
+            "version": 1.0,
+            "genes": [{"hgnc_symbol": "BRCA1"}, {"hgnc_symbol": "TP53"}],
+        }
+    )
+    create_transcripts(
+        [
+            TranscriptRecord.model_validate(
+                {
+                    "transcript_id": transcript_id,
+                    "transcript_biotype": "protein_coding",
+                    "gene_name": gene_name,
+                    "mane": mane,
+                    "hgnc_id": None,
+                    "refseq_id": None,
+                    "features": [],
+                    "chrom": chrom,
+                    "start": start,
+                    "end": start + 100,
+                    "strand": "+",
+                    "genome_build": 38,
+                }
+            )
+            for transcript_id, gene_name, mane, chrom, start in [
+                ("t1", "BRCA1", "MANE Select", "17", 500),
+                ("t2", "BRCA1", None, "17", 400),
+                ("t3", "TP53", "MANE Select", "17", 100),
+                ("t4", "BRCA2", "MANE Select", "13", 100),
+            ]
+        ],
+        db,
+    )
+    api_client.app.dependency_overrides[get_variant_software_adapter] = (
+        lambda: ScoutMongoAdapter(scout_db)
+    )
+    return api_client
+
+
+def test_gene_list_transcripts(panel_client):
+    url = "/api/gene_lists/track/OMIM/transcripts"
+
+    resp = panel_client.get(url, params={"genome_build": 38, "chromosome": "17"})
+
+    assert resp.status_code == 200
+    assert [(tr["name"], tr["chrom"], tr["start"]) for tr in resp.json()] == [
+        ("TP53", "17", 100),
+        ("BRCA1", "17", 500),
+    ]
+
+    resp = panel_client.get(url, params={"genome_build": 38, "only_canonical": False})
+    assert [tr["start"] for tr in resp.json()] == [100, 400, 500]
+
+    resp = panel_client.get(
+        "/api/gene_lists/track/missing/transcripts", params={"genome_build": 38}
+    )
+    assert resp.json() == []
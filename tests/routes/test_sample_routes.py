@@ -0,0 +1,246 @@
+import struct
+import threading
+from pathlib import Path
+
+import mongomock
+import pytest
+from tests.conftest import write_tabix_file
+
+import gens.routes.sample as sample_routes
+import gens.routes.utils as route_utils
+from gens.crud.samples import update_sample
+from gens.models.genomic import GenomeBuild
+from gens.models.sample import SampleInfo
+
+COVERAGE_PARAMS = {
+    "sample_id": "sample1",
+    "case_id": "caseA",
+    "genome_build": 38,
+    "chromosome": "1",
+    "zoom_level": "a",
+    "start": 1,
+    "end": 100,
+}
+
+
+@pytest.fixture(autouse=True)
+def load_sample(db: mongomock.Database, coverage_file_path: Path) -> None:
+    update_sample(
+        db,
+        SampleInfo(
+            sample_id="sample1",
+            case_id="caseA",
+            genome_build=GenomeBuild(38),
+            baf_file=coverage_file_path,
+            coverage_file=coverage_file_path,
+        ),
+    )
+
+
+def test_get_coverage_as_json(api_client):
+    resp = api_client.get("/api/samples/sample/coverage", params=COVERAGE_PARAMS)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["region"] == "1"
+    assert data["zoom"] == "a"
+    assert data["position"][:2] == [10, 20]
+    assert data["value"][:2] == [0.1, 0.2]
+
+
+def test_get_coverage_as_binary(api_client):
+    json_data = api_client.get(
+        "/api/samples/sample/coverage", params=COVERAGE_PARAMS
+    ).json()
+    resp = api_client.get(
+        "/api/samples/sample/coverage",
+        params=COVERAGE_PARAMS,
+        headers={"Accept": "application/octet-stream"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/octet-stream"
+    payload = resp.content
+    magic, version, zoom, region_len, n_points = struct.unpack_from("<4sBBHI", payload)
+    assert (magic, version, chr(zoom), n_points) == (
+        b"GCOV",
+        1,
+        "a",
+        len(json_data["position"]),
+    )
+    offset = 12 + region_len + (-region_len % 4)
+    assert payload[12 : 12 + region_len].decode() == "1"
+
+    positions = struct.unpack_from(f"<{n_points}i", payload, offset)
+    values = struct.unpack_from(f"<{n_points}f", payload, offset + 4 * n_points)
+    assert list(positions) == json_data["position"]
+    assert list(values) == pytest.approx(json_data["value"])
+
+
+def test_get_coverage_downsampled(api_client):
+    resp = api_client.get(
+        "/api/samples/sample/coverage", params={**COVERAGE_PARAMS, "max_points": 4}
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    # first, last, min and max of a single bin
+    assert data["position"] == [10, 90]
+    assert data["value"] == [0.1, 0.9]
+
+
+def test_get_coverage_invalid_max_points(api_client):
+    resp = api_client.get(
+        "/api/samples/sample/coverage", params={**COVERAGE_PARAMS, "max_points": 2}
+    )
+
+    assert resp.status_code == 422
+
+
+def test_get_coverage_batch(api_client, db: mongomock.Database, tmp_path: Path):
+    baf_file = write_tabix_file(
+        tmp_path / "sample2.baf.bed", [("a_1", 10, 11, 0.5), ("a_1", 20, 21, 0.25)]
+    )
+    update_sample(
+        db,
+        SampleInfo(
+            sample_id="sample2",
+            case_id="caseA",
+            genome_build=GenomeBuild(38),
+            baf_file=baf_file,
+            coverage_file=baf_file,
+        ),
+    )
+    params = {
+        key: value
+        for key, value in COVERAGE_PARAMS.items()
+        if key not in ("sample_id", "data_type")
+    }
+
+    resp = api_client.get(
+        "/api/samples/batch",
+        params={**params, "sample_id": ["sample1", "sample2"], "data_type": ["baf"]},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [(entry["sample_id"], entry["data_type"]) for entry in data] == [
+        ("sample1", "baf"),
+        ("sample2", "baf"),
+    ]
+    single = api_client.get("/api/samples/sample/baf", params=COVERAGE_PARAMS).json()
+    assert data[0]["data"] == single
+    assert data[1]["data"]["value"] == [0.5, 0.25]
+
+
+def test_get_coverage_batch_rejects_duplicate_samples(api_client):
+    params = {**COVERAGE_PARAMS, "sample_id": ["sample1", "sample1"]}
+
+    resp = api_client.get("/api/samples/batch", params=params)
+
+    assert resp.status_code == 422
+    assert "sample1" in resp.json()["detail"]
+
+
+def test_get_coverage_batch_defaults_to_both_data_types(api_client):
+    params = {**COVERAGE_PARAMS, "sample_id": ["sample1"]}
+
+    resp = api_client.get("/api/samples/batch", params=params)
+
+    assert resp.status_code == 200
+    assert [entry["data_type"] for entry in resp.json()] == ["coverage", "baf"]
+
+
+def test_coverage_is_read_outside_event_loop(
+    api_client, monkeypatch: pytest.MonkeyPatch
+):
+    read_scatter_data = sample_routes.read_scatter_data
+    thread_names = []
+
+    def _read_scatter_data(*args, **kwargs):
+        thread_names.append(threading.current_thread().name)
+        return read_scatter_data(*args, **kwargs)
+
+    monkeypatch.setattr(sample_routes, "read_scatter_data", _read_scatter_data)
+
+    resp = api_client.get("/api/samples/sample/coverage", params=COVERAGE_PARAMS)
+
+    assert resp.status_code == 200
+    assert len(thread_names) == 1
+    assert thread_names[0].startswith("tabix")
+
+
+def test_sample_files_are_checked_outside_event_loop(
+    api_client, coverage_file_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    is_file = Path.is_file
+    file_signature = route_utils.file_signature
+    thread_names = []
+
+    def _is_file(path: Path) -> bool:
+        if path == coverage_file_path:
+            thread_names.append(threading.current_thread().name)
+        return is_file(path)
+
+    def _file_signature(path: Path):
+        thread_names.append(threading.current_thread().name)
+        return file_signature(path)
+
+    monkeypatch.setattr(Path, "is_file", _is_file)
+    monkeypatch.setattr(route_utils, "file_signature", _file_signature)
+
+    resp = api_client.get("/api/samples/sample/coverage", params=COVERAGE_PARAMS)
+
+    assert resp.status_code == 200
+    # both files of the sample are checked, and the read file is signed
+    assert len(thread_names) == 3
+    assert all(name.startswith("tabix") for name in thread_names)
+
+
+def test_coverage_conditional_request(api_client, coverage_file_path: Path):
+    resp = api_client.get("/api/samples/sample/coverage", params=COVERAGE_PARAMS)
+    etag = resp.headers["etag"]
+    binary_etag = api_client.get(
+        "/api/samples/sample/coverage",
+        params=COVERAGE_PARAMS,
+        headers={"Accept": "application/octet-stream"},
+    ).headers["etag"]
+
+    not_modified = api_client.get(
+        "/api/samples/sample/coverage",
+        params=COVERAGE_PARAMS,
+        headers={"If-None-Match": etag},
+    )
+
+    assert etag != binary_etag
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.headers["vary"] == "Accept"
+    assert "last-modified" in resp.headers
+
+    # rewriting the file gives a new etag
+    write_tabix_file(coverage_file_path.with_suffix(""), [("a_1", 10, 11, 2.0)])
+    changed = api_client.get(
+        "/api/samples/sample/coverage",
+        params=COVERAGE_PARAMS,
+        headers={"If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_overview_conditional_request(api_client):
+    params = {
+        key: COVERAGE_PARAMS[key] for key in ("sample_id", "case_id", "genome_build")
+    }
+    resp = api_client.get("/api/samples/sample/baf/overview", params=params)
+
+    not_modified = api_client.get(
+        "/api/samples/sample/baf/overview",
+        params=params,
+        headers={"If-Modified-Since": resp.headers["last-modified"]},
+    )
+
+    assert resp.status_code == 200
+    assert not_modified.status_code == 304
@@ -0,0 +1,44 @@
+import mongomock
+
+from gens.crud.transcripts import create_transcripts
+from gens.models.annotation import TranscriptRecord
+
+SUGGESTION_URL = "/api/search/assistant"
+
+
+def test_search_assistant_suggests_gene_prefix(api_client, db: mongomock.Database):
+    create_transcripts(
+        [
+            TranscriptRecord.model_validate(
+                {
+                    "transcript_id": transcript_id,
+                    "transcript_biotype": "protein_coding",
+                    "gene_name": gene_name,
+                    "mane": mane,
+                    "hgnc_id": None,
+                    "refseq_id": None,
+                    "features": [],
+                    "chrom": "1",
+                    "start": 100,
+                    "end": 200,
+                    "strand": "+",
+                    "genome_build": 38,
+                }
+            )
+            for transcript_id, gene_name, mane in [
+                ("t1", "BRCA1P1", None),
+                ("t2", "BRCA1", "MANE Select"),
+            ]
+        ],
+        db,
+    )
+
+    resp = api_client.get(SUGGESTION_URL, params={"q": "brca", "genome_build": 38})
+
+    assert resp.status_code == 200
+    result = resp.json()
+    assert [sugg["text"] for sugg in result["transcript_suggestion"]] == [
+        "BRCA1",
+        "BRCA1P1",
+    ]
+    assert result["annotation_suggestion"] == []
@@ -0,0 +1,96 @@
+import mongomock
+import pytest
+
+from gens.adapters.scout import ScoutMongoAdapter
+from gens.db.db import get_variant_software_adapter
+
+VARIANTS_URL = "/api/tracks/variants"
+DENSITY_URL = "/api/tracks/variants/density"
+
+
+@pytest.fixture()
+def scout_client(api_client):
+    scout_db = mongomock.MongoClient().get_database("scout")
+    scout_db.get_collection("variant").insert_many(
+        [
+            {
+                "_id": f"var{idx}",
+                "document_id": f"var{idx}",
+                "case_id": "case",
+                "category": "sv",
+                "chromosome": "1",
+                "position": position,
+                "end": position + 50,
+                "variant_type": "clinical",
+                "sub_category": sub_category,
+                "rank_score": rank_score,
+                "samples": [{"sample_id": "sample", "genotype_call": "0/1"}],
+            }
+            for idx, (position, sub_category, rank_score) in enumerate(
+                [
+                    (100, "del", 2),
+                    (150, "dup", 12),
+                    (950, "del", None),
+                    (1_050, "del", 20),
+                ]
+            )
+        ]
+    )
+    api_client.app.dependency_overrides[get_variant_software_adapter] = (
+        lambda: ScoutMongoAdapter(scout_db)
+    )
+    return api_client
+
+
+def test_variants_filtered_on_rank_score(scout_client):
+    params = {
+        "sample_id": "sample",
+        "case_id": "case",
+        "chromosome": "1",
+        "category": "sv",
+        "end": 1_000,
+        "rank_score_threshold": 10,
+    }
+
+    resp = scout_client.get(VARIANTS_URL, params=params)
+
+    assert resp.status_code == 200
+    assert [var["document_id"] for var in resp.json()] == ["var1", "var2"]
+
+
+def test_variant_density(scout_client):
+    params = {
+        "sample_id": "sample",
+        "case_id": "case",
+        "chromosome": "1",
+        "category": "sv",
+        "start": 1,
+        "end": 1_000,
+        "n_bins": 2,
+        "rank_score_bands": "10",
+    }
+
+    resp = scout_client.get(DENSITY_URL, params=params)
+
+    assert resp.status_code == 200
+    density = resp.json()
+    assert density["bin_size"] == 500
+    assert density["bin_starts"] == [1, 501]
+    assert density["counts"] == [2, 1]
+    assert density["rank_score_band_counts"] == [[1, 0], [1, 0]]
+    assert density["unscored_counts"] == [0, 1]
+    assert density["sub_category_counts"] == {"del": [1, 1], "dup": [1, 0]}
+
+
+def test_variant_density_rejects_invalid_bands(scout_client):
+    params = {
+        "sample_id": "sample",
+        "case_id": "case",
+        "chromosome": "1",
+        "end": 1_000,
+        "rank_score_bands": "high",
+    }
+
+    resp = scout_client.get(DENSITY_URL, params=params)
+
+    assert resp.status_code == 422
@@ -0,0 +1,45 @@
+from gens.cache import TtlCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    timer = FakeTimer()
+    cache: TtlCache[str, int] = TtlCache(max_size=2, ttl=10, timer=timer)
+    cache.set("a", 1)
+
+    timer.now = 5
+    assert cache.get("a") == 1
+    timer.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 0)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TtlCache[str, int] = TtlCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_cache_invalidate_where():
+    cache: TtlCache[tuple[str, int], int] = TtlCache(max_size=10)
+    cache.set(("a", 1), 1)
+    cache.set(("a", 2), 2)
+    cache.set(("b", 1), 3)
+
+    assert cache.invalidate_where(lambda key: key[0] == "a") == 2
+    assert cache.get(("b", 1)) == 3
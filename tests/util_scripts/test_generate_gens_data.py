@@ -1,12 +1,19 @@
 import gzip
 import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from utils.generate_gens_data import (
+    BGZF_EOF,
+    BafSubsample,
+    CovWindows,
+    StageTimes,
+    chunked,
     generate_baf_bed,
     generate_cov_bed,
     main,
     parse_gvcfvaf,
+    write_levels,
 )
 
 FIXTURES = Path(__file__).parent.parent / "data" / "generate_gens_data"
@@ -120,6 +127,46 @@ def test_generate_cov_bed_incomplete_window(tmp_path: Path):
     assert output.getvalue().splitlines() == []
 
 
+def test_levels_keep_state_between_chunks():
+    cov_records = [
+        ("1", start, start + 49, start / 1000) for start in range(1, 1000, 50)
+    ] + [("2", 1, 300, 0.5)]
+    baf_records = [("1", pos, pos / 100) for pos in range(1, 30)]
+
+    def _output(level, records, chunk_size):
+        return "".join(level.process(chunk) for chunk in chunked(records, chunk_size))
+
+    for chunk_size in (1, 3, 7):
+        assert _output(CovWindows(200, "x"), cov_records, chunk_size) == _output(
+            CovWindows(200, "x"), cov_records, len(cov_records)
+        )
+        assert _output(BafSubsample(4, "x"), baf_records, chunk_size) == _output(
+            BafSubsample(4, "x"), baf_records, len(baf_records)
+        )
+
+
+def test_write_levels_bgzf(tmp_path: Path):
+    records = [("1", pos, pos / 7) for pos in range(1, 100_000)]
+
+    def _write(out_path: Path, compress_pool):
+        levels = [BafSubsample(skip, prefix) for skip, prefix in [(10, "a"), (1, "b")]]
+        write_levels(
+            chunked(records, 1000), levels, out_path, compress_pool, StageTimes(), "BAF"
+        )
+
+    _write(tmp_path / "plain.bed", None)
+    with ThreadPoolExecutor(max_workers=2) as compress_pool:
+        _write(tmp_path / "bgzf.bed.gz", compress_pool)
+
+    plain = (tmp_path / "plain.bed").read_bytes()
+    bgzf = (tmp_path / "bgzf.bed.gz").read_bytes()
+    assert plain.startswith(b"a_1\t0\t1\t")
+    assert b"\nb_1\t0\t1\t" in plain
+    assert gzip.decompress(bgzf) == plain
+    assert bgzf.endswith(BGZF_EOF)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
 def test_parse_gvcfvaf(tmp_path: Path, capsys):
 
     gvcf_file = tmp_path / "sample.vcf.gz"
@@ -6,13 +6,22 @@ from __future__ import annotations
 import argparse
 import gzip
 import os
-import re
 import shutil
 import statistics
+import struct
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
 COV_WINDOW_SIZES = [100000, 25000, 5000, 1000, 100]
 BAF_SKIP_N = [160, 40, 10, 4, 1]
@@ -29,7 +38,18 @@ Coverage: Given a per-range coverage file. Given certain window sizes, calculate
 Both yields bed files with different levels of resolutions, distinguished with prefixes in the output ({joined_prefixes}).
 """
 
-VERSION = "1.1.3"
+VERSION = "1.2.0"
+
+# records parsed from the inputs are passed on to the resolution levels in chunks
+CHUNK_SIZE = 50_000
+# max uncompressed data in a BGZF block, same as bgzip
+BGZF_BLOCK_SIZE = 0xFF00
+# uncompressed data compressed by a thread at a time
+BGZF_BATCH_SIZE = 16 * BGZF_BLOCK_SIZE
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+CovRecord = Tuple[str, int, int, float]
+BafRecord = Tuple[str, int, float]
 
 CHR_ORDER = [
     "1",
@@ -73,10 +93,12 @@ def main(
     threads: int,
 ) -> None:
 
+    start_time = time.perf_counter()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    cov_output = out_dir / f"{label}.cov.bed"
-    baf_output = out_dir / f"{label}.baf.bed"
+    suffix = ".bed.gz" if bgzip_tabix_output else ".bed"
+    cov_output = out_dir / f"{label}.cov{suffix}"
+    baf_output = out_dir / f"{label}.baf{suffix}"
 
     if not baf_positions.exists() or not baf_positions.is_file():
         print(
@@ -94,118 +116,343 @@ def main(
         print(f"gVCF {str(gvcf)} does not exist or is not a valid file. Exiting.")
         sys.exit(1)
 
-    print("Calculating coverage data", file=sys.stderr)
-    with open(cov_output, "w", encoding="utf-8") as covout:
-        for win_size, prefix in zip(COV_WINDOW_SIZES, PREFIXES):
-            generate_cov_bed(coverage, win_size, prefix, covout)
+    if bgzip_tabix_output and not shutil.which("tabix"):
+        print(
+            "Cannot tabix index output as the tabix command is not present in path.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
-    print("Calculating BAFs from gvcf...", file=sys.stderr)
-    tmp_baf = out_dir / f"{label}.baf.tmp"
-    with open(tmp_baf, "w", encoding="utf-8") as tmpout:
-        parse_gvcfvaf(gvcf, baf_positions, tmpout, baf_min_depth)
+    times = StageTimes()
+    # coverage and BAF are read concurrently, each in one pass that feeds all
+    # resolution levels, while the output is compressed by a pool of threads
+    print("Calculating coverage and BAF data", file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=max(threads, 1)) as compress_pool:
+        with ThreadPoolExecutor(max_workers=2) as pipelines:
+            jobs = [
+                pipelines.submit(
+                    write_levels,
+                    chunked(iter_coverage(coverage), CHUNK_SIZE),
+                    [
+                        CovWindows(win_size, prefix)
+                        for win_size, prefix in zip(COV_WINDOW_SIZES, PREFIXES)
+                    ],
+                    cov_output,
+                    compress_pool if bgzip_tabix_output else None,
+                    times,
+                    "coverage",
+                ),
+                pipelines.submit(
+                    write_levels,
+                    chunked(
+                        iter_gvcf_bafs(gvcf, baf_positions, baf_min_depth), CHUNK_SIZE
+                    ),
+                    [
+                        BafSubsample(skip_n, prefix)
+                        for skip_n, prefix in zip(BAF_SKIP_N, PREFIXES)
+                    ],
+                    baf_output,
+                    compress_pool if bgzip_tabix_output else None,
+                    times,
+                    "BAF",
+                ),
+            ]
+            for job in jobs:
+                job.result()
 
-    with open(baf_output, "w", encoding="utf-8") as bafout:
-        for skip_n, prefix in zip(BAF_SKIP_N, PREFIXES):
-            print(f"Outputting BAF {prefix}...", file=sys.stderr)
-            generate_baf_bed(str(tmp_baf), skip_n, prefix, bafout)
+    if bgzip_tabix_output:
+        print("Indexing bed files", file=sys.stderr)
+        with times.measure("tabix"):
+            for output in (baf_output, cov_output):
+                subprocess.run(["tabix", "-f", "-p", "bed", str(output)], check=True)
 
     if bigwig:
         cov_sizes = out_dir / f"{label}.cov.sizes"
         baf_sizes = out_dir / f"{label}.baf.sizes"
         cov_bw_output = out_dir / f"{label}.cov.bw"
         baf_bw_output = out_dir / f"{label}.baf.bw"
-        print("Generating size files", file=sys.stderr)
-        write_chrom_sizes(cov_output, cov_sizes)
-        write_chrom_sizes(baf_output, baf_sizes)
-        print("Generating cov bigwig", file=sys.stderr)
-        gens_bed_to_bigwig(cov_output, cov_sizes, cov_bw_output)
-        print("Generating baf bigwig", file=sys.stderr)
-        gens_bed_to_bigwig(baf_output, baf_sizes, baf_bw_output)
+        with times.measure("bigwig"):
+            print("Generating size files", file=sys.stderr)
+            write_chrom_sizes(cov_output, cov_sizes)
+            write_chrom_sizes(baf_output, baf_sizes)
+            print("Generating cov bigwig", file=sys.stderr)
+            gens_bed_to_bigwig(cov_output, cov_sizes, cov_bw_output)
+            print("Generating baf bigwig", file=sys.stderr)
+            gens_bed_to_bigwig(baf_output, baf_sizes, baf_bw_output)
+
+    times.add("total", time.perf_counter() - start_time)
+    times.report(sys.stderr)
+
+
+class StageTimes:
+    """Seconds spent in each stage of the processing, summed over threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seconds: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+
+    def report(self, out_fh: TextIO) -> None:
+        print("Seconds per stage (summed over threads):", file=out_fh)
+        for stage, seconds in self._seconds.items():
+            print(f"  {stage:<20}{seconds:10.2f}", file=out_fh)
+
+
+class CovWindows:
+    """Average coverage in windows of a resolution level.
+
+    Records are fed in order, chunk by chunk, and the state of the window being
+    filled is kept between chunks. A trailing window that never reaches the
+    window size is not output.
+    """
 
-    if bgzip_tabix_output:
+    def __init__(self, win_size: int, prefix: str):
+        self.win_size = win_size
+        self.prefix = prefix
+        self._chrom: Optional[str] = None
+        self._start = 0
+        self._end = 0
+        self._ratios: List[float] = []
+
+    def process(self, records: Iterable[CovRecord]) -> str:
+        """Get the bed lines of the windows completed by the records."""
+        win_size = self.win_size
+        prefix = self.prefix
+        active_chrom, active_start, active_end = self._chrom, self._start, self._end
+        reg_ratios = self._ratios
+        lines = []
+
+        for chrom, start, end, ratio in records:
+            if active_chrom is None:
+                active_chrom, active_start, active_end = chrom, start, end
 
-        bgzip_present = shutil.which("bgzip")
-        tabix_present = shutil.which("tabix")
-        if not (bgzip_present and tabix_present):
-            print(
-                f"Cannot bgzip and tabix output as commands are not present in path. bgzip present: {bgzip_present}, tabix present: {tabix_present}",
-                file=sys.stderr,
-            )
-            sys.exit(1)
+            # Check if still within the target window size
+            force_end = False
+            curr_end = end
+            if chrom == active_chrom and start - active_end < win_size:
+                reg_ratios.append(ratio)
+                active_end = end
+            else:
+                # If not, then finish the current window
+                force_end = True
+                curr_end = active_end
+
+            if curr_end - active_start + 1 >= win_size or force_end:
+                mid_point = active_start + (curr_end - active_start) // 2
+                lines.append(
+                    f"{prefix}_{active_chrom}\t{mid_point - 1}\t{mid_point}\t{statistics.fmean(reg_ratios)}\n"
+                )
+                active_chrom = None
+                reg_ratios = []
 
-        print("Compressing bed files", file=sys.stderr)
-        subprocess.run(["bgzip", "-f", f"-@{threads}", str(baf_output)], check=True)
-        subprocess.run(
-            ["tabix", "-f", "-p", "bed", str(baf_output) + ".gz"], check=True
+            if force_end:
+                active_chrom, active_start, active_end = chrom, start, end
+                reg_ratios.append(ratio)
+
+        self._chrom, self._start, self._end = active_chrom, active_start, active_end
+        self._ratios = reg_ratios
+        return "".join(lines)
+
+
+class BafSubsample:
+    """Every skip:th BAF record of a resolution level.
+
+    Records are fed in order, chunk by chunk.
+    """
+
+    def __init__(self, skip: int, prefix: str):
+        self.skip = skip
+        self.prefix = prefix
+        self._n_seen = 0
+
+    def process(self, records: List[BafRecord]) -> str:
+        """Get the bed lines of the kept records."""
+        first = -self._n_seen % self.skip
+        self._n_seen += len(records)
+        prefix = self.prefix
+        return "".join(
+            f"{prefix}_{chrom}\t{pos - 1}\t{pos}\t{baf}\n"
+            for chrom, pos, baf in records[first :: self.skip]
         )
-        subprocess.run(["bgzip", "-f", f"-@{threads}", str(cov_output)], check=True)
-        subprocess.run(
-            ["tabix", "-f", "-p", "bed", str(cov_output) + ".gz"], check=True
+
+
+def write_levels(
+    chunks: Iterable[list],
+    levels: List[Union[CovWindows, BafSubsample]],
+    out_path: Path,
+    compress_pool: Optional[Executor],
+    times: StageTimes,
+    name: str,
+) -> None:
+    """Feed each chunk of records to all resolution levels and write the output.
+
+    The levels are written to temporary files that are joined in level order.
+    Output is BGZF compressed when a compression pool is given, BGZF data can
+    be joined as is.
+    """
+    parts = [tempfile.TemporaryFile(dir=out_path.parent) for _ in levels]
+    try:
+        writers: List[Union[BgzfWriter, PlainWriter]] = [
+            (
+                BgzfWriter(part, compress_pool, times)
+                if compress_pool is not None
+                else PlainWriter(part)
+            )
+            for part in parts
+        ]
+        chunk_iter = iter(chunks)
+        while True:
+            with times.measure(f"read {name}"):
+                chunk = next(chunk_iter, None)
+            if chunk is None:
+                break
+            with times.measure(f"process {name}"):
+                for level, writer in zip(levels, writers):
+                    writer.write(level.process(chunk))
+
+        with times.measure(f"write {name}"):
+            for writer in writers:
+                writer.close()
+            with open(out_path, "wb") as out_fh:
+                for part in parts:
+                    part.seek(0)
+                    shutil.copyfileobj(part, out_fh)
+                if compress_pool is not None:
+                    out_fh.write(BGZF_EOF)
+    finally:
+        for part in parts:
+            part.close()
+
+
+class PlainWriter:
+    """Write uncompressed text."""
+
+    def __init__(self, out_fh: BinaryIO):
+        self._out_fh = out_fh
+
+    def write(self, text: str) -> None:
+        self._out_fh.write(text.encode())
+
+    def close(self) -> None:
+        self._out_fh.flush()
+
+
+class BgzfWriter:
+    """Write BGZF compressed text, compressing batches of blocks in a thread pool.
+
+    The batches are written in order. No EOF block is written, so that the
+    output can be joined with other BGZF data.
+    """
+
+    def __init__(
+        self,
+        out_fh: BinaryIO,
+        compress_pool: Executor,
+        times: StageTimes,
+        max_pending: int = 4,
+    ):
+        self._out_fh = out_fh
+        self._compress_pool = compress_pool
+        self._times = times
+        self._max_pending = max_pending
+        self._buffer = bytearray()
+        self._pending: deque[Future[bytes]] = deque()
+
+    def write(self, text: str) -> None:
+        self._buffer += text.encode()
+        if len(self._buffer) >= BGZF_BATCH_SIZE:
+            self._submit()
+
+    def close(self) -> None:
+        if self._buffer:
+            self._submit()
+        while self._pending:
+            self._out_fh.write(self._pending.popleft().result())
+        self._out_fh.flush()
+
+    def _submit(self) -> None:
+        self._pending.append(
+            self._compress_pool.submit(self._compress, bytes(self._buffer))
         )
+        self._buffer = bytearray()
+        while self._pending and (
+            len(self._pending) > self._max_pending or self._pending[0].done()
+        ):
+            self._out_fh.write(self._pending.popleft().result())
+
+    def _compress(self, data: bytes) -> bytes:
+        with self._times.measure("compress"):
+            return b"".join(
+                bgzf_block(data[offset : offset + BGZF_BLOCK_SIZE])
+                for offset in range(0, len(data), BGZF_BLOCK_SIZE)
+            )
 
-    os.unlink(tmp_baf)
 
+def bgzf_block(data: bytes) -> bytes:
+    """Compress data, at most BGZF_BLOCK_SIZE bytes, into a BGZF block."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    # gzip header with the BC extra subfield holding the block size - 1
+    header = struct.pack(
+        "<4BI2BH2BHH", 31, 139, 8, 4, 0, 0, 255, 6, 66, 67, 2, len(deflated) + 25
+    )
+    return header + deflated + struct.pack("<2I", zlib.crc32(data), len(data))
 
-def generate_baf_bed(fn: str, skip: int, prefix: str, out_fh: TextIO) -> None:
-    """Write a downsampled BAF bed file."""
-    with open(fn, "r", encoding="utf-8") as fh:
-        for i, line in enumerate(fh):
-            if i % skip == 0:
-                parts = line.rstrip().split("\t")
-                if len(parts) != 3:
-                    continue
-                raw_chrom, pos, val = parts
-                chrom = normalize_chr(raw_chrom)
-                out_fh.write(f"{prefix}_{chrom}\t{int(pos) - 1}\t{pos}\t{val}\n")
 
+def chunked(records: Iterable, size: int) -> Iterator[list]:
+    """Split records into lists of at most size records."""
+    records_iter = iter(records)
+    while True:
+        chunk = list(islice(records_iter, size))
+        if not chunk:
+            return
+        yield chunk
 
-def generate_cov_bed(
-    cov_file: Path, win_size: int, prefix: str, out_fh: TextIO
-) -> None:
-    """Convert GATK standardized coverage to Gens bed format."""
-    active_region = None
-    force_end = False
-    reg_ratios: list[float] = []
 
+def iter_coverage(cov_file: Path) -> Iterator[CovRecord]:
+    """Read the records of a GATK standardized coverage file."""
     with read_file(cov_file) as fh:
         for line in fh:
-            if line.startswith("@") or line.startswith("CONTIG"):
+            if line.startswith(("@", "CONTIG")):
                 continue
-
             raw_chrom, start_str, end_str, ratio_str = line.rstrip().split("\t")
-            chrom = normalize_chr(raw_chrom)
-            curr = Region(chrom, int(start_str), int(end_str))
-            orig_end = curr.end
-            curr_ratio = float(ratio_str)
+            yield normalize_chr(raw_chrom), int(start_str), int(end_str), float(
+                ratio_str
+            )
 
-            if not active_region:
-                active_region = Region(curr.chrom, curr.start, curr.end)
 
-            # Check if still within the target window size
-            if (
-                chrom == active_region.chrom
-                and curr.start - active_region.end < win_size
-            ):
-                reg_ratios.append(curr_ratio)
-                active_region.end = curr.end
-            else:
-                # If not, then finish the current window
-                force_end = True
-                curr.end = active_region.end
+def generate_baf_bed(fn: str, skip: int, prefix: str, out_fh: TextIO) -> None:
+    """Write a downsampled BAF bed file from a BAF file written by parse_gvcfvaf."""
+    level = BafSubsample(skip, prefix)
+    with open(fn, "r", encoding="utf-8") as fh:
+        records = (line.rstrip().split("\t") for line in fh)
+        bafs = (
+            (normalize_chr(parts[0]), int(parts[1]), float(parts[2]))
+            for parts in records
+            if len(parts) == 3
+        )
+        for chunk in chunked(bafs, CHUNK_SIZE):
+            out_fh.write(level.process(chunk))
 
-            curr_window_size = curr.end - active_region.start + 1
-            if curr_window_size >= win_size or force_end:
-                mid_point = active_region.start + (curr.end - active_region.start) // 2
-                out_fh.write(
-                    f"{prefix}_{active_region.chrom}\t{mid_point - 1}\t{mid_point}\t{statistics.mean(reg_ratios)}\n"
-                )
-                active_region = None
-                reg_ratios = []
 
-            if force_end:
-                active_region = Region(chrom, curr.start, orig_end)
-                reg_ratios.append(curr_ratio)
-                force_end = False
+def generate_cov_bed(
+    cov_file: Path, win_size: int, prefix: str, out_fh: TextIO
+) -> None:
+    """Convert GATK standardized coverage to Gens bed format."""
+    level = CovWindows(win_size, prefix)
+    for chunk in chunked(iter_coverage(cov_file), CHUNK_SIZE):
+        out_fh.write(level.process(chunk))
 
 
 def write_chrom_sizes(cov_bed_file: Path, out_path: Path) -> None:
@@ -272,9 +519,18 @@ def gens_bed_to_bigwig(bed_file: Path, sizes_path: Path, bw_file: Path) -> None:
 def parse_gvcfvaf(
     gvcf_file: Path, baf_positions_file: Path, out_fh: TextIO, depth_threshold: int
 ) -> None:
+    """Write position and BAF frequencies of the provided positions to file."""
+    for chrom, pos, baf_freq in iter_gvcf_bafs(
+        gvcf_file, baf_positions_file, depth_threshold
+    ):
+        print(f"{chrom}\t{pos}\t{baf_freq}", file=out_fh)
+
+
+def iter_gvcf_bafs(
+    gvcf_file: Path, baf_positions_file: Path, depth_threshold: int
+) -> Iterator[BafRecord]:
     """
     Calculate BAF frequencies for provided gnomad file positions
-    Write position and BAF frequencies to file
 
     Considerations:
     - Skip indels
@@ -287,9 +543,7 @@ def parse_gvcfvaf(
         for line in baf_positions_fh:
             line = line.rstrip()
             chrom_raw, pos = line.split("\t")
-            chrom = normalize_chr(chrom_raw)
-            pos_key = f"{chrom}_{pos}"
-            baf_positions.add(pos_key)
+            baf_positions.add((normalize_chr(chrom_raw), pos))
 
     with read_file(gvcf_file) as gvcf_fh:
 
@@ -301,9 +555,11 @@ def parse_gvcfvaf(
                 continue
 
             gvcf_count += 1
-            gvcf_pos: Region = gvcf_region(gvcf_line)
-            position_key = f"{gvcf_pos.chrom}_{gvcf_pos.start}"
-            if position_key not in baf_positions:
+            # only the start is matched, the rest of the line is parsed for
+            # matching records
+            chrom_raw, pos, _ = gvcf_line.split("\t", 2)
+            chrom = normalize_chr(chrom_raw)
+            if (chrom, pos) not in baf_positions:
                 continue
 
             entry = GVCFEntry(gvcf_line)
@@ -311,7 +567,7 @@ def parse_gvcfvaf(
                 continue
 
             if "AD" not in entry.sample_entries:
-                baf_freq = 0
+                baf_freq: float = 0
             elif not entry.pass_depth_filter(depth_threshold):
                 continue
             else:
@@ -320,31 +576,13 @@ def parse_gvcfvaf(
                     continue
                 baf_freq = parsed_baf
 
-            print(f"{gvcf_pos.chrom}\t{gvcf_pos.start}\t{baf_freq}", file=out_fh)
+            yield chrom, entry.start, baf_freq
             match_count += 1
 
         skipped = gvcf_count - match_count
         print(f"{skipped} variants skipped!", file=sys.stderr)
 
 
-def gvcf_region(line: str) -> Region:
-    """Return END from info column if present. Else, return the start position."""
-    cols = line.rstrip().split("\t")
-    chrom = normalize_chr(cols[0])
-    pos = int(cols[1])
-    info = cols[7]
-    info_end_match = re.search(r"(?:^|;)END=(.*?)(?:;|$)", info)
-    end = int(info_end_match.group(1)) if info_end_match else pos
-    return Region(chrom, pos, end)
-
-
-class Region:
-    def __init__(self, chr: str, start: int, end: int):
-        self.chrom = chr
-        self.start = start
-        self.end = end
-
-
 class GVCFEntry:
     def __init__(self, line: str):
         cols = line.split("\t")
@@ -400,6 +638,7 @@ class GVCFEntry:
         return f"{self.chrom} {self.start} {self.ref} {alt_alleles}"
 
 
+@lru_cache(maxsize=None)
 def normalize_chr(chrom: str) -> str:
     """Return chromosome name without 'chr' and with MT normalized"""
 
@@ -452,13 +691,13 @@ def parse_arguments():
     )
     parser.add_argument(
         "--threads",
-        help="Number of threads to use when bgzipping output",
+        help="Number of threads to use when compressing output",
         type=int,
         default=10,
     )
     parser.add_argument(
         "--bgzip_tabix_output",
-        help="BGZip and tabix index outputs (requires bgzip and tabix to be present in PATH)",
+        help="Write BGZF compressed, tabix indexed outputs (requires tabix to be present in PATH)",
         action="store_true",
     )
 
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+LOG = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+description = """
+Load test of the Gens coverage API
+
+Sends concurrent requests for the coverage and BAF of one or more samples and
+reports throughput and latency. Run it against a single worker, e.g.
+`uvicorn --factory gens.app:create_app --workers 1`, to compare how many
+concurrent viewers one worker can serve.
+"""
+
+VERSION = "1.0.0"
+
+ZOOM_LEVELS = ["o", "a", "b", "c", "d"]
+CHROMS = [str(i) for i in range(1, 23)] + ["X", "Y"]
+
+
+@dataclass
+class LoadTestResult:
+    latencies: list[float] = field(default_factory=list)
+    n_errors: int = 0
+
+
+def main(
+    api_url: str,
+    sample_ids: list[str],
+    case_id: str,
+    genome_build: int,
+    concurrency: int,
+    n_requests: int,
+    cookie: str | None,
+):
+    requests = [
+        {
+            "url": f"{api_url.rstrip('/')}/samples/sample/{data_type}",
+            "params": {
+                "sample_id": sample_ids[idx % len(sample_ids)],
+                "case_id": case_id,
+                "genome_build": genome_build,
+                "chromosome": CHROMS[idx % len(CHROMS)],
+                "zoom_level": ZOOM_LEVELS[idx % len(ZOOM_LEVELS)],
+            },
+        }
+        for idx in range(n_requests)
+        for data_type in ["coverage", "baf"]
+    ]
+
+    LOG.info(
+        "Sending %s requests with concurrency %s to %s",
+        len(requests),
+        concurrency,
+        api_url,
+    )
+    start = time.perf_counter()
+    result = asyncio.run(run_requests(requests, concurrency, cookie))
+    elapsed = time.perf_counter() - start
+
+    n_ok = len(result.latencies)
+    LOG.info("Finished in %.2f s, %s ok, %s errors", elapsed, n_ok, result.n_errors)
+    LOG.info("Throughput: %.1f requests/s", n_ok / elapsed)
+    if n_ok > 1:
+        percentiles = statistics.quantiles(result.latencies, n=100)
+        LOG.info(
+            "Latency ms: p50 %.1f, p95 %.1f, p99 %.1f, max %.1f",
+            percentiles[49] * 1000,
+            percentiles[94] * 1000,
+            percentiles[98] * 1000,
+            max(result.latencies) * 1000,
+        )
+
+
+async def run_requests(
+    requests: list[dict], concurrency: int, cookie: str | None
+) -> LoadTestResult:
+    result = LoadTestResult()
+    queue: asyncio.Queue[dict] = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    headers = {"Cookie": cookie} if cookie else {}
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            while not queue.empty():
+                request = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(request["url"], params=request["params"])
+                    resp.raise_for_status()
+                except httpx.HTTPError as err:
+                    LOG.debug("Request failed: %s", err)
+                    result.n_errors += 1
+                    continue
+                result.latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return result
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--api-url",
+        default="http://localhost:5000/api",
+        help="Base URL of the Gens API",
+    )
+    parser.add_argument(
+        "--sample-id",
+        required=True,
+        action="append",
+        help="Sample to request data for, repeat for several samples",
+    )
+    parser.add_argument("--case-id", required=True)
+    parser.add_argument("--genome-build", type=int, default=38)
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Number of concurrent requests"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=500,
+        help="Number of coverage and BAF request pairs to send",
+    )
+    parser.add_argument(
+        "--cookie",
+        help="Cookie header of a logged in session, when authentication is enabled",
+    )
+    parser.add_argument("--version", action="version", version=VERSION)
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    main(
+        args.api_url,
+        args.sample_id,
+        args.case_id,
+        args.genome_build,
+        args.concurrency,
+        args.requests,
+        args.cookie,
+    )